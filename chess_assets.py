@@ -0,0 +1,65 @@
+"""Piece image cache for the pygame front end.
+
+AssetManager reads each PNG from disk once and keeps scaled copies per
+square size, so a reset or a board resize to a size seen before costs a
+dictionary lookup. With use_atlas, every sprite of a size is packed into
+one atlas Surface and the pieces are subsurfaces of it.
+"""
+
+import os
+
+import pygame
+
+# Piece names as used by the list-of-strings board, which are also the image file names
+PIECE_NAMES = tuple(color + piece for color in "wb" for piece in "prnbqk")
+
+
+class AssetManager:
+    """Loads piece images lazily and caches them scaled by square size."""
+
+    def __init__(self, directory="assets", use_atlas=False):
+        self.directory = directory
+        self.use_atlas = use_atlas
+        self.images = {}  # Piece name -> Surface as loaded from disk
+        self.scaled = {}  # Square size -> {piece name: Surface}
+        self.atlases = {}  # Square size -> atlas Surface
+
+    def image(self, name):
+        """Returns the unscaled image of a piece, reading it from disk the first time."""
+        found = self.images.get(name)
+        if found is None:
+            found = pygame.image.load(os.path.join(self.directory, f"{name}.png"))
+            if pygame.display.get_surface() is not None:
+                found = found.convert_alpha()  # Match the display format so blits need no conversion
+            self.images[name] = found
+        return found
+
+    def pieces(self, size):
+        """Returns {piece name: Surface} scaled to size x size pixels."""
+        found = self.scaled.get(size)
+        if found is None:
+            if self.use_atlas:
+                atlas = self.atlas(size)
+                found = {name: atlas.subsurface((index * size, 0, size, size))
+                         for index, name in enumerate(PIECE_NAMES)}
+            else:
+                found = {name: pygame.transform.scale(self.image(name), (size, size)) for name in PIECE_NAMES}
+            self.scaled[size] = found
+        return found
+
+    def atlas(self, size):
+        """Returns one Surface holding every piece at size x size, side by side in PIECE_NAMES order."""
+        found = self.atlases.get(size)
+        if found is None:
+            found = pygame.Surface((size * len(PIECE_NAMES), size), pygame.SRCALPHA)
+            for index, name in enumerate(PIECE_NAMES):
+                found.blit(pygame.transform.scale(self.image(name), (size, size)), (index * size, 0))
+            self.atlases[size] = found
+        return found
+
+    def clear(self, keep_images=True):
+        """Drops the scaled copies, and the loaded images too unless keep_images is set."""
+        self.scaled.clear()
+        self.atlases.clear()
+        if not keep_images:
+            self.images.clear()
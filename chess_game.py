@@ -1,19 +1,21 @@
+import os
 import pygame
 import sys
-import copy
+import time
 
-# Initialize Pygame
-pygame.init()
+from chess_assets import AssetManager
+from chess_render import BoardRenderer, GRAY, StatsOverlay
+from chess_worker import ENGINE_REPLY, EngineWorker
+from chesscore import Position, PROMOTION_PIECES, instrument
+from chesscore.book import OpeningBook
+from chesscore.tablebase import Tablebases
+from chesscore.notation import parse_fen, to_fen
 
-# --- Constants ---
-# Colors
-WHITE = (255, 255, 255)
-GRAY = (128, 128, 128)
-YELLOW = (204, 204, 0)
-BLUE = (50, 255, 255)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
+# Initialize only the display (which brings the event queue); image loading needs no init and
+# audio, joystick and the other subsystems pygame.init() would start are never used
+pygame.display.init()
 
+# --- Constants ---
 # Board dimensions
 ROWS = 8
 COLS = 8
@@ -25,36 +27,29 @@ board_x, board_y = BOARD_POS
 WIDTH = COLS * SQUARE_SIZE
 HEIGHT = ROWS * SQUARE_SIZE
 
+ENGINE_TIME = 1.0  # Seconds the engine thinks per move
+# Used by the engine when present; see "Opening Book and Tablebases" in the README
+BOOK_PATH = "book.bin"
+TABLEBASE_DIR = "tablebases"
+# Set CHESS_STATS to a file name to start with instrumentation on and save its stats there on exit
+STATS_PATH = os.environ.get("CHESS_STATS")
+# Set by startup_benchmark.py to a time.time() stamp: print the seconds from then to the first frame and exit
+BENCHMARK_START = os.environ.get("CHESS_BENCHMARK")
+
 # --- Pygame Setup ---
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Chess")
-clock = pygame.time.Clock()
+# Only wake up for events the game handles, so the loop sleeps while idle
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE,
+                          pygame.WINDOWEXPOSED, ENGINE_REPLY])
+OVERLAY_TICK = pygame.event.custom_type()  # Refreshes the stats overlay while the engine thinks
 
 # --- Functions ---
 
 def load_pieces():
-    """Loads piece images and resizes them."""
-    pieces = {}
-    for color in ["w", "b"]:
-        for piece in ["p", "r", "n", "b", "q", "k"]:
-            img = pygame.image.load(f"assets/{color}{piece}.png")
-            pieces[color + piece] = pygame.transform.scale(img, (SQUARE_SIZE, SQUARE_SIZE))
-    return pieces
-
-def draw_board():
-    """Draws the chessboard."""
-    for row in range(ROWS):
-        for col in range(COLS):
-            color = WHITE if (row + col) % 2 == 0 else GRAY
-            pygame.draw.rect(screen, color, (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-
-def draw_pieces(board, pieces):
-    """Draws the pieces on the board."""
-    for row in range(ROWS):
-        for col in range(COLS):
-            piece = board[row][col]
-            if piece != "--":
-                screen.blit(pieces[piece], (col * SQUARE_SIZE, row * SQUARE_SIZE))
+    """Returns the piece images scaled to SQUARE_SIZE; they are read from disk only the first time."""
+    return assets.pieces(SQUARE_SIZE)
 
 def get_square_under_mouse(board, pos):
     """Returns the row and column of the square under the mouse position"""
@@ -78,345 +73,166 @@ def get_notation_under_mouse(pos):
     else:
         return None
 
-def draw_selector(board, pieces, selected_piece_pos):
-    """Draws a highlight around a selected piece"""
-    if selected_piece_pos:
-        row, col = selected_piece_pos
-        pygame.draw.rect(screen, YELLOW, (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE), 4)
-
-def draw_valid_moves(board, pieces, valid_moves):
-    """Draws valid moves for the selected piece."""
-    for move in valid_moves:
-        end_row, end_col = move
-        pygame.draw.circle(screen, BLUE, (end_col * SQUARE_SIZE + SQUARE_SIZE // 2, end_row * SQUARE_SIZE + SQUARE_SIZE // 2), SQUARE_SIZE // 6)
-
-def is_valid_move(board, start_row, start_col, end_row, end_col, turn, en_passant_target = None):
-    """Checks if a move is valid."""
-    piece = board[start_row][start_col]
-
-    # Basic checks
-    if piece == "--":
-        return False  # No piece at the starting position
-    if (turn == "white" and piece[0] == "b") or (turn == "black" and piece[0] == "w"):
-        return False  # Wrong color to move.
-
-    if start_row == end_row and start_col == end_col:
-        return False  # Cannot move to the same square
-
-    if not (0 <= start_row < 8 and 0 <= start_col < 8 and 0 <= end_row < 8 and 0 <= end_col < 8):
-        return False  # Move is out of bounds
-
-    destination_piece = board[end_row][end_col]
-    if destination_piece != "--" and (piece[0] == destination_piece[0]):
-        return False  # Cannot capture your own piece
-
-    # Specific piece movement logic
-    if piece[1] == "p":
-        return is_valid_pawn_move(board, start_row, start_col, end_row, end_col, turn) or is_valid_en_passant(board, start_row, start_col, end_row, end_col, turn, en_passant_target)
-    elif piece[1] == "r":
-        return is_valid_rook_move(board, start_row, start_col, end_row, end_col)
-    elif piece[1] == "n":
-        return is_valid_knight_move(board, start_row, start_col, end_row, end_col)
-    elif piece[1] == "b":
-        return is_valid_bishop_move(board, start_row, start_col, end_row, end_col)
-    elif piece[1] == "q":
-        return is_valid_queen_move(board, start_row, start_col, end_row, end_col)
-    elif piece[1] == "k":
-        return is_valid_king_move(board, start_row, start_col, end_row, end_col)
-    else:
-        return False
-
-def is_valid_pawn_move(board, start_row, start_col, end_row, end_col, turn):
-    """Checks if a pawn move is valid."""
-    piece = board[start_row][start_col]
-    direction = -1 if piece[0] == "w" else 1  # White moves up (-1), black moves down (+1)
-
-    # One square forward
-    if start_col == end_col and end_row == start_row + direction and board[end_row][end_col] == "--":
-        return True
-
-    # Two squares forward (only on the initial move)
-    if start_col == end_col and end_row == start_row + 2 * direction and board[end_row][end_col] == "--" and board[start_row + direction][end_col] == "--":
-        if (piece[0] == "w" and start_row == 6) or (piece[0] == "b" and start_row == 1):
-            return True
-
-    # Capture diagonally
-    if abs(end_col - start_col) == 1 and end_row == start_row + direction:
-        if (piece[0] == "w" and board[end_row][end_col][0] == "b") or (piece[0] == "b" and board[end_row][end_col][0] == "w"):
-            return True
-
-    return False
-
-def is_path_clear(board, start_row, start_col, end_row, end_col):
-    """Checks if the path between two squares is clear (except for knight moves)."""
-    row_step = 0 if start_row == end_row else 1 if start_row < end_row else -1
-    col_step = 0 if start_col == end_col else 1 if start_col < end_col else -1
-
-    current_row = start_row + row_step
-    current_col = start_col + col_step
-
-    while current_row != end_row or current_col != end_col:
-        if board[current_row][current_col] != "--":
-            return False
-        current_row += row_step
-        current_col += col_step
-
-    return True
-
-def is_valid_rook_move(board, start_row, start_col, end_row, end_col):
-    """Checks if a rook move is valid."""
-    if start_row == end_row or start_col == end_col:  # Must move in a straight line
-        return is_path_clear(board, start_row, start_col, end_row, end_col)
-    return False
-
-def is_valid_knight_move(board, start_row, start_col, end_row, end_col):
-    """Checks if a knight move is valid."""
-    row_diff = abs(start_row - end_row)
-    col_diff = abs(start_col - end_col)
-    return (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2)
-
-def is_valid_bishop_move(board, start_row, start_col, end_row, end_col):
-    """Checks if a bishop move is valid."""
-    if abs(start_row - end_row) == abs(start_col - end_col):  # Must move diagonally
-        return is_path_clear(board, start_row, start_col, end_row, end_col)
-    return False
-
-def is_valid_queen_move(board, start_row, start_col, end_row, end_col):
-    """Checks if a queen move is valid."""
-    return is_valid_rook_move(board, start_row, start_col, end_row, end_col) or is_valid_bishop_move(board, start_row, start_col, end_row, end_col)
-
-def is_valid_king_move(board, start_row, start_col, end_row, end_col):
-    """Checks if a king move is valid."""
-    row_diff = abs(start_row - end_row)
-    col_diff = abs(start_col - end_col)
-    return row_diff <= 1 and col_diff <= 1
-
-def get_valid_moves(board, selected_piece_pos, turn, en_passant_target, castling_rights):
-    """Returns a list of valid moves for the selected piece, including en passant and castling."""
+def promotion_window_pos(row, col):
+    """Returns the top-left corner of the promotion window for a pawn promoting on (row, col)."""
+    # Keep the window on screen, centred on the promotion square where possible
+    window_x = min(max(board_x + col * SQUARE_SIZE - (2 * SQUARE_SIZE), board_x), board_x + WIDTH - 4 * SQUARE_SIZE)
+    window_y = board_y + row * SQUARE_SIZE
+    return window_x, window_y
+
+def draw_promotion(window_pos, turn):
+    """Draws the promotion choices over the board and returns the rect drawn."""
+    promotion_window = pygame.Surface((SQUARE_SIZE * 4, SQUARE_SIZE))
+    promotion_window.fill(GRAY)
+    for i, piece in enumerate(PROMOTION_PIECES):
+        promotion_window.blit(pieces[turn[0] + piece], (i * SQUARE_SIZE, 0))
+    return screen.blit(promotion_window, window_pos)
+
+def get_promotion_under_mouse(window_pos, pos):
+    """Returns the promotion piece ("q", "r", "b" or "n") under the mouse, or None."""
+    window_x, window_y = window_pos
+    x, y = pos
+    option_index = (x - window_x) // SQUARE_SIZE
+    if 0 <= option_index < 4 and window_y <= y < window_y + SQUARE_SIZE:
+        return PROMOTION_PIECES[option_index]
+    return None
+
+def position_changed():
+    """Refreshes everything derived from the position after a move, take-back or reset."""
+    global game_state, selected_piece_pos, valid_moves, pending_promotion
+    # Legal moves, check and the game-over status are computed once here and only read until the next move
+    game_state = position.game_state()
+    selected_piece_pos = None
     valid_moves = []
-    if selected_piece_pos:
-        start_row, start_col = selected_piece_pos
-        piece = board[start_row][start_col]
-
-        # Normal moves
-        for end_row in range(ROWS):
-            for end_col in range(COLS):
-                if is_valid_move(board, start_row, start_col, end_row, end_col, turn, en_passant_target):
-                    valid_moves.append((end_row, end_col))
-
-        # Castling moves
-        if piece[1] == "k":
-            if castling_rights[turn]['king_side'] and is_valid_castling(board, start_row, start_col, 7, turn, castling_rights):
-                valid_moves.append((start_row, start_col + 2))  # King moves 2 squares to the right
-            if castling_rights[turn]['queen_side'] and is_valid_castling(board, start_row, start_col, 0, turn, castling_rights):
-                valid_moves.append((start_row, start_col - 2))  # King moves 2 squares to the left
-
-    return valid_moves
-
-def is_check(board, turn):
-    """Checks if the given side's king is in check."""
-    # Find the king's position
-    king_row, king_col = None, None
-    for row in range(8):
-        for col in range(8):
-            if board[row][col] == ("wk" if turn == "white" else "bk"):
-                king_row, king_col = row, col
-                break
-
-    # Check for attacks from the opponent's pieces
-    opponent_turn = "black" if turn == "white" else "white"
-    for row in range(8):
-        for col in range(8):
-            if is_valid_move(board, row, col, king_row, king_col, opponent_turn):
-                return True
-    return False
-
-def get_all_valid_moves(board, turn, en_passant_target, castling_rights):
-    """Returns a list of all valid moves for a given side."""
-    all_valid_moves = []
-    for start_row in range(8):
-        for start_col in range(8):
-            if (turn == "white" and board[start_row][start_col][0] == "w") or \
-               (turn == "black" and board[start_row][start_col][0] == "b"):
-                for end_row in range(8):
-                    for end_col in range(8):
-                        if is_valid_move(board, start_row, start_col, end_row, end_col, turn, en_passant_target):
-                            # Check for check after the move to avoid illegal moves
-                            temp_board = [row[:] for row in board]
-                            castling_rights_copy = copy.deepcopy(castling_rights) # Create a deep copy of castling_rights
-                            make_move(temp_board, start_row, start_col, end_row, end_col, en_passant_target, castling_rights_copy)
-                            if not is_check(temp_board, turn):
-                                all_valid_moves.append((start_row, start_col, end_row, end_col))
-    return all_valid_moves
-
-def is_checkmate(board, turn):
-    """Checks if the given side is in checkmate."""
-    return is_check(board, turn) and not get_all_valid_moves(board, turn, en_passant_target, castling_rights)
-
-def is_stalemate(board, turn):
-    """Checks if the given side is in stalemate."""
-    return not is_check(board, turn) and not get_all_valid_moves(board, turn, en_passant_target, castling_rights)
-
-def make_move(board, start_row, start_col, end_row, end_col):
-    """Makes a move on the board."""
-    piece = board[start_row][start_col]
-    board[end_row][end_col] = piece
-    board[start_row][start_col] = "--"
-def draw_check(board, turn):
-    """Draws a red background for the king if it's in check."""
-    for row in range(ROWS):
-        for col in range(COLS):
-            if board[row][col] == ("wk" if turn == "white" else "bk"):
-                if is_check(board, turn):
-                    pygame.draw.rect(screen, RED, (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-def is_valid_castling(board, king_row, king_col, rook_col, turn, castling_rights):
-    """Checks if castling is a valid move."""
-    # Check if king and rook have moved
-    if not castling_rights[turn]['king_side'] and not castling_rights[turn]['queen_side']:
-        return False
-
-    # Check if path is clear
-    if rook_col > king_col:  # King-side
-        for col in range(king_col + 1, rook_col):
-            if board[king_row][col] != "--":
-                return False
-    else:  # Queen-side
-        for col in range(rook_col + 1, king_col):
-            if board[king_row][col] != "--":
-                return False
-
-    # Check if king is in check or would pass through check
-    opponent_turn = "black" if turn == "white" else "white"
-    for col in range(min(king_col, rook_col), max(king_col, rook_col) + 1):
-        # Create a temporary board to simulate the move
-        temp_board = [row[:] for row in board]
-        temp_board[king_row][king_col] = "--"
-        temp_board[king_row][col] = "wk" if turn == "white" else "bk"
-        if is_check(temp_board, turn):
-            return False
-    return True
-def is_valid_en_passant(board, start_row, start_col, end_row, end_col, turn, en_passant_target):
-    """Checks if an en passant capture is valid."""
-    piece = board[start_row][start_col]
-    direction = -1 if piece[0] == "w" else 1
-
-    # Check if it's a pawn's diagonal move
-    if abs(end_col - start_col) == 1 and end_row == start_row + direction:
-        # Check if the target square is the en passant target square
-        if (end_row, end_col) == en_passant_target:
-            return True
-
-    return False
-def promote_pawn(board, row, col, turn):
-    """Promotes a pawn to another piece (Queen, Rook, Bishop, or Knight)."""
-    while True:
-        # Create a small window for promotion choice
-        promotion_window = pygame.Surface((SQUARE_SIZE * 4, SQUARE_SIZE))
-        promotion_window.fill(GRAY)
-
-        # Load and display the promotion options
-        promotion_options = ["q", "r", "b", "n"]
-        option_images = [pieces[f"{turn[0]}" + piece] for piece in promotion_options]
-
-        for i, img in enumerate(option_images):
-            promotion_window.blit(img, (i * SQUARE_SIZE, 0))
-
-        # Display the promotion window
-        screen.blit(promotion_window, (board_x + col * SQUARE_SIZE - (2 * SQUARE_SIZE), \
-                                        board_y + row * SQUARE_SIZE if turn == 'black' else board_y + (row - 1) * SQUARE_SIZE ))
-        pygame.display.update()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                x, y = pygame.mouse.get_pos()
-                option_index = (x - (board_x + col * SQUARE_SIZE - (2 * SQUARE_SIZE))) // SQUARE_SIZE
-
-                if 0 <= option_index < 4:
-                    selected_piece = promotion_options[option_index]
-                    board[row][col] = turn[0] + selected_piece
-                    return
-def make_move(board, start_row, start_col, end_row, end_col, en_passant_target=None, castling_rights=None):
-    """Makes a move on the board. Handles en passant, castling, and pawn promotion."""
-    global turn
-    piece = board[start_row][start_col]
-
-    # Handle en passant capture
-    if is_valid_en_passant(board, start_row, start_col, end_row, end_col, turn, en_passant_target):
-        board[end_row][end_col] = piece
-        board[start_row][start_col] = "--"
-        captured_pawn_row = end_row - (-1 if piece[0] == "w" else 1)  # Row of the captured pawn
-        board[captured_pawn_row][end_col] = "--"  # Remove the captured pawn
-
-    # Handle castling
-    elif piece[1] == "k" and abs(end_col - start_col) == 2:
-        board[end_row][end_col] = piece
-        board[start_row][start_col] = "--"
-        if end_col > start_col:  # King-side
-            rook_start_col = 7
-            rook_end_col = 5
-        else:  # Queen-side
-            rook_start_col = 0
-            rook_end_col = 3
-        board[end_row][rook_end_col] = board[end_row][rook_start_col]
-        board[end_row][rook_start_col] = "--"
-        # Update castling rights after castling (only if not a simulation)
-        if castling_rights:
-            castling_rights[turn]['king_side'] = False
-            castling_rights[turn]['queen_side'] = False
-
-    else:  # Regular move
-        board[end_row][end_col] = piece
-        board[start_row][start_col] = "--"
+    if pending_promotion:
+        pending_promotion = None
+        renderer.invalidate()  # Remove the promotion window
+    if game_state.is_over:
+        print(game_state.describe())
+    elif position.turn in engine_sides:
+        engine.request_move(position)
+
+def set_instrumentation(on):
+    """Turns the rules engine instrumentation and its overlay on or off."""
+    global overlay, overlay_rect, last_rate_sample
+    if on:
+        if overlay is None:
+            overlay = StatsOverlay(screen, BOARD_POS)
+        instrument.enable()
+        last_rate_sample = (time.perf_counter(), instrument.counters["moves generated"])
+        pygame.event.set_allowed(OVERLAY_TICK)
+        pygame.time.set_timer(OVERLAY_TICK, 500)
+    else:
+        instrument.disable()
+        pygame.time.set_timer(OVERLAY_TICK, 0)
+        if overlay_rect:
+            renderer.invalidate(overlay_rect)
+            overlay_rect = None
 
-    # Handle pawn promotion
-    if piece[1] == "p" and (end_row == 0 or end_row == 7):
-        promote_pawn(board, end_row, end_col, turn)
-        
-    # Update castling rights if king or rook moves (only if not a simulation)
-    if castling_rights:
-        if piece[1] == "k":
-            castling_rights[turn]['king_side'] = False
-            castling_rights[turn]['queen_side'] = False
-        elif piece[1] == "r":
-            if start_col == 0:
-                castling_rights[turn]['queen_side'] = False
-            elif start_col == 7:
-                castling_rights[turn]['king_side'] = False
 # --- Game Variables ---
-board = [
-    ["br", "bn", "bb", "bq", "bk", "bb", "bn", "br"],
-    ["bp", "bp", "bp", "bp", "bp", "bp", "bp", "bp"],
-    ["--", "--", "--", "--", "--", "--", "--", "--"],
-    ["--", "--", "--", "--", "--", "--", "--", "--"],
-    ["--", "--", "--", "--", "--", "--", "--", "--"],
-    ["--", "--", "--", "--", "--", "--", "--", "--"],
-    ["wp", "wp", "wp", "wp", "wp", "wp", "wp", "wp"],
-    ["wr", "wn", "wb", "wq", "wk", "wb", "wn", "wr"],
-]
+# Optionally start from a FEN given on the command line
+START_FEN = sys.argv[1] if len(sys.argv) > 1 else None
+position = parse_fen(START_FEN) if START_FEN else Position()
+assets = AssetManager("assets")
 pieces = load_pieces()
+renderer = BoardRenderer(screen, pieces, SQUARE_SIZE, BOARD_POS)
+engine = EngineWorker(ENGINE_TIME,
+                      OpeningBook(BOOK_PATH) if os.path.exists(BOOK_PATH) else None,
+                      Tablebases(TABLEBASE_DIR) if os.path.isdir(TABLEBASE_DIR) else None)
+engine_sides = set()  # Colors the engine plays
 selected_piece_pos = None  # (row, col) of the selected piece
 valid_moves = []
-turn = "white"
-game_over = False
-en_passant_target = None  # (row, col) of the en passant target square
-castling_rights = {
-    "white": {"king_side": True, "queen_side": True},
-    "black": {"king_side": True, "queen_side": True}
-}
+pending_promotion = None  # (move, window position) while the player picks a promotion piece
+game_state = None  # GameState of the current position
+overlay = None  # StatsOverlay, created the first time instrumentation is turned on
+overlay_rect = None  # Where the stats overlay was last drawn
+frame_seconds = 0.0
+last_rate_sample = None  # (time, moves generated) when the overlay rate was last updated
+moves_per_second = 0.0
+click_time = None  # perf_counter() of a click whose highlight is not on screen yet
+if STATS_PATH:
+    set_instrumentation(True)
+position_changed()
 
-# --- Main Game Loop ---
 # --- Main Game Loop ---
 running = True
 while running:
-    for event in pygame.event.get():
+    # --- Drawing ---
+    # Only squares whose contents changed are repainted and pushed to the display
+    frame_start = time.perf_counter()
+    board = position.rows()  # Drawing works on the list-of-strings layout
+    dirty = renderer.render(board, renderer.check_square(position), selected_piece_pos, valid_moves)
+    if pending_promotion:
+        dirty.append(draw_promotion(pending_promotion[1], position.turn))
+    if instrument.enabled:
+        overlay_rect = overlay.draw(frame_seconds, moves_per_second)
+        dirty.append(overlay_rect)
+        renderer.invalidate(overlay_rect)  # Repaint the squares under it next frame
+    if dirty:
+        pygame.display.update(dirty)
+    if BENCHMARK_START:
+        print(f"first frame {time.time() - float(BENCHMARK_START):.4f}")
+        break
+    if instrument.enabled:
+        now = time.perf_counter()
+        frame_seconds = now - frame_start
+        if click_time is not None:
+            instrument.histogram("click_to_highlight").record(now - click_time)
+            click_time = None
+
+    # --- Events ---
+    # Block until something happens, then handle everything that is queued
+    for event in [pygame.event.wait()] + pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            renderer.invalidate()
+        elif event.type == OVERLAY_TICK:
+            if instrument.enabled:
+                now, generated = time.perf_counter(), instrument.counters["moves generated"]
+                moves_per_second = (generated - last_rate_sample[1]) / (now - last_rate_sample[0])
+                last_rate_sample = (now, generated)
+        elif event.type == ENGINE_REPLY:
+            # Play the engine's move unless the position changed while it was thinking
+            while not engine.results.empty():
+                key, ply, move = engine.results.get()
+                if key == position.key and ply == len(position.history) and not game_state.is_over:
+                    position.apply(move)
+                    position_changed()
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_BACKSPACE, pygame.K_u):
+            # Take back the last move; the player takes over both sides again
+            engine.cancel()
+            engine_sides.clear()
+            if position.history:
+                position.unmake_move()
+                position_changed()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_e:
+            # Let the engine play the side to move from now on
+            if not game_state.is_over and position.turn not in engine_sides:
+                engine_sides.add(position.turn)
+                engine.request_move(position)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+            print(to_fen(position))  # Save the current position
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            set_instrumentation(not instrument.enabled)
         elif event.type == pygame.MOUSEBUTTONDOWN:
-            if not game_over:
-                pos = pygame.mouse.get_pos()
+            pos = pygame.mouse.get_pos()
+            if instrument.enabled:
+                click_time = time.perf_counter()
+            if pending_promotion:
+                # The promotion window is modal: only a click on one of its pieces counts
+                move, window_pos = pending_promotion
+                promotion = get_promotion_under_mouse(window_pos, pos)
+                if promotion:
+                    position.make_move(move, promotion)
+                    position_changed()
+            elif game_state.is_over:
+                # Game is over, reset the game if user clicks
+                engine.cancel()
+                engine_sides.clear()
+                position = parse_fen(START_FEN) if START_FEN else Position()
+                position_changed()
+            elif position.turn not in engine_sides:
                 clicked_square = get_square_under_mouse(board, pos)
 
                 if clicked_square:
@@ -426,82 +242,23 @@ while running:
                     if selected_piece_pos:
                         if clicked_square in valid_moves:
                             start_row, start_col = selected_piece_pos
-                            # Make the move (no need to check for check here because valid_moves are already filtered)
-                            make_move(board, start_row, start_col, clicked_row, clicked_col, en_passant_target, castling_rights)
-                            
-                            turn = "black" if turn == "white" else "white"
-
-                            # Update en passant target
-                            piece = board[clicked_row][clicked_col]
-                            if piece[1] == "p" and abs(start_row - clicked_row) == 2:
-                                en_passant_target = (start_row + (1 if piece[0] == "b" else -1), clicked_col)
+                            move = (start_row, start_col, clicked_row, clicked_col)
+                            if position.is_promotion(move):
+                                pending_promotion = (move, promotion_window_pos(clicked_row, clicked_col))
                             else:
-                                en_passant_target = None
-
-                            selected_piece_pos = None
-                            valid_moves = []
-
-                            # Check for checkmate or stalemate
-                            if is_checkmate(board, turn):
-                                print(f"Checkmate! {('Black' if turn == 'white' else 'White')} wins!")
-                                game_over = True
-                            if is_stalemate(board, turn):
-                                print("Stalemate! It's a draw.")
-                                game_over = True
-
+                                # Make the move (no need to check for check here because valid_moves are already filtered)
+                                position.make_move(move)
+                                position_changed()
                         else:
                             selected_piece_pos = None
                             valid_moves = []
                     # If no piece selected or clicked_square doesn't belong to the player, try to select a piece
-                    # Inside the main game loop, in the MOUSEBUTTONDOWN event:
-                    elif (turn == "white" and board[clicked_row][clicked_col][0] == "w") or \
-                         (turn == "black" and board[clicked_row][clicked_col][0] == "b"):
+                    elif position.piece_at(clicked_row, clicked_col)[0] == position.turn[0]:
                         selected_piece_pos = clicked_square
-                        valid_moves = get_valid_moves(board, selected_piece_pos, turn, en_passant_target, castling_rights)
-
-                        # If the king is in check, filter valid moves to only those that get it out of check
-                        if is_check(board, turn):
-                            valid_moves_to_remove_check = []
-                            for move in valid_moves:
-                                start_row, start_col = selected_piece_pos
-                                end_row, end_col = move
-                                temp_board = [row[:] for row in board]
-                                castling_rights_copy = copy.deepcopy(castling_rights) # Create a deep copy of castling_rights
-                                make_move(temp_board, start_row, start_col, end_row, end_col, en_passant_target, castling_rights_copy)
-                                if not is_check(temp_board, turn):  # Only keep moves that resolve the check
-                                    valid_moves_to_remove_check.append(move)
-                            valid_moves = valid_moves_to_remove_check  # Update valid_moves
-
-            else: # Game is over, reset the game if user clicks
-                board = [
-                    ["br", "bn", "bb", "bq", "bk", "bb", "bn", "br"],
-                    ["bp", "bp", "bp", "bp", "bp", "bp", "bp", "bp"],
-                    ["--", "--", "--", "--", "--", "--", "--", "--"],
-                    ["--", "--", "--", "--", "--", "--", "--", "--"],
-                    ["--", "--", "--", "--", "--", "--", "--", "--"],
-                    ["--", "--", "--", "--", "--", "--", "--", "--"],
-                    ["wp", "wp", "wp", "wp", "wp", "wp", "wp", "wp"],
-                    ["wr", "wn", "wb", "wq", "wk", "wb", "wn", "wr"],
-                ]
-                pieces = load_pieces()
-                selected_piece_pos = None
-                valid_moves = []
-                turn = "white"
-                game_over = False
-                en_passant_target = None
-                castling_rights = {
-                    "white": {"king_side": True, "queen_side": True},
-                    "black": {"king_side": True, "queen_side": True}
-                }
-
-    # --- Drawing ---
-    draw_board()
-    draw_check(board, turn)  # Draw red background for king in check
-    draw_pieces(board, pieces)
-    draw_selector(board, pieces, selected_piece_pos)
-    draw_valid_moves(board, pieces, valid_moves)
-
-    pygame.display.flip()
-    clock.tick(60)  # Limit to 60 frames per second
+                        # Legal moves were computed once for the position; selecting just looks them up
+                        valid_moves = game_state.moves_from(clicked_row, clicked_col)
 
-pygame.quit()
\ No newline at end of file
+engine.close()
+if STATS_PATH:
+    instrument.export_json(STATS_PATH)
+pygame.quit()
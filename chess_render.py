@@ -0,0 +1,112 @@
+"""Incremental board renderer for the pygame front end.
+
+The checkerboard is drawn once to a cached Surface. Each frame the renderer
+works out what every square should show (piece, check highlight, selection
+and move markers), repaints only the squares that differ from what is on
+screen, and returns their rects for pygame.display.update.
+"""
+
+import pygame
+
+# Colors
+WHITE = (255, 255, 255)
+GRAY = (128, 128, 128)
+YELLOW = (204, 204, 0)
+BLUE = (50, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+
+
+class BoardRenderer:
+    """Draws an 8x8 board onto screen, repainting only squares whose contents changed."""
+
+    def __init__(self, screen, pieces, square_size, origin=(0, 0)):
+        self.screen = screen
+        self.pieces = pieces
+        self.square_size = square_size
+        self.origin = origin
+        self.background = self._render_background()
+        self.shown = [[None] * 8 for _ in range(8)]  # What each square currently shows on screen
+
+    def _render_background(self):
+        """Pre-renders the empty checkerboard."""
+        size = self.square_size
+        background = pygame.Surface((8 * size, 8 * size))
+        for row in range(8):
+            for col in range(8):
+                color = WHITE if (row + col) % 2 == 0 else GRAY
+                background.fill(color, (col * size, row * size, size, size))
+        return background
+
+    def square_rect(self, row, col):
+        """Returns the screen rect of a square."""
+        x, y = self.origin
+        return pygame.Rect(x + col * self.square_size, y + row * self.square_size, self.square_size, self.square_size)
+
+    def invalidate(self, rect=None):
+        """Forces a repaint on the next render, e.g. after something was drawn over the board.
+
+        With a rect only the squares it overlaps are repainted.
+        """
+        if rect is None:
+            self.shown = [[None] * 8 for _ in range(8)]
+            return
+        for row in range(8):
+            for col in range(8):
+                if self.square_rect(row, col).colliderect(rect):
+                    self.shown[row][col] = None
+
+    def check_square(self, position):
+        """Returns the (row, col) of the king in check, or None. Read from the position's cached game state."""
+        if not position.game_state().in_check:
+            return None
+        king_sq = position.king_squares[position.side >> 3]
+        return king_sq >> 4, king_sq & 7
+
+    def render(self, board, check_square=None, selected=None, valid_moves=()):
+        """Brings the screen up to date and returns the list of rects that were repainted."""
+        targets = set(valid_moves)
+        dirty = []
+        for row in range(8):
+            board_row = board[row]
+            shown_row = self.shown[row]
+            for col in range(8):
+                square = (row, col)
+                state = (board_row[col], square == check_square, square == selected, square in targets)
+                if shown_row[col] != state:
+                    shown_row[col] = state
+                    dirty.append(self._draw_square(row, col, state))
+        return dirty
+
+    def _draw_square(self, row, col, state):
+        piece, in_check, selected, target = state
+        rect = self.square_rect(row, col)
+        size = self.square_size
+        self.screen.blit(self.background, rect, (col * size, row * size, size, size))
+        if in_check:
+            self.screen.fill(RED, rect)  # Red background for king in check
+        if piece != "--":
+            self.screen.blit(self.pieces[piece], rect)
+        if selected:
+            pygame.draw.rect(self.screen, YELLOW, rect, 4)
+        if target:
+            pygame.draw.circle(self.screen, BLUE, rect.center, size // 6)
+        return rect
+
+
+class StatsOverlay:
+    """Frame time and move generation rate, drawn in a corner of the board while instrumentation is on."""
+
+    def __init__(self, screen, origin=(0, 0)):
+        self.screen = screen
+        self.origin = origin
+        if not pygame.font.get_init():
+            pygame.font.init()  # Only started when the overlay is first shown
+        self.font = pygame.font.Font(None, 20)
+
+    def draw(self, frame_seconds, moves_per_second):
+        """Draws the overlay and returns its rect. The board under it must be invalidated before the next frame."""
+        text = f"frame {frame_seconds * 1000:.2f} ms  {moves_per_second:,.0f} moves/s"
+        label = self.font.render(text, True, WHITE, BLACK)
+        x, y = self.origin
+        return self.screen.blit(label, (x + 2, y + 2))
@@ -0,0 +1,57 @@
+"""Background engine for the pygame front end.
+
+EngineWorker runs searches on a daemon thread so the event loop never
+waits for the engine. Requests go in through a queue; every finished search
+is put on the results queue and announced with an ENGINE_REPLY event, which
+wakes the main loop from pygame.event.wait(). The searcher answers from the
+opening book and endgame tablebases, when given, before searching.
+"""
+
+import queue
+import threading
+
+import pygame
+
+from chesscore.search import Searcher
+
+ENGINE_REPLY = pygame.event.custom_type()
+
+
+class EngineWorker:
+    """Searches positions on a background thread and queues (key, ply, encoded move) replies."""
+
+    def __init__(self, time_limit=1.0, book=None, tablebases=None):
+        self.time_limit = time_limit
+        self.searcher = Searcher(book=book, tablebases=tablebases)
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.generation = 0  # Bumped by cancel() so queued requests are dropped
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def request_move(self, position):
+        """Queues a search of a copy of position. The reply is identified by the position key and ply."""
+        self.requests.put((self.generation, position.copy()))
+
+    def cancel(self):
+        """Drops queued requests and stops the search in progress; no reply is sent for them."""
+        self.generation += 1
+        self.searcher.stop()
+
+    def close(self):
+        self.cancel()
+        self.requests.put(None)
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            generation, position = request
+            if generation != self.generation:
+                continue
+            result = self.searcher.search(position, time_limit=self.time_limit)
+            if generation != self.generation or result.best_move is None:
+                continue
+            self.results.put((position.key, len(position.history), result.best_move))
+            pygame.event.post(pygame.event.Event(ENGINE_REPLY))
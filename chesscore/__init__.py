@@ -0,0 +1,37 @@
+"""Headless chess rules engine.
+
+Importing this package never touches pygame or a display, so it can run in
+server workers and batch jobs. chess_game.py is a pygame client on top of it.
+"""
+
+from chesscore.gamestate import GameState
+from chesscore.position import Position
+from chesscore.tt import TranspositionTable
+from chesscore.rules import (
+    PROMOTION_PIECES,
+    get_all_valid_moves,
+    get_valid_moves,
+    initial_board,
+    initial_castling_rights,
+    is_check,
+    is_checkmate,
+    is_stalemate,
+    make_move,
+    opponent,
+)
+
+__all__ = [
+    "GameState",
+    "PROMOTION_PIECES",
+    "Position",
+    "TranspositionTable",
+    "get_all_valid_moves",
+    "get_valid_moves",
+    "initial_board",
+    "initial_castling_rights",
+    "is_check",
+    "is_checkmate",
+    "is_stalemate",
+    "make_move",
+    "opponent",
+]
@@ -0,0 +1,38 @@
+"""Command-line entry point: python -m chesscore <command> [options]."""
+
+import argparse
+import importlib
+import sys
+
+# Command name -> module providing add_arguments(parser)
+COMMANDS = {
+    "perft": "chesscore.perft",
+    "search": "chesscore.search",
+    "book": "chesscore.book",
+    "tablebase": "chesscore.tablebase",
+    "parallel": "chesscore.parallel",
+    "pgn": "chesscore.pgn",
+    "tensors": "chesscore.tensors",
+    "profile": "chesscore.instrument",
+    "uci": "chesscore.uci",
+    "server": "chesscore.server",
+    "loadgen": "chesscore.loadgen",
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(prog="python -m chesscore")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    # Import only the chosen command's module; all of them are needed just to list the commands
+    names = [argv[0]] if argv and argv[0] in COMMANDS else list(COMMANDS)
+    for name in names:
+        module = importlib.import_module(COMMANDS[name])
+        summary = module.__doc__.strip().splitlines()[0]
+        module.add_arguments(subparsers.add_parser(name, help=summary, description=summary))
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Precomputed attack tables, attack queries, checkers and pins.
+
+Every table is indexed by 0x88 square and holds on-board squares only, so
+queries never test for the board edge.
+"""
+
+from chesscore.board import (
+    BISHOP, BISHOP_DIRECTIONS, BLACK, KING, KING_OFFSETS, KNIGHT, KNIGHT_OFFSETS, PAWN, QUEEN, ROOK,
+    ROOK_DIRECTIONS, SQUARES, WHITE,
+)
+
+
+def _step_table(offsets):
+    table = [()] * 128
+    for sq in SQUARES:
+        table[sq] = tuple(sq + step for step in offsets if not (sq + step) & 0x88)
+    return table
+
+
+def _ray_table(directions):
+    table = [()] * 128
+    for sq in SQUARES:
+        rays = []
+        for step in directions:
+            ray = []
+            target = sq + step
+            while not target & 0x88:
+                ray.append(target)
+                target += step
+            if ray:
+                rays.append(tuple(ray))
+        table[sq] = tuple(rays)
+    return table
+
+
+KNIGHT_ATTACKS = _step_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _step_table(KING_OFFSETS)
+# PAWN_ATTACKS[side][sq]: squares a pawn of that side on sq attacks
+PAWN_ATTACKS = [None] * 9
+PAWN_ATTACKS[WHITE] = _step_table((-17, -15))
+PAWN_ATTACKS[BLACK] = _step_table((15, 17))
+# Rays out of each square, nearest square first
+ROOK_RAYS = _ray_table(ROOK_DIRECTIONS)
+BISHOP_RAYS = _ray_table(BISHOP_DIRECTIONS)
+
+
+def is_attacked(board, sq, by_side):
+    """Checks if a square is attacked by any piece of the given side."""
+    # A pawn of by_side attacks sq from the squares a pawn of the other side on sq would attack
+    pawn = PAWN | by_side
+    for source in PAWN_ATTACKS[by_side ^ BLACK][sq]:
+        if board[source] == pawn:
+            return True
+    knight = KNIGHT | by_side
+    for source in KNIGHT_ATTACKS[sq]:
+        if board[source] == knight:
+            return True
+    king = KING | by_side
+    for source in KING_ATTACKS[sq]:
+        if board[source] == king:
+            return True
+
+    # Sliding pieces: walk each ray until the first piece
+    queen = QUEEN | by_side
+    rook = ROOK | by_side
+    for ray in ROOK_RAYS[sq]:
+        for source in ray:
+            piece = board[source]
+            if piece:
+                if piece == rook or piece == queen:
+                    return True
+                break
+    bishop = BISHOP | by_side
+    for ray in BISHOP_RAYS[sq]:
+        for source in ray:
+            piece = board[source]
+            if piece:
+                if piece == bishop or piece == queen:
+                    return True
+                break
+    return False
+
+
+def checkers_and_pins(board, king_sq, side):
+    """Finds the pieces giving check to side's king and side's pieces pinned to it.
+
+    Returns (checkers, block_squares, pins): the checking squares, the
+    squares a non-king move may land on to answer a single check (the
+    checker plus any squares between it and the king), and a dict mapping
+    each pinned piece's square to the squares it may still move to.
+    """
+    enemy = side ^ BLACK
+    checkers = []
+    block_squares = set()
+    pins = {}
+
+    pawn = PAWN | enemy
+    for source in PAWN_ATTACKS[side][king_sq]:
+        if board[source] == pawn:
+            checkers.append(source)
+            block_squares.add(source)
+    knight = KNIGHT | enemy
+    for source in KNIGHT_ATTACKS[king_sq]:
+        if board[source] == knight:
+            checkers.append(source)
+            block_squares.add(source)
+
+    queen = QUEEN | enemy
+    for rays, slider in ((ROOK_RAYS, ROOK | enemy), (BISHOP_RAYS, BISHOP | enemy)):
+        for ray in rays[king_sq]:
+            blocker = None
+            for index, sq in enumerate(ray):
+                piece = board[sq]
+                if not piece:
+                    continue
+                if piece & BLACK == side:
+                    if blocker is not None:
+                        break  # Two of our own pieces: no pin on this ray
+                    blocker = sq
+                    continue
+                if piece == slider or piece == queen:
+                    if blocker is None:
+                        checkers.append(sq)
+                        block_squares.update(ray[:index + 1])
+                    else:
+                        pins[blocker] = frozenset(ray[:index + 1])
+                break
+    return checkers, block_squares, pins
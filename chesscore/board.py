@@ -0,0 +1,142 @@
+"""Compact 0x88 board representation.
+
+The board is a bytearray of 128 cells. Square index is row * 16 + col, with
+row 0 being black's back rank like the list-of-strings layout, so a square
+is off the board exactly when ``square & 0x88`` is non-zero. The right half
+of each 16-cell row is never used.
+
+Pieces are small integers: the low three bits are the piece type and bit 3
+is set for black pieces. Empty squares are 0.
+"""
+
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+WHITE, BLACK = 0, 8
+TYPE_MASK = 7
+
+WP, WN, WB, WR, WQ, WK = 1, 2, 3, 4, 5, 6
+BP, BN, BB, BR, BQ, BK = 9, 10, 11, 12, 13, 14
+
+PIECE_NAMES = {
+    WP: "wp", WN: "wn", WB: "wb", WR: "wr", WQ: "wq", WK: "wk",
+    BP: "bp", BN: "bn", BB: "bb", BR: "br", BQ: "bq", BK: "bk",
+}
+PIECE_CODES = {name: code for code, name in PIECE_NAMES.items()}
+TYPE_LETTERS = " pnbrqk"
+
+# Castling rights bitmask
+WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE, BLACK_QUEEN_SIDE = 1, 2, 4, 8
+ALL_CASTLING = 15
+
+NO_SQUARE = -1
+
+# Direction and offset tables in 0x88 steps (one row is 16)
+ROOK_DIRECTIONS = (-16, 16, -1, 1)
+BISHOP_DIRECTIONS = (-17, -15, 15, 17)
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KNIGHT_OFFSETS = (-33, -31, -18, -14, 14, 18, 31, 33)
+KING_OFFSETS = QUEEN_DIRECTIONS
+
+SQUARES = tuple(row * 16 + col for row in range(8) for col in range(8))
+
+INITIAL_BOARD = (
+    ("br", "bn", "bb", "bq", "bk", "bb", "bn", "br"),
+    ("bp", "bp", "bp", "bp", "bp", "bp", "bp", "bp"),
+    ("--", "--", "--", "--", "--", "--", "--", "--"),
+    ("--", "--", "--", "--", "--", "--", "--", "--"),
+    ("--", "--", "--", "--", "--", "--", "--", "--"),
+    ("--", "--", "--", "--", "--", "--", "--", "--"),
+    ("wp", "wp", "wp", "wp", "wp", "wp", "wp", "wp"),
+    ("wr", "wn", "wb", "wq", "wk", "wb", "wn", "wr"),
+)
+
+PROMOTION_PIECES = ("q", "r", "b", "n")
+
+
+def initial_board():
+    """Returns a fresh board with the pieces on their starting squares."""
+    return [list(row) for row in INITIAL_BOARD]
+
+
+def initial_castling_rights():
+    """Returns castling rights for a new game."""
+    return {
+        "white": {"king_side": True, "queen_side": True},
+        "black": {"king_side": True, "queen_side": True}
+    }
+
+
+def square(row, col):
+    """Returns the 0x88 index of (row, col)."""
+    return row * 16 + col
+
+
+def row_col(sq):
+    """Returns the (row, col) of a 0x88 index."""
+    return sq >> 4, sq & 7
+
+
+def color_name(side):
+    """Returns "white" or "black" for a WHITE/BLACK side value."""
+    return "white" if side == WHITE else "black"
+
+
+def side_of(turn):
+    """Returns the WHITE/BLACK side value for "white" or "black"."""
+    return WHITE if turn == "white" else BLACK
+
+
+# Moves are packed into ints: from | to << 8 | promotion type << 16
+def encode_move(from_sq, to_sq, promotion=EMPTY):
+    """Packs a move into an int. promotion is a piece type (QUEEN, ROOK...) or EMPTY."""
+    return from_sq | (to_sq << 8) | (promotion << 16)
+
+
+def decode_move(move):
+    """Returns (from_sq, to_sq, promotion type) of an encoded move."""
+    return move & 0xFF, (move >> 8) & 0xFF, move >> 16
+
+
+def move_to_tuple(move):
+    """Returns the (start_row, start_col, end_row, end_col) tuple of an encoded move."""
+    from_sq = move & 0xFF
+    to_sq = (move >> 8) & 0xFF
+    return from_sq >> 4, from_sq & 7, to_sq >> 4, to_sq & 7
+
+
+def board_from_rows(rows):
+    """Converts a list-of-strings board to a 0x88 bytearray."""
+    board = bytearray(128)
+    for row in range(8):
+        for col in range(8):
+            name = rows[row][col]
+            if name != "--":
+                board[row * 16 + col] = PIECE_CODES[name]
+    return board
+
+
+def rows_from_board(board):
+    """Converts a 0x88 bytearray to a list-of-strings board."""
+    return [[PIECE_NAMES.get(board[row * 16 + col], "--") for col in range(8)] for row in range(8)]
+
+
+def castling_from_dict(castling_rights):
+    """Converts the {"white": {"king_side": ...}} castling dict to a bitmask."""
+    mask = 0
+    if castling_rights["white"]["king_side"]:
+        mask |= WHITE_KING_SIDE
+    if castling_rights["white"]["queen_side"]:
+        mask |= WHITE_QUEEN_SIDE
+    if castling_rights["black"]["king_side"]:
+        mask |= BLACK_KING_SIDE
+    if castling_rights["black"]["queen_side"]:
+        mask |= BLACK_QUEEN_SIDE
+    return mask
+
+
+def castling_to_dict(mask):
+    """Converts a castling bitmask to the {"white": {"king_side": ...}} dict."""
+    return {
+        "white": {"king_side": bool(mask & WHITE_KING_SIDE), "queen_side": bool(mask & WHITE_QUEEN_SIDE)},
+        "black": {"king_side": bool(mask & BLACK_KING_SIDE), "queen_side": bool(mask & BLACK_QUEEN_SIDE)},
+    }
@@ -0,0 +1,188 @@
+"""Opening book: weighted moves per position, memory-mapped and searched by binary search.
+
+    python -m chesscore book book.bin --build                 # from the built-in opening lines
+    python -m chesscore book book.bin --build games.pgn --plies 20
+    python -m chesscore book book.bin --fen "<fen>"           # list the book moves of a position
+
+The file uses the Polyglot record layout: 16-byte big-endian entries
+(key, move, weight, learn) sorted by key, with moves packed as Polyglot
+does (castling as king-takes-rook). Keys are chesscore Zobrist keys rather
+than Polyglot's, so books are built with this module.
+"""
+
+import mmap
+import random
+import struct
+from collections import Counter
+
+from chesscore.board import KING
+from chesscore.notation import STARTING_FEN, move_to_uci, parse_fen, parse_san
+from chesscore.pgn import read_games
+from chesscore.position import Position
+
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+MAX_WEIGHT = 0xFFFF
+
+# Polyglot promotion codes, indexed by piece type (knight 1 ... queen 4)
+POLYGLOT_PROMOTIONS = (0, 0, 1, 2, 3, 4, 0)
+
+# Main lines of common openings, used when a book is built without PGN files
+BUILTIN_LINES = (
+    "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6 c3 O-O",
+    "e4 e5 Nf3 Nc6 Bc4 Bc5 c3 Nf6 d3 d6 O-O O-O",
+    "e4 e5 Nf3 Nc6 d4 exd4 Nxd4 Nf6 Nxc6 bxc6 e5 Qe7",
+    "e4 e5 Nf3 Nf6 Nxe5 d6 Nf3 Nxe4 d4 d5 Bd3 Nc6",
+    "e4 c5 Nf3 d6 d4 cxd4 Nxd4 Nf6 Nc3 a6 Be3 e5",
+    "e4 c5 Nf3 Nc6 d4 cxd4 Nxd4 Nf6 Nc3 e5 Ndb5 d6",
+    "e4 c5 Nf3 e6 d4 cxd4 Nxd4 Nc6 Nc3 Qc7 Be2 a6",
+    "e4 e6 d4 d5 Nc3 Nf6 Bg5 Be7 e5 Nfd7 Bxe7 Qxe7",
+    "e4 e6 d4 d5 Nd2 Nf6 e5 Nfd7 Bd3 c5 c3 Nc6",
+    "e4 c6 d4 d5 Nc3 dxe4 Nxe4 Bf5 Ng3 Bg6 h4 h6",
+    "e4 d5 exd5 Qxd5 Nc3 Qa5 d4 Nf6 Nf3 Bf5",
+    "d4 d5 c4 e6 Nc3 Nf6 Bg5 Be7 e3 O-O Nf3 h6",
+    "d4 d5 c4 c6 Nf3 Nf6 Nc3 dxc4 a4 Bf5 e3 e6",
+    "d4 d5 c4 dxc4 Nf3 Nf6 e3 e6 Bxc4 c5 O-O a6",
+    "d4 Nf6 c4 e6 Nc3 Bb4 e3 O-O Bd3 d5 Nf3 c5",
+    "d4 Nf6 c4 g6 Nc3 Bg7 e4 d6 Nf3 O-O Be2 e5",
+    "d4 Nf6 c4 e6 Nf3 b6 g3 Ba6 b3 Bb4 Bd2 Be7",
+    "d4 Nf6 c4 c5 d5 e6 Nc3 exd5 cxd5 d6 e4 g6",
+    "c4 e5 Nc3 Nf6 Nf3 Nc6 g3 d5 cxd5 Nxd5 Bg2 Nb6",
+    "c4 Nf6 Nc3 e6 Nf3 d5 d4 Be7 Bf4 O-O e3 c5",
+    "Nf3 d5 g3 Nf6 Bg2 c6 O-O Bg4 d3 Nbd7",
+    "Nf3 Nf6 c4 g6 Nc3 d5 cxd5 Nxd5 Qa4+ Bd7",
+)
+
+
+def polyglot_move(move, board):
+    """Packs an encoded move the way Polyglot does: to and from file/rank, promotion, castling as king takes rook."""
+    from_sq = move & 0xFF
+    to_sq = (move >> 8) & 0xFF
+    if board[from_sq] & 7 == KING and to_sq - from_sq in (2, -2):
+        to_sq = from_sq + 3 if to_sq > from_sq else from_sq - 4
+    return ((to_sq & 7) | (7 - (to_sq >> 4)) << 3 | (from_sq & 7) << 6 | (7 - (from_sq >> 4)) << 9
+            | POLYGLOT_PROMOTIONS[move >> 16] << 12)
+
+
+class OpeningBook:
+    """Read-only book file. Lookups binary-search the memory-mapped entries without loading them."""
+
+    def __init__(self, path, rng=None):
+        self.path = path
+        self.rng = rng or random.Random()
+        with open(path, "rb") as file:
+            try:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self.data = b""  # Empty book
+        if len(self.data) % ENTRY.size:
+            raise ValueError(f"Corrupt book file: {path}")
+        self.count = len(self.data) // ENTRY.size
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self.data:
+            self.data.close()
+
+    def entries(self, key):
+        """Returns the (polyglot move, weight) pairs stored for a key."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(self.data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        for index in range(low, self.count):
+            entry_key, move, weight, _ = ENTRY.unpack_from(self.data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            found.append((move, weight))
+        return found
+
+    def moves(self, position):
+        """Returns the legal book moves of a position as (encoded move, weight) pairs, heaviest first."""
+        entries = dict(self.entries(position.key))
+        if not entries:
+            return []
+        found = []
+        for move in position.generate_legal():
+            weight = entries.get(polyglot_move(move, position.board))
+            if weight:
+                found.append((move, weight))
+        found.sort(key=lambda pair: pair[1], reverse=True)
+        return found
+
+    def choose(self, position):
+        """Picks a book move at random in proportion to its weight, or returns None out of book."""
+        found = self.moves(position)
+        if not found:
+            return None
+        return self.rng.choices([move for move, _ in found], [weight for _, weight in found])[0]
+
+
+def _count_line(counts, position, moves, plies):
+    for move in moves[:plies]:
+        counts[position.key, polyglot_move(move, position.board)] += 1
+        position.apply(move)
+
+
+def build_book(path, pgn_paths=(), plies=16, min_count=1):
+    """Writes a book of the first plies moves of every game in pgn_paths, or of BUILTIN_LINES if none.
+
+    Each move is weighted by how often it was played from its position;
+    moves played fewer than min_count times are left out. Returns the
+    number of entries written.
+    """
+    counts = Counter()
+    if pgn_paths:
+        for pgn_path in pgn_paths:
+            for game in read_games(pgn_path):
+                if "FEN" in game.headers:
+                    continue  # Only games from the standard start position
+                _count_line(counts, Position(), game.moves, plies)
+    else:
+        for line in BUILTIN_LINES:
+            position = Position()
+            moves = []
+            for san in line.split():
+                move = parse_san(position, san)
+                moves.append(move)
+                position.apply(move)
+            _count_line(counts, Position(), moves, plies)
+
+    entries = sorted((key, move, min(count, MAX_WEIGHT)) for (key, move), count in counts.items()
+                     if count >= min_count)
+    with open(path, "wb") as file:
+        for key, move, weight in entries:
+            file.write(ENTRY.pack(key, move, weight, 0))
+    return len(entries)
+
+
+def add_arguments(parser):
+    parser.add_argument("path", help="book file")
+    parser.add_argument("--build", nargs="*", metavar="PGN", default=None,
+                        help="build the book from PGN files (the built-in opening lines if none are given)")
+    parser.add_argument("--plies", type=int, default=16, help="with --build, plies of each game to include")
+    parser.add_argument("--min-count", type=int, default=1, help="with --build, drop moves played fewer times")
+    parser.add_argument("--fen", default=STARTING_FEN, help="position to list book moves for")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    if args.build is not None:
+        count = build_book(args.path, args.build, args.plies, args.min_count)
+        print(f"Wrote {count} entries to {args.path}")
+    book = OpeningBook(args.path)
+    position = parse_fen(args.fen)
+    found = book.moves(position)
+    total = sum(weight for _, weight in found)
+    for move, weight in found:
+        print(f"{move_to_uci(move):<6} weight {weight:>5}  {100 * weight / total:5.1f}%")
+    if not found:
+        print("Position not in book")
+    book.close()
+    return 0
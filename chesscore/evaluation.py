@@ -0,0 +1,191 @@
+"""Static evaluation: material plus piece-square tables, tapered between middlegame and endgame.
+
+Position keeps running middlegame and endgame totals (mg_score, eg_score)
+and a game phase that apply and unmake_move update for the pieces a move
+touches, so evaluate is O(1). evaluate_batch scores many positions at once
+with NumPy for offline analysis; NumPy is only imported when it is first
+used, so importing chesscore stays fast.
+"""
+
+from chesscore.board import BISHOP, BLACK, KING, KNIGHT, PAWN, QUEEN, ROOK, SQUARES
+
+np = None  # Imported by _load_numpy() the first time a batch function runs
+_MG_ARRAY = _EG_ARRAY = _PHASE_ARRAY = None
+
+MG_VALUES = (0, 100, 320, 330, 500, 900, 0)
+EG_VALUES = (0, 120, 300, 320, 520, 930, 0)
+
+# Game phase contributed by each piece type; 24 with all pieces on the board
+PHASE_WEIGHTS = (0, 0, 1, 1, 2, 4, 0)
+MAX_PHASE = 24
+
+# Piece-square tables from white's point of view, rank 8 first (row 0 of the board)
+PAWN_TABLE = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+PAWN_ENDGAME_TABLE = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    15, 15, 15, 15, 15, 15, 15, 15,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+KNIGHT_TABLE = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+BISHOP_TABLE = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+ROOK_TABLE = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+QUEEN_TABLE = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+KING_TABLE = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+)
+KING_ENDGAME_TABLE = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+_MG_TABLES = {PAWN: PAWN_TABLE, KNIGHT: KNIGHT_TABLE, BISHOP: BISHOP_TABLE, ROOK: ROOK_TABLE,
+              QUEEN: QUEEN_TABLE, KING: KING_TABLE}
+_EG_TABLES = {**_MG_TABLES, PAWN: PAWN_ENDGAME_TABLE, KING: KING_ENDGAME_TABLE}
+
+
+def _signed_table(tables, values):
+    """Builds [piece code][0x88 square] -> material + PST, positive for white and negative for black."""
+    table = [[0] * 128 for _ in range(15)]
+    for kind in range(PAWN, KING + 1):
+        for sq in SQUARES:
+            row, col = sq >> 4, sq & 7
+            table[kind][sq] = values[kind] + tables[kind][row * 8 + col]
+            table[kind | BLACK][sq] = -(values[kind] + tables[kind][(7 - row) * 8 + col])
+    return table
+
+
+MG_TABLE = _signed_table(_MG_TABLES, MG_VALUES)
+EG_TABLE = _signed_table(_EG_TABLES, EG_VALUES)
+PHASE_TABLE = [PHASE_WEIGHTS[code & 7] if code & 7 <= KING else 0 for code in range(15)]
+
+
+def compute_scores(position):
+    """Computes (mg_score, eg_score, phase) of a position from scratch."""
+    mg = eg = phase = 0
+    board = position.board
+    for sq in SQUARES:
+        piece = board[sq]
+        if piece:
+            mg += MG_TABLE[piece][sq]
+            eg += EG_TABLE[piece][sq]
+            phase += PHASE_TABLE[piece]
+    return mg, eg, phase
+
+
+def evaluate(position):
+    """Returns the score in centipawns from the side to move's point of view."""
+    phase = min(position.phase, MAX_PHASE)
+    score = (position.mg_score * phase + position.eg_score * (MAX_PHASE - phase)) // MAX_PHASE
+    return -score if position.side else score
+
+
+def _load_numpy():
+    """Imports NumPy and builds the batch lookup arrays on first use."""
+    global np, _MG_ARRAY, _EG_ARRAY, _PHASE_ARRAY
+    if np is not None:
+        return
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Batch evaluation requires NumPy") from None
+    _MG_ARRAY = numpy.array([[MG_TABLE[piece][sq] for sq in SQUARES] for piece in range(15)], dtype=numpy.int64)
+    _EG_ARRAY = numpy.array([[EG_TABLE[piece][sq] for sq in SQUARES] for piece in range(15)], dtype=numpy.int64)
+    _PHASE_ARRAY = numpy.array(PHASE_TABLE, dtype=numpy.int64)
+    np = numpy
+
+
+def boards_to_array(positions):
+    """Returns an (N, 64) uint8 NumPy array of piece codes, row 0 first, for a sequence of positions."""
+    _load_numpy()
+    raw = np.frombuffer(b"".join(bytes(position.board) for position in positions), dtype=np.uint8)
+    return raw.reshape(-1, 8, 16)[:, :, :8].reshape(-1, 64)
+
+
+def evaluate_batch(boards, sides=None):
+    """Scores many positions at once with NumPy.
+
+    boards is an (N, 64) array of piece codes as returned by
+    boards_to_array, or a sequence of Positions. Returns an int array of
+    scores from the side to move's point of view, like evaluate(). The side
+    to move comes from sides (0 for white, 8 for black per position) or,
+    when sides is None, from each Position; an array given without sides is
+    scored from white's point of view.
+    """
+    _load_numpy()
+    if not isinstance(boards, np.ndarray):
+        positions = list(boards)
+        if sides is None:
+            sides = [position.side for position in positions]
+        boards = boards_to_array(positions)
+    squares = np.arange(64)
+    mg = _MG_ARRAY[boards, squares].sum(axis=1)
+    eg = _EG_ARRAY[boards, squares].sum(axis=1)
+    phase = np.minimum(_PHASE_ARRAY[boards].sum(axis=1), MAX_PHASE)
+    scores = (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+    if sides is not None:
+        scores = np.where(np.asarray(sides) != 0, -scores, scores)
+    return scores
+
@@ -0,0 +1,100 @@
+"""Per-position game state: legal moves, check and the end-of-game status, computed once.
+
+Position.game_state() builds a GameState the first time it is asked for one
+and returns the same object until the next move is made or taken back, so
+the UI and the rules API can query moves, check and game-over status as
+often as they like without generating moves again.
+"""
+
+from chesscore.board import BISHOP, BLACK, KNIGHT, PAWN, QUEEN, ROOK, WHITE, color_name, move_to_tuple
+
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+FIFTY_MOVE_RULE = "fifty-move rule"
+THREEFOLD_REPETITION = "threefold repetition"
+INSUFFICIENT_MATERIAL = "insufficient material"
+
+FIFTY_MOVE_PLIES = 100
+
+
+def has_insufficient_material(position):
+    """Checks if neither side can possibly checkmate: bare kings, a single minor piece, or bishops on one color."""
+    lists = position.piece_lists
+    for side in (WHITE, BLACK):
+        if lists[side | PAWN] or lists[side | ROOK] or lists[side | QUEEN]:
+            return False
+    knights = lists[KNIGHT] + lists[BLACK | KNIGHT]
+    bishops = lists[BISHOP] + lists[BLACK | BISHOP]
+    if len(knights) + len(bishops) <= 1:
+        return True
+    # Any number of bishops that all stand on squares of one color cannot mate
+    return not knights and len({((sq >> 4) + sq) & 1 for sq in bishops}) == 1
+
+
+class GameState:
+    """Legal moves, check flag and terminal status of one position."""
+
+    __slots__ = ("moves", "in_check", "status", "moves_by_square", "_side")
+
+    def __init__(self, position):
+        self.moves = tuple(position.generate_legal())
+        self.in_check = position.is_check()
+        self._side = position.side
+        # A promotion is listed once per destination; the piece is picked when the move is made
+        self.moves_by_square = {}
+        for move in self.moves:
+            if move >> 16 in (0, QUEEN):
+                start_row, start_col, end_row, end_col = move_to_tuple(move)
+                self.moves_by_square.setdefault((start_row, start_col), []).append((end_row, end_col))
+
+        if not self.moves:
+            self.status = CHECKMATE if self.in_check else STALEMATE
+        elif has_insufficient_material(position):
+            self.status = INSUFFICIENT_MATERIAL
+        elif position.halfmove_clock >= FIFTY_MOVE_PLIES:
+            self.status = FIFTY_MOVE_RULE
+        elif position.is_threefold_repetition():
+            self.status = THREEFOLD_REPETITION
+        else:
+            self.status = None
+
+    @property
+    def is_over(self):
+        """Checks if the game has ended."""
+        return self.status is not None
+
+    @property
+    def is_checkmate(self):
+        return self.status == CHECKMATE
+
+    @property
+    def is_stalemate(self):
+        return self.status == STALEMATE
+
+    @property
+    def is_draw(self):
+        """Checks if the game has ended in a draw by any rule."""
+        return self.status is not None and self.status != CHECKMATE
+
+    @property
+    def result(self):
+        """The PGN result: "1-0", "0-1", "1/2-1/2", or "*" while the game goes on."""
+        if self.status is None:
+            return "*"
+        if self.status == CHECKMATE:
+            return "0-1" if self._side == WHITE else "1-0"
+        return "1/2-1/2"
+
+    def moves_from(self, row, col):
+        """Returns the legal destination squares for the piece on (row, col)."""
+        return self.moves_by_square.get((row, col), [])
+
+    def describe(self):
+        """Returns a message announcing the end of the game, or None while it goes on."""
+        if self.status is None:
+            return None
+        if self.status == CHECKMATE:
+            return f"Checkmate! {color_name(self._side ^ BLACK).capitalize()} wins!"
+        if self.status == STALEMATE:
+            return "Stalemate! It's a draw."
+        return f"Draw by {self.status}."
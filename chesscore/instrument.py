@@ -0,0 +1,218 @@
+"""Opt-in instrumentation: call counters, per-ply counts and latency histograms for the rules engine.
+
+    python -m chesscore profile --depth 4 --json stats.json
+    python -m chesscore profile --search --depth 5 --pstats search.prof
+
+Nothing is measured until enable() is called. enable() wraps the hot
+functions listed in TARGETS with counting and timing versions, and
+disable() puts the originals back, so with instrumentation off the engine
+runs exactly the code it runs without this module.
+"""
+
+import cProfile
+import functools
+import json
+import pstats
+import time
+from collections import Counter, defaultdict
+
+from chesscore import movegen, rules
+from chesscore.gamestate import GameState
+from chesscore.notation import STARTING_FEN, parse_fen
+from chesscore.position import Position
+
+HISTOGRAM_BUCKETS = 32  # Bucket i counts latencies in [2**(i-1), 2**i) microseconds
+
+# (owner, attribute, counter label, extra counting, latency histogram or None). Extra counting is
+# "ply" to also count per ply of the position (the first argument) or "moves" to total the moves returned.
+TARGETS = (
+    (rules, "is_check", "rules.is_check", None, None),
+    (rules, "get_all_valid_moves", "rules.get_all_valid_moves", None, "legal_moves"),
+    (rules, "make_move", "rules.make_move", None, None),
+    (movegen, "generate_legal_moves", "movegen nodes", "moves", None),
+    # movegen imports the attack queries by name, so they are wrapped where it looks them up
+    (movegen, "checkers_and_pins", "attacks.checkers_and_pins", None, None),
+    (movegen, "is_attacked", "attacks.is_attacked", None, None),
+    (Position, "generate_legal", "Position.generate_legal", "ply", "legal_moves"),
+    (Position, "apply", "moves made", "ply", None),
+    (Position, "copy", "board copies", "ply", None),
+    (Position, "is_check", "check tests", "ply", None),
+    (GameState, "__init__", "game states", None, "game_state"),
+)
+
+enabled = False
+counters = Counter()
+per_ply = defaultdict(Counter)
+histograms = {}
+_started = None
+_originals = []
+
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets."""
+
+    __slots__ = ("counts", "total", "count", "maximum")
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.total = 0.0
+        self.count = 0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        micros = seconds * 1_000_000
+        self.counts[min(int(micros).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, fraction):
+        """Returns the upper edge, in microseconds, of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return 1 << bucket
+        return 1 << (HISTOGRAM_BUCKETS - 1)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count * 1_000_000, 2) if self.count else 0,
+            "p50_us": self.percentile(0.5),
+            "p99_us": self.percentile(0.99),
+            "max_us": round(self.maximum * 1_000_000, 2),
+            "buckets_us": {f"<{1 << bucket}": count for bucket, count in enumerate(self.counts) if count},
+        }
+
+
+def histogram(name):
+    """Returns the histogram called name, creating it if needed."""
+    found = histograms.get(name)
+    if found is None:
+        found = histograms[name] = Histogram()
+    return found
+
+
+def _wrap(function, label, extra, timed):
+    latency = histogram(timed) if timed else None
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        counters[label] += 1
+        if extra == "ply":
+            per_ply[label][len(args[0].history)] += 1
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        if latency is not None:
+            latency.record(time.perf_counter() - start)
+        if extra == "moves":
+            counters["moves generated"] += len(result)
+        return result
+
+    return wrapper
+
+
+def enable():
+    """Starts counting and timing. Calling it again while enabled does nothing."""
+    global enabled, _started
+    if enabled:
+        return
+    for owner, name, label, extra, timed in TARGETS:
+        original = getattr(owner, name)
+        _originals.append((owner, name, original))
+        setattr(owner, name, _wrap(original, label, extra, timed))
+    _started = time.perf_counter()
+    enabled = True
+
+
+def disable():
+    """Stops measuring and restores the original functions. Collected stats are kept."""
+    global enabled
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+    enabled = False
+
+
+def reset():
+    """Clears every counter and histogram."""
+    global _started
+    counters.clear()
+    per_ply.clear()
+    histograms.clear()
+    _started = time.perf_counter() if enabled else None
+
+
+def stats():
+    """Returns everything collected so far as a JSON-serialisable dict."""
+    elapsed = time.perf_counter() - _started if _started is not None else 0.0
+    return {
+        "seconds": round(elapsed, 6),
+        "counters": dict(counters),
+        "per_ply": {label: {str(ply): count for ply, count in sorted(plies.items())}
+                    for label, plies in per_ply.items()},
+        "histograms": {name: found.summary() for name, found in histograms.items()},
+        "moves_per_second": round(counters["moves generated"] / elapsed) if elapsed > 0 else 0,
+    }
+
+
+def export_json(path):
+    """Writes stats() to a JSON file."""
+    with open(path, "w") as file:
+        json.dump(stats(), file, indent=2)
+
+
+def profile(function, *args, path=None):
+    """Runs function(*args) under cProfile and returns (its result, pstats.Stats); dumps to path if given."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args)
+    if path is not None:
+        profiler.dump_stats(path)
+    return result, pstats.Stats(profiler)
+
+
+def add_arguments(parser):
+    parser.add_argument("--fen", default=STARTING_FEN, help="position to run from (default: start position)")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--search", action="store_true", help="profile a fixed-depth search instead of perft")
+    parser.add_argument("--json", default=None, help="write the counters and histograms to this JSON file")
+    parser.add_argument("--pstats", default=None, help="also run under cProfile and dump pstats to this file")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    from chesscore.perft import perft
+    from chesscore.search import Searcher
+
+    position = parse_fen(args.fen)
+    if args.search:
+        def workload():
+            return Searcher().search(position, args.depth).nodes
+    else:
+        def workload():
+            return perft(position, args.depth)
+
+    enable()
+    try:
+        if args.pstats:
+            nodes, profile_stats = profile(workload, path=args.pstats)
+            profile_stats.sort_stats("cumulative").print_stats(15)
+        else:
+            nodes = workload()
+    finally:
+        disable()
+    collected = stats()
+    print(f"{nodes} nodes in {collected['seconds']:.3f}s (instrumented)")
+    for label, count in sorted(collected["counters"].items()):
+        print(f"  {label:<28} {count:>10}")
+    for name, summary in collected["histograms"].items():
+        if summary["count"]:
+            print(f"  {name:<28} p50 <{summary['p50_us']}us  p99 <{summary['p99_us']}us  max {summary['max_us']}us")
+    if args.json:
+        export_json(args.json)
+    return 0
@@ -0,0 +1,117 @@
+"""Load generator for the game server: many clients playing random games at once.
+
+    python -m chesscore loadgen --clients 50 --games 20 --plies 60     # against an in-process server
+    python -m chesscore loadgen --port 8765 --clients 200              # against a running server
+
+Each client opens one connection, starts its games and then plays a random
+legal move in each of them in turn, waiting for every reply. Reports the
+moves per second, the round-trip latency seen by the clients and the
+server's own move-validation latency.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from chesscore.instrument import Histogram
+from chesscore.server import GameServer
+
+
+async def _request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    if reply["type"] == "error":
+        raise RuntimeError(reply["message"])
+    return reply
+
+
+async def _client(host, port, games, plies, rng, round_trips):
+    reader, writer = await asyncio.open_connection(host, port)
+    moves = 0
+    try:
+        states = [await _request(reader, writer, {"op": "new"}) for _ in range(games)]
+        for _ in range(plies):
+            playing = [state for state in states if state["status"] is None]
+            if not playing:
+                break
+            states = []
+            for state in playing:
+                move = rng.choice(state["legal_moves"])
+                start = time.perf_counter()
+                states.append(await _request(reader, writer, {"op": "move", "game": state["game"], "move": move}))
+                round_trips.record(time.perf_counter() - start)
+                moves += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return moves
+
+
+async def run_load(host, port, clients=50, games=20, plies=60, seed=None):
+    """Runs clients concurrently against a server and returns a report dict.
+
+    Every client plays games games for at most plies plies each.
+    """
+    rng = random.Random(seed)
+    round_trips = Histogram()
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(_client(host, port, games, plies, random.Random(rng.random()), round_trips)
+                                    for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = await _request(reader, writer, {"op": "stats"})
+    writer.close()
+    await writer.wait_closed()
+    moves = sum(counts)
+    return {
+        "clients": clients,
+        "moves": moves,
+        "seconds": elapsed,
+        "moves_per_second": moves / elapsed if elapsed > 0 else 0.0,
+        "round_trip": round_trips.summary(),
+        "server": stats,
+    }
+
+
+async def _run_with_server(clients, games, plies, seed):
+    ready = asyncio.get_running_loop().create_future()
+    server = GameServer()
+    task = asyncio.create_task(server.serve("127.0.0.1", 0, ready.set_result))
+    listening = await ready
+    port = listening.sockets[0].getsockname()[1]
+    try:
+        return await run_load("127.0.0.1", port, clients, games, plies, seed)
+    finally:
+        while server.clients:
+            await asyncio.sleep(0.001)  # Let the handlers see their connections close
+        task.cancel()
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="server to load (default: start one in this process)")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=20, help="games per client")
+    parser.add_argument("--plies", type=int, default=60, help="plies per game at most")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    if args.port is None:
+        report = asyncio.run(_run_with_server(args.clients, args.games, args.plies, args.seed))
+    else:
+        report = asyncio.run(run_load(args.host, args.port, args.clients, args.games, args.plies, args.seed))
+    server = report["server"]
+    validation = server["validation"]
+    print(f"{report['moves']} moves by {report['clients']} clients in {report['seconds']:.3f}s "
+          f"({report['moves_per_second']:.0f} moves/s)")
+    print(f"round trip   p50 <{report['round_trip']['p50_us']}us  p99 <{report['round_trip']['p99_us']}us")
+    print(f"validation   p50 <{validation['p50_us']}us  p99 <{validation['p99_us']}us  "
+          f"mean {validation['mean_us']}us")
+    print(f"server       {server['sessions']} sessions, {server['memory_bytes'] / 1024 / 1024:.1f} MiB "
+          f"({server['bytes_per_session']} bytes/session), {server['evicted']} evicted")
+    return 0
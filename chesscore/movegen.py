@@ -0,0 +1,165 @@
+"""Move generation on the 0x88 board.
+
+Generators append encoded moves (see board.encode_move) to a list. They are
+pseudo-legal; generate_legal_moves turns them into legal moves using the
+checkers and pins of the position instead of playing every move.
+"""
+
+from chesscore.attacks import checkers_and_pins, is_attacked
+from chesscore.board import (
+    BISHOP, BISHOP_DIRECTIONS, BLACK, KING, KING_OFFSETS, KNIGHT, KNIGHT_OFFSETS, PAWN, QUEEN, QUEEN_DIRECTIONS,
+    EMPTY, NO_SQUARE, ROOK, ROOK_DIRECTIONS, WHITE, BLACK_KING_SIDE, BLACK_QUEEN_SIDE, WHITE_KING_SIDE,
+    WHITE_QUEEN_SIDE,
+)
+
+PROMOTION_TYPES = (QUEEN, KNIGHT, ROOK, BISHOP)
+
+
+def generate_slider_moves(board, from_sq, directions, side, moves):
+    """Appends moves for a sliding piece (rook, bishop or queen) walking along the given directions."""
+    for step in directions:
+        to_sq = from_sq + step
+        while not to_sq & 0x88:
+            target = board[to_sq]
+            if target:
+                if target & BLACK != side:
+                    moves.append(from_sq | (to_sq << 8))
+                break
+            moves.append(from_sq | (to_sq << 8))
+            to_sq += step
+
+
+def generate_step_moves(board, from_sq, offsets, side, moves):
+    """Appends moves for a single-step piece (knight or king) using the given offsets."""
+    for step in offsets:
+        to_sq = from_sq + step
+        if not to_sq & 0x88:
+            target = board[to_sq]
+            if not target or target & BLACK != side:
+                moves.append(from_sq | (to_sq << 8))
+
+
+def _append_pawn_move(from_sq, to_sq, moves):
+    """Appends a pawn move, expanded into one move per piece when it promotes."""
+    if to_sq < 8 or to_sq >= 112:
+        for promotion in PROMOTION_TYPES:
+            moves.append(from_sq | (to_sq << 8) | (promotion << 16))
+    else:
+        moves.append(from_sq | (to_sq << 8))
+
+
+def generate_pawn_moves(board, from_sq, side, ep_square, moves):
+    """Appends pawn pushes, captures, en passant captures and promotions."""
+    if side == WHITE:
+        forward, start_row = -16, 6
+    else:
+        forward, start_row = 16, 1
+    to_sq = from_sq + forward
+
+    # Pushes
+    if not board[to_sq]:
+        _append_pawn_move(from_sq, to_sq, moves)
+        if from_sq >> 4 == start_row and not board[to_sq + forward]:
+            moves.append(from_sq | ((to_sq + forward) << 8))
+
+    # Captures, including en passant
+    for to_sq in (from_sq + forward - 1, from_sq + forward + 1):
+        if not to_sq & 0x88:
+            target = board[to_sq]
+            if target and target & BLACK != side:
+                _append_pawn_move(from_sq, to_sq, moves)
+            elif to_sq == ep_square:
+                moves.append(from_sq | (to_sq << 8))
+
+
+def generate_castling_moves(board, king_sq, side, castling, moves):
+    """Appends castling moves for the king if they are allowed."""
+    if side == WHITE:
+        king_side, queen_side, rook = WHITE_KING_SIDE, WHITE_QUEEN_SIDE, ROOK
+    else:
+        king_side, queen_side, rook = BLACK_KING_SIDE, BLACK_QUEEN_SIDE, ROOK | BLACK
+    enemy = side ^ BLACK
+    if castling & king_side and board[king_sq + 3] == rook and not board[king_sq + 1] and not board[king_sq + 2]:
+        if not (is_attacked(board, king_sq, enemy) or is_attacked(board, king_sq + 1, enemy)
+                or is_attacked(board, king_sq + 2, enemy)):
+            moves.append(king_sq | ((king_sq + 2) << 8))
+    if (castling & queen_side and board[king_sq - 4] == rook and not board[king_sq - 1]
+            and not board[king_sq - 2] and not board[king_sq - 3]):
+        if not (is_attacked(board, king_sq, enemy) or is_attacked(board, king_sq - 1, enemy)
+                or is_attacked(board, king_sq - 2, enemy)):
+            moves.append(king_sq | ((king_sq - 2) << 8))
+
+
+def generate_pseudo_legal_moves(position):
+    """Returns all moves for the side to move that obey piece movement rules, ignoring whether the king is left in check."""
+    board = position.board
+    side = position.side
+    piece_lists = position.piece_lists
+    moves = []
+    for from_sq in piece_lists[side | PAWN]:
+        generate_pawn_moves(board, from_sq, side, position.ep_square, moves)
+    for from_sq in piece_lists[side | KNIGHT]:
+        generate_step_moves(board, from_sq, KNIGHT_OFFSETS, side, moves)
+    for from_sq in piece_lists[side | BISHOP]:
+        generate_slider_moves(board, from_sq, BISHOP_DIRECTIONS, side, moves)
+    for from_sq in piece_lists[side | ROOK]:
+        generate_slider_moves(board, from_sq, ROOK_DIRECTIONS, side, moves)
+    for from_sq in piece_lists[side | QUEEN]:
+        generate_slider_moves(board, from_sq, QUEEN_DIRECTIONS, side, moves)
+    king_sq = position.king_squares[side >> 3]
+    if king_sq != NO_SQUARE:
+        generate_step_moves(board, king_sq, KING_OFFSETS, side, moves)
+        if position.castling:
+            generate_castling_moves(board, king_sq, side, position.castling, moves)
+    return moves
+
+
+def generate_legal_moves(position):
+    """Returns all legal moves for the side to move.
+
+    Checkers and pins are computed once. A move is then legal when it is a
+    king move to an unattacked square, or a move of an unpinned piece (or a
+    pinned piece along its pin line) that answers any single check. Only en
+    passant captures, which can uncover an attack along the rank, are tested
+    by playing them. Raises ValueError if the side to move has no king.
+    """
+    board = position.board
+    side = position.side
+    enemy = side ^ BLACK
+    king_sq = position.king_squares[side >> 3]
+    if king_sq == NO_SQUARE:
+        raise ValueError(f"No {'black' if side else 'white'} king on the board")
+    checkers, block_squares, pins = checkers_and_pins(board, king_sq, side)
+
+    if len(checkers) > 1:
+        # Double check: only the king can move
+        moves = []
+        generate_step_moves(board, king_sq, KING_OFFSETS, side, moves)
+    else:
+        moves = generate_pseudo_legal_moves(position)
+
+    legal = []
+    ep_square = position.ep_square
+    # Lift the king so squares behind it along a checking ray count as attacked
+    board[king_sq] = EMPTY
+    for move in moves:
+        from_sq = move & 0xFF
+        to_sq = (move >> 8) & 0xFF
+        if from_sq == king_sq:
+            if to_sq - from_sq in (2, -2) or not is_attacked(board, to_sq, enemy):
+                legal.append(move)
+        elif to_sq == ep_square and board[from_sq] & 7 == PAWN:
+            board[king_sq] = KING | side
+            position.apply(move)
+            if not is_attacked(board, king_sq, enemy):
+                legal.append(move)
+            position.unmake_move()
+            board[king_sq] = EMPTY
+        elif checkers and to_sq not in block_squares:
+            continue
+        elif from_sq in pins and to_sq not in pins[from_sq]:
+            continue
+        else:
+            legal.append(move)
+    board[king_sq] = KING | side
+    return legal
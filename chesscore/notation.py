@@ -0,0 +1,218 @@
+"""Text notations for positions and moves: FEN, UCI long algebraic and SAN."""
+
+import re
+
+from chesscore.attacks import is_attacked
+from chesscore.board import (
+    BLACK, KING, NO_SQUARE, PAWN, PIECE_NAMES, TYPE_LETTERS, castling_to_dict, decode_move, rows_from_board,
+)
+from chesscore.position import Position
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Row of the king and column of the rook each castling right (K, Q, k, q) needs on its home square
+CASTLING_HOMES = ((7, 7, "w"), (7, 0, "w"), (0, 7, "b"), (0, 0, "b"))
+
+
+# Algebraic name of every 0x88 square, "" off the board
+SQUARE_NAMES = tuple("" if sq & 0x88 else "abcdefgh"[sq & 7] + str(8 - (sq >> 4)) for sq in range(128))
+
+
+def square_name(sq):
+    """Returns the algebraic name ("e4") of a 0x88 square."""
+    return SQUARE_NAMES[sq]
+
+
+def parse_square(name):
+    """Returns the 0x88 square of an algebraic name such as "e4"."""
+    if len(name) != 2 or name[0] not in "abcdefgh" or name[1] not in "12345678":
+        raise ValueError(f"Invalid square: {name!r}")
+    return (8 - int(name[1])) * 16 + ord(name[0]) - ord("a")
+
+
+# Piece letter, disambiguating file and rank, capture, destination and promotion of a SAN move
+SAN_PATTERN = re.compile(r"([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?")
+
+
+def parse_fen(fen):
+    """Builds a Position from a FEN string. The clock fields are optional and default to 0 and 1."""
+    fields = fen.split()
+    if len(fields) < 4 or len(fields) > 6:
+        raise ValueError(f"Invalid FEN: {fen!r}")
+    placement, active, castling, en_passant = fields[:4]
+
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"Invalid FEN board: {placement!r}")
+    board = []
+    for rank in ranks:
+        row = []
+        for char in rank:
+            if char.isdigit():
+                row.extend(["--"] * int(char))
+            elif char.lower() in "pnbrqk":
+                row.append(("w" if char.isupper() else "b") + char.lower())
+            else:
+                raise ValueError(f"Invalid FEN piece: {char!r}")
+        if len(row) != 8:
+            raise ValueError(f"Invalid FEN rank: {rank!r}")
+        board.append(row)
+
+    for color, name in (("w", "white"), ("b", "black")):
+        if sum(row.count(color + "k") for row in board) != 1:
+            raise ValueError(f"Invalid FEN board: {name} must have exactly one king")
+    if "wp" in board[0] + board[7] or "bp" in board[0] + board[7]:
+        raise ValueError("Invalid FEN board: pawn on the first or last rank")
+
+    if active not in ("w", "b"):
+        raise ValueError(f"Invalid FEN side to move: {active!r}")
+    mask = 0
+    if castling != "-":
+        for char in castling:
+            if char not in "KQkq":
+                raise ValueError(f"Invalid FEN castling rights: {castling!r}")
+            mask |= 1 << "KQkq".index(char)
+    # Drop rights whose king or rook has left its home square; they could never be used
+    for bit, (row, rook_col, color) in enumerate(CASTLING_HOMES):
+        if board[row][4] != color + "k" or board[row][rook_col] != color + "r":
+            mask &= ~(1 << bit)
+    en_passant_target = None
+    if en_passant != "-":
+        sq = parse_square(en_passant)
+        # The square a pawn just skipped: rank 6 with white to move, rank 3 with black to move
+        if sq >> 4 != (2 if active == "w" else 5):
+            raise ValueError(f"Invalid FEN en passant square: {en_passant!r}")
+        en_passant_target = (sq >> 4, sq & 7)
+    try:
+        halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+    except ValueError:
+        raise ValueError(f"Invalid FEN move clocks: {fen!r}") from None
+    if halfmove_clock < 0 or fullmove_number < 1:
+        raise ValueError(f"Invalid FEN move clocks: {fen!r}")
+    position = Position(board, "white" if active == "w" else "black", en_passant_target, castling_to_dict(mask),
+                        halfmove_clock, fullmove_number)
+    if is_attacked(position.board, position.king_squares[(position.side ^ BLACK) >> 3], position.side):
+        raise ValueError(f"Invalid FEN: the side not to move is in check: {fen!r}")
+    return position
+
+
+def to_fen(position):
+    """Returns the FEN string of a position, including both move clocks."""
+    ranks = []
+    for row in rows_from_board(position.board):
+        rank = ""
+        empty = 0
+        for piece in row:
+            if piece == "--":
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            rank += piece[1].upper() if piece[0] == "w" else piece[1]
+        ranks.append(rank + (str(empty) if empty else ""))
+    castling = "".join(char for bit, char in enumerate("KQkq") if position.castling & (1 << bit)) or "-"
+    en_passant = square_name(position.ep_square) if position.ep_square != NO_SQUARE else "-"
+    return (f"{'/'.join(ranks)} {'w' if position.turn == 'white' else 'b'} {castling} {en_passant} "
+            f"{position.halfmove_clock} {position.fullmove_number}")
+
+
+def move_to_uci(move):
+    """Returns the UCI long algebraic form ("e2e4", "e7e8q") of an encoded move."""
+    text = SQUARE_NAMES[move & 0xFF] + SQUARE_NAMES[(move >> 8) & 0xFF]
+    return text + TYPE_LETTERS[move >> 16] if move >> 16 else text
+
+
+def encode_uci(text):
+    """Returns the encoded move of a UCI string without checking that it is legal anywhere."""
+    if len(text) not in (4, 5) or (len(text) == 5 and text[4] not in "nbrq"):
+        raise ValueError(f"Invalid UCI move {text!r}")
+    promotion = TYPE_LETTERS.index(text[4]) if len(text) == 5 else 0
+    return parse_square(text[:2]) | parse_square(text[2:4]) << 8 | promotion << 16
+
+
+def parse_uci(position, text):
+    """Returns the legal encoded move in position matching a UCI string."""
+    move = encode_uci(text)
+    if move not in position.generate_legal():
+        raise ValueError(f"Illegal move {text!r}")
+    return move
+
+
+def move_to_san(position, move, legal_moves=None):
+    """Returns the standard algebraic form ("Nf3", "exd5", "O-O", "e8=Q+") of a legal encoded move.
+
+    legal_moves may be passed to reuse an already generated move list.
+    """
+    from_sq, to_sq, promotion = decode_move(move)
+    board = position.board
+    piece = board[from_sq]
+    kind = piece & 7
+    if kind == KING and to_sq - from_sq in (2, -2):
+        san = "O-O" if to_sq > from_sq else "O-O-O"
+    elif kind == PAWN:
+        san = ""
+        if from_sq & 7 != to_sq & 7:
+            san = square_name(from_sq)[0] + "x"
+        san += square_name(to_sq)
+        if promotion:
+            san += "=" + TYPE_LETTERS[promotion].upper()
+    else:
+        if legal_moves is None:
+            legal_moves = position.generate_legal()
+        rivals = [other & 0xFF for other in legal_moves
+                  if (other >> 8) & 0xFF == to_sq and other & 0xFF != from_sq and board[other & 0xFF] == piece]
+        san = PIECE_NAMES[piece][1].upper()
+        if rivals:
+            if all(sq & 7 != from_sq & 7 for sq in rivals):
+                san += square_name(from_sq)[0]
+            elif all(sq >> 4 != from_sq >> 4 for sq in rivals):
+                san += square_name(from_sq)[1]
+            else:
+                san += square_name(from_sq)
+        if board[to_sq]:
+            san += "x"
+        san += square_name(to_sq)
+    position.apply(move)
+    if position.is_check():
+        san += "#" if not position.generate_legal() else "+"
+    position.unmake_move()
+    return san
+
+
+def parse_san(position, text, legal_moves=None):
+    """Returns the legal encoded move in position matching a SAN string such as "Nbd7", "exd6" or "O-O+"."""
+    san = text.rstrip("+#!?")
+    if legal_moves is None:
+        legal_moves = position.generate_legal()
+    board = position.board
+    if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        step = 2 if len(san) == 3 else -2
+        for move in legal_moves:
+            from_sq = move & 0xFF
+            if board[from_sq] & 7 == KING and (move >> 8) - from_sq == step:
+                return move
+        raise ValueError(f"Illegal move {text!r}")
+
+    match = SAN_PATTERN.fullmatch(san)
+    if match is None:
+        raise ValueError(f"Invalid SAN move: {text!r}")
+    letter, from_file, from_rank, _, destination, promotion = match.groups()
+    kind = TYPE_LETTERS.index(letter.lower()) if letter else PAWN
+    to_sq = parse_square(destination)
+    promotion = TYPE_LETTERS.index(promotion.lower()) if promotion else 0
+    found = None
+    for move in legal_moves:
+        from_sq = move & 0xFF
+        if ((move >> 8) & 0xFF != to_sq or board[from_sq] & 7 != kind or move >> 16 != promotion
+                or (from_file and "abcdefgh"[from_sq & 7] != from_file)
+                or (from_rank and str(8 - (from_sq >> 4)) != from_rank)):
+            continue
+        if found is not None:
+            raise ValueError(f"Ambiguous move {text!r}")
+        found = move
+    if found is None:
+        raise ValueError(f"Illegal move {text!r}")
+    return found
+
@@ -0,0 +1,249 @@
+"""Parallel search and perft across processes, with a transposition table in shared memory.
+
+    python -m chesscore parallel --depth 5 --workers 1 2 4
+    python -m chesscore parallel --perft --depth 5 --workers 1 2 4
+
+Search is lazy SMP: every worker process searches the same root position
+with its own Searcher, and all of them read and write one
+SharedTranspositionTable, so each worker's results cut off work for the
+others. The first worker's result is the answer; helpers are stopped
+through a flag in the shared block once it finishes. Perft splits the root
+moves across the pool instead.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from chesscore.notation import STARTING_FEN, move_to_uci, parse_fen
+from chesscore.perft import perft
+from chesscore.search import SearchResult, SearchStopped, Searcher
+
+WORD_BYTES = 8
+HEADER_WORDS = 1  # Word 0 is the stop flag
+SLOT_WORDS = 2  # key ^ data, data
+SLOTS_PER_BUCKET = 2  # Depth-preferred slot, then always-replace slot
+
+# Packed entry layout, low bits first
+MOVE_BITS = 19
+FLAG_SHIFT = MOVE_BITS
+DEPTH_SHIFT = FLAG_SHIFT + 2
+SCORE_SHIFT = DEPTH_SHIFT + 8
+SCORE_BIAS = 1 << 20
+HASHFULL_SAMPLE = 1000
+
+
+class SharedTranspositionTable:
+    """Search transposition table in a multiprocessing.shared_memory block.
+
+    Entries are packed into two 64-bit words, (key ^ data, data), so a
+    reader in another process can detect a half-written entry without
+    locks: it only accepts an entry whose words XOR back to its key. probe
+    and store have the same shape as TranspositionTable for the (score,
+    flag, move) values the searcher stores. Pass name to attach to a table
+    created by another process.
+    """
+
+    def __init__(self, memory_mb=32, name=None):
+        if name is None:
+            buckets = max(1, int(memory_mb * 1024 * 1024) // (WORD_BYTES * SLOT_WORDS * SLOTS_PER_BUCKET))
+            bucket_count = 1 << (buckets.bit_length() - 1)
+            size = (HEADER_WORDS + bucket_count * SLOTS_PER_BUCKET * SLOT_WORDS) * WORD_BYTES
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            # Pool workers share the creator's resource tracker, so attaching does not register a second owner
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.words = self.shm.buf.cast("Q")
+        slot_count = (len(self.words) - HEADER_WORDS) // SLOT_WORDS
+        self.bucket_count = slot_count // SLOTS_PER_BUCKET
+        self.mask = self.bucket_count - 1
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @property
+    def name(self):
+        """Name other processes pass to attach to this table."""
+        return self.shm.name
+
+    def probe(self, key):
+        """Returns (depth, (score, flag, move)) stored for key, or None."""
+        words = self.words
+        base = HEADER_WORDS + (key & self.mask) * SLOTS_PER_BUCKET * SLOT_WORDS
+        for slot in range(base, base + SLOTS_PER_BUCKET * SLOT_WORDS, SLOT_WORDS):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                self.hits += 1
+                score = (data >> SCORE_SHIFT) - SCORE_BIAS
+                depth = ((data >> DEPTH_SHIFT) & 0xFF) - 128
+                return depth, (score, (data >> FLAG_SHIFT) & 3, data & ((1 << MOVE_BITS) - 1))
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value):
+        """Stores a (score, flag, move) value for key, searched to depth."""
+        score, flag, move = value
+        depth = max(-127, min(127, depth))
+        data = (score + SCORE_BIAS) << SCORE_SHIFT | (depth + 128) << DEPTH_SHIFT | flag << FLAG_SHIFT | move
+        words = self.words
+        slot = HEADER_WORDS + (key & self.mask) * SLOTS_PER_BUCKET * SLOT_WORDS
+        first = words[slot + 1]
+        # Keep the deeper entry in the first slot; everything else goes to the second
+        if first and words[slot] ^ first != key and depth < ((first >> DEPTH_SHIFT) & 0xFF) - 128:
+            slot += SLOT_WORDS
+        words[slot + 1] = data
+        words[slot] = key ^ data
+        self.stores += 1
+
+    def clear(self):
+        """Empties the table."""
+        self.shm.buf[HEADER_WORDS * WORD_BYTES:] = bytes(len(self.shm.buf) - HEADER_WORDS * WORD_BYTES)
+
+    def hashfull(self):
+        """Returns the fraction of slots in use, in permille, sampled from the start of the table."""
+        sample = min(HASHFULL_SAMPLE, self.bucket_count * SLOTS_PER_BUCKET)
+        used = sum(1 for slot in range(sample) if self.words[HEADER_WORDS + slot * SLOT_WORDS + 1])
+        return used * 1000 // sample
+
+    def request_stop(self):
+        """Tells every searcher attached to this table to stop."""
+        self.words[0] = 1
+
+    def reset_stop(self):
+        self.words[0] = 0
+
+    @property
+    def stop_requested(self):
+        return self.words[0] != 0
+
+    def close(self):
+        """Detaches from the block, and frees it if this process created it."""
+        self.words.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedSearcher(Searcher):
+    """Searcher that also stops when another process requests it through the shared table."""
+
+    def _check_budget(self):
+        if self.table.stop_requested:
+            self.stopped = True
+            raise SearchStopped
+        super()._check_budget()
+
+
+# Per-process state of pool workers
+_worker_table = None
+_worker_searcher = None
+
+
+def _attach_worker(table_name):
+    global _worker_table, _worker_searcher
+    _worker_table = SharedTranspositionTable(name=table_name)
+    _worker_searcher = SharedSearcher(_worker_table)
+
+
+def _search_task(position, max_depth, time_limit, node_limit):
+    result = _worker_searcher.search(position, max_depth, time_limit, node_limit)
+    return result.best_move, result.score, result.depth, result.nodes, result.pv
+
+
+def _perft_task(position, depth):
+    return perft(position, depth)
+
+
+class ParallelSearcher:
+    """Lazy-SMP search over a pool of worker processes sharing one transposition table.
+
+    Use it as a context manager, or call close() to shut the pool down and
+    free the shared memory.
+    """
+
+    def __init__(self, workers=None, memory_mb=32):
+        self.workers = workers or os.cpu_count() or 1
+        self.table = SharedTranspositionTable(memory_mb)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_attach_worker, initargs=(self.table.name,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+        self.table.close()
+
+    def search(self, position, max_depth=64, time_limit=None, node_limit=None):
+        """Searches position on every worker and returns the first worker's SearchResult.
+
+        Every other helper searches one ply deeper, so the table gets
+        entries the main worker has not reached yet. nodes is the total over
+        all workers.
+        """
+        start = time.perf_counter()
+        self.table.reset_stop()
+        # The main search is submitted first so the first idle worker picks it up
+        futures = [self.executor.submit(_search_task, position, max_depth + (index & 1), time_limit, node_limit)
+                   for index in range(self.workers)]
+        best_move, score, depth, nodes, pv = futures[0].result()
+        self.table.request_stop()
+        for future in futures[1:]:
+            nodes += future.result()[3]
+        return SearchResult(best_move, score, depth, nodes, time.perf_counter() - start, pv)
+
+    def perft(self, position, depth):
+        """Counts leaf nodes to depth, splitting the root moves across the workers."""
+        if depth <= 1:
+            return perft(position, depth)
+        children = []
+        for move in position.generate_legal():
+            position.apply(move)
+            children.append(position.copy())
+            position.unmake_move()
+        return sum(self.executor.map(_perft_task, children, [depth - 1] * len(children)))
+
+
+def benchmark(position, depth, worker_counts, run_perft=False, report=print):
+    """Times a fixed-depth search (or perft) for each worker count.
+
+    Returns a list of {"workers", "seconds", "nodes", "speedup"} dicts, with
+    speedup relative to the first worker count.
+    """
+    results = []
+    for workers in worker_counts:
+        with ParallelSearcher(workers) as searcher:
+            start = time.perf_counter()
+            if run_perft:
+                nodes = searcher.perft(position.copy(), depth)
+                detail = ""
+            else:
+                result = searcher.search(position.copy(), depth)
+                nodes = result.nodes
+                detail = f"  bestmove {move_to_uci(result.best_move) if result.best_move else '(none)'}"
+            elapsed = time.perf_counter() - start
+        speedup = results[0]["seconds"] / elapsed if results and elapsed > 0 else 1.0
+        results.append({"workers": workers, "seconds": elapsed, "nodes": nodes, "speedup": speedup})
+        report(f"workers {workers:>3}  {elapsed:8.3f}s  {nodes:>10} nodes  speedup {speedup:5.2f}x{detail}")
+    return results
+
+
+def add_arguments(parser):
+    parser.add_argument("--fen", default=STARTING_FEN, help="position to search (default: start position)")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="worker counts to benchmark (default: 1 and every CPU)")
+    parser.add_argument("--perft", action="store_true", help="benchmark perft instead of search")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, cpus})
+    benchmark(parse_fen(args.fen), args.depth, worker_counts, args.perft)
+    return 0
@@ -0,0 +1,127 @@
+"""Perft: count leaf nodes of the legal move tree to verify and benchmark move generation.
+
+    python -m chesscore perft --depth 4
+    python -m chesscore perft --fen "<fen>" --depth 3 --divide
+    python -m chesscore perft --suite --max-nodes 2000000
+"""
+
+import time
+
+from chesscore.notation import STARTING_FEN, move_to_uci, parse_fen
+
+# Standard reference positions with known node counts per depth
+REFERENCE_POSITIONS = [
+    ("initial", STARTING_FEN,
+     {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609, 6: 119060324}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862, 4: 4085603, 5: 193690690}),
+    ("endgame-pins", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624, 6: 11030083}),
+    ("promotions", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333, 5: 15833292}),
+    ("promotions-mirrored", "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333, 5: 15833292}),
+    ("discovered-promotion", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     {1: 44, 2: 1486, 3: 62379, 4: 2103487, 5: 89941194}),
+    ("middlegame", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890, 4: 3894594, 5: 164075551}),
+    ("illegal-ep-move", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", {6: 1134888}),
+    ("illegal-ep-capture", "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1", {6: 1015133}),
+    ("ep-capture-checks", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", {6: 1440467}),
+    ("short-castle-check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", {6: 661072}),
+    ("long-castle-check", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", {6: 803711}),
+    ("castle-rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", {4: 1274206}),
+    ("castling-prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", {4: 1720476}),
+    ("promote-out-of-check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", {6: 3821001}),
+    ("discovered-check", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1", {5: 1004658}),
+    ("promote-to-check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", {6: 217342}),
+    ("underpromote-to-check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", {6: 92683}),
+    ("self-stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", {6: 2217}),
+    ("stalemate-checkmate", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", {7: 567584}),
+    ("stalemate-checkmate-2", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1", {4: 23527}),
+]
+
+
+def perft(position, depth):
+    """Returns the number of leaf nodes of the legal move tree to depth."""
+    moves = position.generate_legal()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        position.apply(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+
+def divide(position, depth):
+    """Returns {uci move: leaf nodes below it} for every legal root move."""
+    counts = {}
+    for move in position.generate_legal():
+        position.apply(move)
+        counts[move_to_uci(move)] = perft(position, depth - 1)
+        position.unmake_move()
+    return counts
+
+
+def timed_perft(position, depth):
+    """Runs perft and returns (nodes, seconds, nodes per second)."""
+    start = time.perf_counter()
+    nodes = perft(position, depth)
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed, nodes / elapsed if elapsed > 0 else 0.0
+
+
+def run_suite(max_nodes=1_000_000, report=print):
+    """Runs every reference position at each depth whose expected count is at most max_nodes.
+
+    Returns a list of result dicts; report is called with one line per run.
+    """
+    results = []
+    for name, fen, expected in REFERENCE_POSITIONS:
+        for depth, want in sorted(expected.items()):
+            if want > max_nodes:
+                continue
+            nodes, elapsed, nps = timed_perft(parse_fen(fen), depth)
+            result = {"name": name, "depth": depth, "nodes": nodes, "expected": want,
+                      "passed": nodes == want, "seconds": elapsed, "nps": nps}
+            results.append(result)
+            report(f"{name:<24} depth {depth}  {nodes:>10} nodes  {elapsed:8.3f}s  {nps:>10.0f} nps  "
+                   f"{'ok' if result['passed'] else f'FAIL (expected {want})'}")
+    return results
+
+
+def add_arguments(parser):
+    parser.add_argument("--fen", default=STARTING_FEN, help="position to count from (default: start position)")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--divide", action="store_true", help="print the node count below each root move")
+    parser.add_argument("--suite", action="store_true", help="run the reference positions instead")
+    parser.add_argument("--max-nodes", type=int, default=1_000_000,
+                        help="with --suite, skip runs expected to exceed this many nodes")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    if args.suite:
+        results = run_suite(args.max_nodes)
+        nodes = sum(result["nodes"] for result in results)
+        seconds = sum(result["seconds"] for result in results)
+        failed = [result for result in results if not result["passed"]]
+        print(f"{len(results) - len(failed)}/{len(results)} passed, {nodes} nodes in {seconds:.3f}s "
+              f"({nodes / seconds if seconds else 0:.0f} nps)")
+        return 1 if failed else 0
+
+    position = parse_fen(args.fen)
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(position, args.depth)
+        for move, count in sorted(counts.items()):
+            print(f"{move}: {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(position, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f"Nodes searched: {nodes}")
+    print(f"Time: {elapsed:.3f}s  ({nodes / elapsed if elapsed else 0:.0f} nps)")
+    return 0
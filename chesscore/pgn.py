@@ -0,0 +1,195 @@
+"""PGN reader: stream games from large PGN files and validate every move.
+
+    python -m chesscore pgn games.pgn
+    python -m chesscore pgn archive/*.pgn --max-games 100000
+
+Files are memory-mapped and scanned line by line, so a multi-gigabyte
+collection is never read into memory at once; read_games is a generator
+that replays one game at a time through the rules engine.
+"""
+
+import mmap
+import re
+import time
+
+from chesscore.notation import STARTING_FEN, parse_fen, parse_san
+from chesscore.position import Position
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+TAG_PATTERN = re.compile(rb'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+MOVE_NUMBER_PATTERN = re.compile(r"^\d+\.+")
+
+
+class Game:
+    """A replayed PGN game: tag pairs, encoded moves, result and the first error, if any."""
+
+    __slots__ = ("headers", "moves", "result", "error", "offset", "position")
+
+    def __init__(self, headers, offset):
+        self.headers = headers
+        self.moves = []
+        self.result = "*"
+        self.error = None
+        self.offset = offset  # Byte offset of the game in the file
+        self.position = None
+
+    @property
+    def valid(self):
+        """Checks if every move of the game was legal."""
+        return self.error is None
+
+    def __repr__(self):
+        return (f"Game({self.headers.get('White', '?')} - {self.headers.get('Black', '?')}, "
+                f"{len(self.moves)} moves, {self.result}{', error' if self.error else ''})")
+
+
+def _start_position(headers):
+    fen = headers.get("FEN")
+    if fen and fen != STARTING_FEN:
+        return parse_fen(fen)
+    return Position()
+
+
+def _play_tokens(game, text, state):
+    """Strips comments, variations and NAGs from a line of movetext and plays the moves on it.
+
+    state is [comment open, variation depth] carried between lines. Returns
+    True once the game termination marker has been read.
+    """
+    tokens = []
+    token = []
+    for char in text:
+        if state[0]:
+            if char == "}":
+                state[0] = False
+            continue
+        if char == "{":
+            state[0] = True
+        elif char == ";":
+            break  # Rest-of-line comment
+        elif char == "(":
+            state[1] += 1
+        elif char == ")":
+            state[1] = max(0, state[1] - 1)
+        elif state[1]:
+            continue
+        elif char.isspace():
+            if token:
+                tokens.append("".join(token))
+                token = []
+            continue
+        else:
+            token.append(char)
+            continue
+        if token:
+            tokens.append("".join(token))
+            token = []
+    if token:
+        tokens.append("".join(token))
+
+    for token in tokens:
+        if token in RESULTS:
+            game.result = token
+            return True
+        token = MOVE_NUMBER_PATTERN.sub("", token)
+        if not token or token[0] == "$":
+            continue
+        if game.error is not None:
+            continue  # Skip the rest of a game once a move is illegal
+        try:
+            move = parse_san(game.position, token)
+        except ValueError as error:
+            # Numbered from the position's own counter, which need not start at 1 with white to move
+            position = game.position
+            game.error = f"move {position.fullmove_number}{'...' if position.side else ''}: {error}"
+            continue
+        game.position.apply(move)
+        game.moves.append(move)
+    return False
+
+
+def read_games(path):
+    """Yields every game in a PGN file as a Game, replayed and validated move by move.
+
+    A game with an illegal or unreadable move is still yielded, with error
+    set and moves holding the moves played before it. game.position is the
+    final position (or the one before the bad move).
+    """
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty file
+        with data:
+            game = None
+            headers = {}
+            offset = 0
+            state = [False, 0]
+            while True:
+                line_offset = data.tell()
+                line = data.readline()
+                if not line:
+                    break
+                stripped = line.strip()
+                if not stripped or (stripped[:1] == b"%"):
+                    continue
+                if stripped[:1] == b"[" and not state[0] and not state[1]:
+                    if game is not None:
+                        yield game  # Movetext without a termination marker
+                        game = None
+                    if not headers:
+                        offset = line_offset
+                    match = TAG_PATTERN.match(stripped)
+                    if match:
+                        headers[match.group(1).decode()] = match.group(2).decode("utf-8", "replace")
+                    continue
+                if game is None:
+                    game = Game(headers, offset if headers else line_offset)
+                    headers = {}
+                    state = [False, 0]
+                    try:
+                        game.position = _start_position(game.headers)
+                    except ValueError as error:
+                        game.error = f"bad FEN tag: {error}"
+                        game.position = Position()
+                if _play_tokens(game, stripped.decode("utf-8", "replace"), state):
+                    yield game
+                    game = None
+                    state = [False, 0]
+            if game is not None:
+                yield game
+
+
+def validate_files(paths, max_games=None, report=print):
+    """Replays every game in paths and returns (games, moves, invalid games, seconds).
+
+    report is called with a line for every invalid game.
+    """
+    games = moves = invalid = 0
+    start = time.perf_counter()
+    for path in paths:
+        for game in read_games(path):
+            games += 1
+            moves += len(game.moves)
+            if game.error is not None:
+                invalid += 1
+                report(f"{path}@{game.offset}: {game!r}: {game.error}")
+            if max_games is not None and games >= max_games:
+                return games, moves, invalid, time.perf_counter() - start
+    return games, moves, invalid, time.perf_counter() - start
+
+
+def add_arguments(parser):
+    parser.add_argument("paths", nargs="+", help="PGN files to replay")
+    parser.add_argument("--max-games", type=int, default=None, help="stop after this many games")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    games, moves, invalid, elapsed = validate_files(args.paths, args.max_games)
+    rate = games / elapsed if elapsed > 0 else 0.0
+    move_rate = moves / elapsed if elapsed > 0 else 0.0
+    print(f"{games} games, {moves} moves, {invalid} invalid in {elapsed:.3f}s "
+          f"({rate:.1f} games/s, {move_rate:.0f} moves/s)")
+    return 1 if invalid else 0
@@ -0,0 +1,324 @@
+"""Position object: the full game state plus a move API with no globals."""
+
+from chesscore import movegen
+from chesscore.attacks import is_attacked
+from chesscore.gamestate import GameState
+from chesscore.evaluation import EG_TABLE, MG_TABLE, PHASE_TABLE, compute_scores
+from chesscore.zobrist import CASTLING_KEYS, EP_KEYS, PIECE_KEYS, SIDE_KEY, compute_key
+from chesscore.board import (
+    BLACK, EMPTY, KING, NO_SQUARE, PAWN, PIECE_NAMES, QUEEN, SQUARES, TYPE_LETTERS, WHITE,
+    BLACK_KING_SIDE, BLACK_QUEEN_SIDE, WHITE_KING_SIDE, WHITE_QUEEN_SIDE, ALL_CASTLING,
+    PROMOTION_PIECES, board_from_rows, castling_from_dict, castling_to_dict, color_name, initial_board, move_to_tuple,
+    rows_from_board, side_of,
+)
+
+# Castling rights that survive a move touching each square
+CASTLING_MASK = [ALL_CASTLING] * 128
+CASTLING_MASK[0] = ALL_CASTLING & ~BLACK_QUEEN_SIDE
+CASTLING_MASK[4] = ALL_CASTLING & ~(BLACK_KING_SIDE | BLACK_QUEEN_SIDE)
+CASTLING_MASK[7] = ALL_CASTLING & ~BLACK_KING_SIDE
+CASTLING_MASK[112] = ALL_CASTLING & ~WHITE_QUEEN_SIDE
+CASTLING_MASK[116] = ALL_CASTLING & ~(WHITE_KING_SIDE | WHITE_QUEEN_SIDE)
+CASTLING_MASK[119] = ALL_CASTLING & ~WHITE_KING_SIDE
+
+
+class Position:
+    """A chess position: board, side to move, en passant target, castling rights and move clocks.
+
+    The board is a 0x88 bytearray (see chesscore.board) with a list of
+    squares per piece code and both king squares kept up to date as moves
+    are played. Moves are made in place and undone with unmake_move, using
+    an undo record pushed onto history for every move. key is the Zobrist
+    hash of the position, and mg_score, eg_score and phase are the running
+    evaluation totals (see chesscore.evaluation); all are updated
+    incrementally by every move. halfmove_clock counts plies since the last
+    capture or pawn move and fullmove_number starts at 1 and goes up after
+    every black move, as in FEN. game_state() caches the legal moves, check
+    flag and end-of-game status until the next move is made or taken back.
+
+    The public move API uses (start_row, start_col, end_row, end_col)
+    tuples, the same layout returned by rules.get_all_valid_moves;
+    generate_legal returns the compact encoded moves used internally.
+    """
+
+    __slots__ = ("board", "side", "castling", "ep_square", "piece_lists", "king_squares", "history", "key",
+                 "mg_score", "eg_score", "phase", "halfmove_clock", "fullmove_number",
+                 "_game_state")
+
+    def __init__(self, board=None, turn="white", en_passant_target=None, castling_rights=None, halfmove_clock=0,
+                 fullmove_number=1):
+        rows = board if board is not None else initial_board()
+        self.board = board_from_rows(rows)
+        self.side = side_of(turn)
+        self.castling = castling_from_dict(castling_rights) if castling_rights is not None else ALL_CASTLING
+        self.ep_square = NO_SQUARE if en_passant_target is None else en_passant_target[0] * 16 + en_passant_target[1]
+        self.piece_lists = [[] for _ in range(15)]
+        self.king_squares = [NO_SQUARE, NO_SQUARE]
+        self.history = []
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self._game_state = None
+        for sq in SQUARES:
+            piece = self.board[sq]
+            if piece:
+                self.piece_lists[piece].append(sq)
+                if piece & 7 == KING:
+                    self.king_squares[piece >> 3] = sq
+        self.key = compute_key(self)
+        self.mg_score, self.eg_score, self.phase = compute_scores(self)
+
+    # --- Conversions to the list-of-strings layout ---
+
+    @property
+    def turn(self):
+        """The side to move, "white" or "black"."""
+        return color_name(self.side)
+
+    @property
+    def en_passant_target(self):
+        """The (row, col) of the en passant target square, or None."""
+        if self.ep_square == NO_SQUARE:
+            return None
+        return self.ep_square >> 4, self.ep_square & 7
+
+    @property
+    def castling_rights(self):
+        """Castling rights as a {"white": {"king_side": ..., "queen_side": ...}, ...} dict."""
+        return castling_to_dict(self.castling)
+
+    def rows(self):
+        """Returns the board as a list of 8 rows of strings such as "wp" or "--"."""
+        return rows_from_board(self.board)
+
+    def piece_at(self, row, col):
+        """Returns the piece code on a square, "--" if empty."""
+        return PIECE_NAMES.get(self.board[row * 16 + col], "--")
+
+    def copy(self):
+        """Returns an independent copy of the position."""
+        other = Position.__new__(Position)
+        other.board = self.board[:]
+        other.side = self.side
+        other.castling = self.castling
+        other.ep_square = self.ep_square
+        other.piece_lists = [squares[:] for squares in self.piece_lists]
+        other.king_squares = self.king_squares[:]
+        other.history = self.history[:]
+        other.key = self.key
+        other.mg_score = self.mg_score
+        other.eg_score = self.eg_score
+        other.phase = self.phase
+        other.halfmove_clock = self.halfmove_clock
+        other.fullmove_number = self.fullmove_number
+        other._game_state = self._game_state  # Immutable, so it can be shared
+        return other
+
+    # --- Move generation ---
+
+    def is_check(self):
+        """Checks if the side to move is in check."""
+        return is_attacked(self.board, self.king_squares[self.side >> 3], self.side ^ BLACK)
+
+    def generate_legal(self):
+        """Returns all legal moves for the side to move as encoded ints, one per promotion piece."""
+        return movegen.generate_legal_moves(self)
+
+    def game_state(self):
+        """Returns the GameState of the position, computing it only once per position."""
+        if self._game_state is None:
+            self._game_state = GameState(self)
+        return self._game_state
+
+    def legal_moves(self):
+        """Returns all legal moves for the side to move. A promotion is listed once; pick the piece in make_move."""
+        return [move_to_tuple(move) for move in self.game_state().moves if move >> 16 in (EMPTY, QUEEN)]
+
+    def valid_moves_from(self, row, col):
+        """Returns the legal destination squares for the piece on (row, col)."""
+        return list(self.game_state().moves_from(row, col))
+
+    def is_legal(self, move):
+        """Checks if a move is legal for the side to move."""
+        start_row, start_col, end_row, end_col = move
+        return (end_row, end_col) in self.game_state().moves_from(start_row, start_col)
+
+    def is_promotion(self, move):
+        """Checks if a move promotes a pawn."""
+        start_row, start_col, end_row, end_col = move
+        return self.board[start_row * 16 + start_col] & 7 == PAWN and end_row in (0, 7)
+
+    def is_checkmate(self):
+        """Checks if the side to move is checkmated."""
+        return self.game_state().is_checkmate
+
+    def is_stalemate(self):
+        """Checks if the side to move is stalemated."""
+        return self.game_state().is_stalemate
+
+    # --- Playing moves ---
+
+    def encode(self, move, promotion="q"):
+        """Returns the encoded form of a (start_row, start_col, end_row, end_col) move."""
+        if promotion not in PROMOTION_PIECES:
+            raise ValueError(f"Invalid promotion piece: {promotion!r}")
+        start_row, start_col, end_row, end_col = move
+        from_sq = start_row * 16 + start_col
+        to_sq = end_row * 16 + end_col
+        if self.is_promotion(move):
+            return from_sq | (to_sq << 8) | (TYPE_LETTERS.index(promotion) << 16)
+        return from_sq | (to_sq << 8)
+
+    def make_move(self, move, promotion="q"):
+        """Plays a legal move and passes the turn. promotion is the piece a pawn becomes ("q", "r", "b" or "n")."""
+        self.apply(self.encode(move, promotion))
+
+    def apply(self, move):
+        """Plays an encoded move, updating piece lists, king squares, castling rights and en passant.
+
+        An undo record (move, captured piece, previous en passant square,
+        previous castling rights, previous key, evaluation totals and
+        halfmove clock) is pushed onto history.
+        """
+        board = self.board
+        piece_lists = self.piece_lists
+        side = self.side
+        from_sq = move & 0xFF
+        to_sq = (move >> 8) & 0xFF
+        promotion = move >> 16
+        piece = board[from_sq]
+        captured = board[to_sq]
+        kind = piece & 7
+
+        ep_square = self.ep_square
+        castling = self.castling
+        key = self.key
+        mg = self.mg_score
+        eg = self.eg_score
+        self.history.append((move, captured, ep_square, castling, key, mg, eg, self.phase, self.halfmove_clock))
+        self._game_state = None
+        self.halfmove_clock = 0 if captured or kind == PAWN else self.halfmove_clock + 1
+        if side:
+            self.fullmove_number += 1
+        key ^= SIDE_KEY ^ PIECE_KEYS[piece][from_sq]
+        mg -= MG_TABLE[piece][from_sq]
+        eg -= EG_TABLE[piece][from_sq]
+        if captured:
+            piece_lists[captured].remove(to_sq)
+            key ^= PIECE_KEYS[captured][to_sq]
+            mg -= MG_TABLE[captured][to_sq]
+            eg -= EG_TABLE[captured][to_sq]
+            self.phase -= PHASE_TABLE[captured]
+        if ep_square != NO_SQUARE:
+            key ^= EP_KEYS[ep_square & 7]
+            self.ep_square = NO_SQUARE
+        if kind == PAWN:
+            if to_sq == ep_square:
+                captured_sq = to_sq + (16 if side == WHITE else -16)
+                captured_pawn = board[captured_sq]
+                piece_lists[captured_pawn].remove(captured_sq)
+                board[captured_sq] = EMPTY
+                key ^= PIECE_KEYS[captured_pawn][captured_sq]
+                mg -= MG_TABLE[captured_pawn][captured_sq]
+                eg -= EG_TABLE[captured_pawn][captured_sq]
+            elif to_sq - from_sq in (32, -32):
+                self.ep_square = (from_sq + to_sq) >> 1
+                key ^= EP_KEYS[from_sq & 7]
+        elif kind == KING:
+            self.king_squares[side >> 3] = to_sq
+            if to_sq - from_sq == 2 or from_sq - to_sq == 2:
+                rook_from, rook_to = (from_sq + 3, from_sq + 1) if to_sq > from_sq else (from_sq - 4, from_sq - 1)
+                rook = board[rook_from]
+                board[rook_from] = EMPTY
+                board[rook_to] = rook
+                rook_squares = piece_lists[rook]
+                rook_squares[rook_squares.index(rook_from)] = rook_to
+                key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+                mg += MG_TABLE[rook][rook_to] - MG_TABLE[rook][rook_from]
+                eg += EG_TABLE[rook][rook_to] - EG_TABLE[rook][rook_from]
+
+        board[from_sq] = EMPTY
+        if promotion:
+            piece_lists[piece].remove(from_sq)
+            piece = side | promotion
+            piece_lists[piece].append(to_sq)
+            self.phase += PHASE_TABLE[piece]
+        else:
+            squares = piece_lists[piece]
+            squares[squares.index(from_sq)] = to_sq
+        board[to_sq] = piece
+        key ^= PIECE_KEYS[piece][to_sq]
+        self.mg_score = mg + MG_TABLE[piece][to_sq]
+        self.eg_score = eg + EG_TABLE[piece][to_sq]
+
+        new_castling = castling & CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        if new_castling != castling:
+            key ^= CASTLING_KEYS[castling] ^ CASTLING_KEYS[new_castling]
+            self.castling = new_castling
+        self.key = key
+        self.side = side ^ BLACK
+
+    def unmake_move(self):
+        """Takes back the last move played with make_move or apply."""
+        move, captured, ep_square, castling, key, mg_score, eg_score, phase, halfmove_clock = self.history.pop()
+        self._game_state = None
+        board = self.board
+        piece_lists = self.piece_lists
+        side = self.side ^ BLACK
+        from_sq = move & 0xFF
+        to_sq = (move >> 8) & 0xFF
+        piece = board[to_sq]
+
+        if move >> 16:
+            piece_lists[piece].remove(to_sq)
+            piece = side | PAWN
+            piece_lists[piece].append(from_sq)
+        else:
+            squares = piece_lists[piece]
+            squares[squares.index(to_sq)] = from_sq
+        board[from_sq] = piece
+        board[to_sq] = captured
+        if captured:
+            piece_lists[captured].append(to_sq)
+
+        kind = piece & 7
+        if kind == PAWN:
+            if to_sq == ep_square:
+                captured_sq = to_sq + (16 if side == WHITE else -16)
+                board[captured_sq] = PAWN | (side ^ BLACK)
+                piece_lists[PAWN | (side ^ BLACK)].append(captured_sq)
+        elif kind == KING:
+            self.king_squares[side >> 3] = from_sq
+            if to_sq - from_sq == 2 or from_sq - to_sq == 2:
+                rook_from, rook_to = (from_sq + 3, from_sq + 1) if to_sq > from_sq else (from_sq - 4, from_sq - 1)
+                rook = board[rook_to]
+                board[rook_to] = EMPTY
+                board[rook_from] = rook
+                rook_squares = piece_lists[rook]
+                rook_squares[rook_squares.index(rook_to)] = rook_from
+
+        self.ep_square = ep_square
+        self.castling = castling
+        self.key = key
+        self.mg_score = mg_score
+        self.eg_score = eg_score
+        self.phase = phase
+        self.halfmove_clock = halfmove_clock
+        if side:
+            self.fullmove_number -= 1
+        self.side = side
+
+    def repetition_count(self):
+        """Returns how many times the current position has occurred, counting the current one."""
+        key = self.key
+        history = self.history
+        count = 1
+        # Same side to move only: every second earlier position, back to the last capture or pawn move
+        oldest = max(len(history) - self.halfmove_clock, 0)
+        for index in range(len(history) - 2, oldest - 1, -2):
+            if history[index][4] == key:
+                count += 1
+        return count
+
+    def is_threefold_repetition(self):
+        """Checks if the current position has occurred at least three times."""
+        return self.repetition_count() >= 3
@@ -0,0 +1,294 @@
+"""Chess rules on the list-of-strings board layout.
+
+A board is a list of 8 rows of two-character strings such as "wp" or "--",
+with row 0 being black's back rank. Every function here is pure Python and
+never touches pygame or module-level game state. Move generation and
+checkmate/stalemate detection convert the board to the compact Position
+backend (chesscore.position) and run there.
+"""
+
+from chesscore.board import PROMOTION_PIECES, castling_to_dict, initial_board, initial_castling_rights
+from chesscore.position import Position
+
+
+def opponent(turn):
+    """Returns the other side."""
+    return "black" if turn == "white" else "white"
+
+def is_valid_move(board, start_row, start_col, end_row, end_col, turn, en_passant_target = None):
+    """Checks if a move is valid."""
+    piece = board[start_row][start_col]
+
+    # Basic checks
+    if piece == "--":
+        return False  # No piece at the starting position
+    if (turn == "white" and piece[0] == "b") or (turn == "black" and piece[0] == "w"):
+        return False  # Wrong color to move.
+
+    if start_row == end_row and start_col == end_col:
+        return False  # Cannot move to the same square
+
+    if not (0 <= start_row < 8 and 0 <= start_col < 8 and 0 <= end_row < 8 and 0 <= end_col < 8):
+        return False  # Move is out of bounds
+
+    destination_piece = board[end_row][end_col]
+    if destination_piece != "--" and (piece[0] == destination_piece[0]):
+        return False  # Cannot capture your own piece
+
+    # Specific piece movement logic
+    if piece[1] == "p":
+        return is_valid_pawn_move(board, start_row, start_col, end_row, end_col, turn) or is_valid_en_passant(board, start_row, start_col, end_row, end_col, turn, en_passant_target)
+    elif piece[1] == "r":
+        return is_valid_rook_move(board, start_row, start_col, end_row, end_col)
+    elif piece[1] == "n":
+        return is_valid_knight_move(board, start_row, start_col, end_row, end_col)
+    elif piece[1] == "b":
+        return is_valid_bishop_move(board, start_row, start_col, end_row, end_col)
+    elif piece[1] == "q":
+        return is_valid_queen_move(board, start_row, start_col, end_row, end_col)
+    elif piece[1] == "k":
+        return is_valid_king_move(board, start_row, start_col, end_row, end_col)
+    else:
+        return False
+
+def is_valid_pawn_move(board, start_row, start_col, end_row, end_col, turn):
+    """Checks if a pawn move is valid."""
+    piece = board[start_row][start_col]
+    direction = -1 if piece[0] == "w" else 1  # White moves up (-1), black moves down (+1)
+
+    # One square forward
+    if start_col == end_col and end_row == start_row + direction and board[end_row][end_col] == "--":
+        return True
+
+    # Two squares forward (only on the initial move)
+    if start_col == end_col and end_row == start_row + 2 * direction and board[end_row][end_col] == "--" and board[start_row + direction][end_col] == "--":
+        if (piece[0] == "w" and start_row == 6) or (piece[0] == "b" and start_row == 1):
+            return True
+
+    # Capture diagonally
+    if abs(end_col - start_col) == 1 and end_row == start_row + direction:
+        if (piece[0] == "w" and board[end_row][end_col][0] == "b") or (piece[0] == "b" and board[end_row][end_col][0] == "w"):
+            return True
+
+    return False
+
+def is_path_clear(board, start_row, start_col, end_row, end_col):
+    """Checks if the path between two squares is clear (except for knight moves)."""
+    row_step = 0 if start_row == end_row else 1 if start_row < end_row else -1
+    col_step = 0 if start_col == end_col else 1 if start_col < end_col else -1
+
+    current_row = start_row + row_step
+    current_col = start_col + col_step
+
+    while current_row != end_row or current_col != end_col:
+        if board[current_row][current_col] != "--":
+            return False
+        current_row += row_step
+        current_col += col_step
+
+    return True
+
+def is_valid_rook_move(board, start_row, start_col, end_row, end_col):
+    """Checks if a rook move is valid."""
+    if start_row == end_row or start_col == end_col:  # Must move in a straight line
+        return is_path_clear(board, start_row, start_col, end_row, end_col)
+    return False
+
+def is_valid_knight_move(board, start_row, start_col, end_row, end_col):
+    """Checks if a knight move is valid."""
+    row_diff = abs(start_row - end_row)
+    col_diff = abs(start_col - end_col)
+    return (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2)
+
+def is_valid_bishop_move(board, start_row, start_col, end_row, end_col):
+    """Checks if a bishop move is valid."""
+    if abs(start_row - end_row) == abs(start_col - end_col):  # Must move diagonally
+        return is_path_clear(board, start_row, start_col, end_row, end_col)
+    return False
+
+def is_valid_queen_move(board, start_row, start_col, end_row, end_col):
+    """Checks if a queen move is valid."""
+    return is_valid_rook_move(board, start_row, start_col, end_row, end_col) or is_valid_bishop_move(board, start_row, start_col, end_row, end_col)
+
+def is_valid_king_move(board, start_row, start_col, end_row, end_col):
+    """Checks if a king move is valid."""
+    row_diff = abs(start_row - end_row)
+    col_diff = abs(start_col - end_col)
+    return row_diff <= 1 and col_diff <= 1
+
+# Direction and offset tables as (row_step, col_step) pairs
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_OFFSETS = QUEEN_DIRECTIONS
+
+def is_square_attacked(board, row, col, by_color):
+    """Checks if a square is attacked by any piece of the given color ("w" or "b")."""
+    # Pawns attack diagonally forward, so look one row back from their point of view
+    pawn_row = row + 1 if by_color == "w" else row - 1
+    if 0 <= pawn_row < 8:
+        for pawn_col in (col - 1, col + 1):
+            if 0 <= pawn_col < 8 and board[pawn_row][pawn_col] == by_color + "p":
+                return True
+
+    for row_step, col_step in KNIGHT_OFFSETS:
+        r, c = row + row_step, col + col_step
+        if 0 <= r < 8 and 0 <= c < 8 and board[r][c] == by_color + "n":
+            return True
+
+    for row_step, col_step in KING_OFFSETS:
+        r, c = row + row_step, col + col_step
+        if 0 <= r < 8 and 0 <= c < 8 and board[r][c] == by_color + "k":
+            return True
+
+    # Sliding pieces: walk each ray until the first piece
+    for directions, sliders in ((ROOK_DIRECTIONS, "rq"), (BISHOP_DIRECTIONS, "bq")):
+        for row_step, col_step in directions:
+            r, c = row + row_step, col + col_step
+            while 0 <= r < 8 and 0 <= c < 8:
+                piece = board[r][c]
+                if piece != "--":
+                    if piece[0] == by_color and piece[1] in sliders:
+                        return True
+                    break
+                r += row_step
+                c += col_step
+    return False
+
+def _position(board, turn, en_passant_target, castling_rights):
+    """Builds a compact Position from the list-of-strings layout. Missing castling rights mean no castling."""
+    return Position(board, turn, en_passant_target, castling_rights if castling_rights else castling_to_dict(0))
+
+def get_valid_moves(board, selected_piece_pos, turn, en_passant_target, castling_rights):
+    """Returns a list of valid moves for the selected piece, including en passant and castling."""
+    if not selected_piece_pos or board[selected_piece_pos[0]][selected_piece_pos[1]][0] != turn[0]:
+        return []
+    return _position(board, turn, en_passant_target, castling_rights).valid_moves_from(*selected_piece_pos)
+
+def is_check(board, turn):
+    """Checks if the given side's king is in check."""
+    # Find the king's position
+    king = "wk" if turn == "white" else "bk"
+    for row in range(8):
+        if king in board[row]:
+            king_row, king_col = row, board[row].index(king)
+            break
+    else:
+        return False
+
+    # Check for attacks from the opponent's pieces
+    return is_square_attacked(board, king_row, king_col, "b" if turn == "white" else "w")
+
+def get_all_valid_moves(board, turn, en_passant_target, castling_rights):
+    """Returns a list of all valid moves for a given side. Raises ValueError if that side has no king."""
+    return _position(board, turn, en_passant_target, castling_rights).legal_moves()
+
+def is_checkmate(board, turn, en_passant_target=None, castling_rights=None):
+    """Checks if the given side is in checkmate."""
+    return _position(board, turn, en_passant_target, castling_rights).is_checkmate()
+
+def is_stalemate(board, turn, en_passant_target=None, castling_rights=None):
+    """Checks if the given side is in stalemate."""
+    return _position(board, turn, en_passant_target, castling_rights).is_stalemate()
+
+def is_valid_castling(board, king_row, king_col, rook_col, turn, castling_rights):
+    """Checks if castling is a valid move."""
+    # Check if king and rook have moved
+    side = 'king_side' if rook_col > king_col else 'queen_side'
+    if not castling_rights[turn][side]:
+        return False
+    color = turn[0]
+    if board[king_row][king_col] != color + "k" or board[king_row][rook_col] != color + "r":
+        return False
+
+    # Check if path is clear
+    for col in range(min(king_col, rook_col) + 1, max(king_col, rook_col)):
+        if board[king_row][col] != "--":
+            return False
+
+    # Check if king is in check or would pass through check
+    step = 1 if rook_col > king_col else -1
+    attacker = opponent(turn)[0]
+    for col in (king_col, king_col + step, king_col + 2 * step):
+        if is_square_attacked(board, king_row, col, attacker):
+            return False
+    return True
+
+def is_valid_en_passant(board, start_row, start_col, end_row, end_col, turn, en_passant_target):
+    """Checks if an en passant capture is valid."""
+    piece = board[start_row][start_col]
+    if piece[1] != "p":
+        return False
+    direction = -1 if piece[0] == "w" else 1
+
+    # Check if it's a pawn's diagonal move
+    if abs(end_col - start_col) == 1 and end_row == start_row + direction:
+        # Check if the target square is the en passant target square
+        if (end_row, end_col) == en_passant_target:
+            return True
+
+    return False
+
+def is_promotion(board, start_row, start_col, end_row, end_col):
+    """Checks if a move is a pawn reaching the last rank."""
+    return board[start_row][start_col][1] == "p" and end_row in (0, 7)
+
+def make_move(board, start_row, start_col, end_row, end_col, en_passant_target=None, castling_rights=None, promotion="q"):
+    """Makes a move on the board. Handles en passant, castling, and pawn promotion.
+
+    Returns the en passant target square created by the move, or None.
+    """
+    piece = board[start_row][start_col]
+    color = piece[0]
+    turn = "white" if color == "w" else "black"
+    captured = board[end_row][end_col]
+
+    # Handle en passant capture
+    if is_valid_en_passant(board, start_row, start_col, end_row, end_col, turn, en_passant_target) and captured == "--":
+        board[end_row][end_col] = piece
+        board[start_row][start_col] = "--"
+        board[start_row][end_col] = "--"  # Remove the captured pawn
+
+    # Handle castling
+    elif piece[1] == "k" and abs(end_col - start_col) == 2:
+        board[end_row][end_col] = piece
+        board[start_row][start_col] = "--"
+        if end_col > start_col:  # King-side
+            rook_start_col = 7
+            rook_end_col = 5
+        else:  # Queen-side
+            rook_start_col = 0
+            rook_end_col = 3
+        board[end_row][rook_end_col] = board[end_row][rook_start_col]
+        board[end_row][rook_start_col] = "--"
+
+    else:  # Regular move
+        board[end_row][end_col] = piece
+        board[start_row][start_col] = "--"
+
+    # Handle pawn promotion
+    if piece[1] == "p" and (end_row == 0 or end_row == 7):
+        board[end_row][end_col] = color + (promotion or "q")
+
+    # Update castling rights if king or rook moves, or a rook is captured on its home square
+    if castling_rights:
+        home_row = 7 if color == "w" else 0
+        if piece[1] == "k":
+            castling_rights[turn]['king_side'] = False
+            castling_rights[turn]['queen_side'] = False
+        elif piece[1] == "r" and start_row == home_row:
+            if start_col == 0:
+                castling_rights[turn]['queen_side'] = False
+            elif start_col == 7:
+                castling_rights[turn]['king_side'] = False
+        if captured[1] == "r" and end_row == 7 - home_row:
+            if end_col == 0:
+                castling_rights[opponent(turn)]['queen_side'] = False
+            elif end_col == 7:
+                castling_rights[opponent(turn)]['king_side'] = False
+
+    # A double pawn push creates a new en passant target
+    if piece[1] == "p" and abs(start_row - end_row) == 2:
+        return ((start_row + end_row) // 2, start_col)
+    return None
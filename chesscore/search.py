@@ -0,0 +1,346 @@
+"""Alpha-beta search: picks a move for the side to move.
+
+Negamax alpha-beta with iterative deepening, a transposition table,
+quiescence search on captures and promotions, and MVV-LVA, killer and
+history move ordering. A search runs until it reaches max_depth or its
+time or node budget runs out, and always returns the best move of the last
+completed iteration. An opening book and endgame tablebases, if given, are
+probed first; a hit returns at once with depth 0.
+"""
+
+import time
+
+from chesscore.board import PAWN
+from chesscore.evaluation import evaluate
+from chesscore.notation import STARTING_FEN, move_to_uci, parse_fen
+from chesscore.tt import EXACT, LOWER, UPPER, TranspositionTable
+
+INFINITY = 1_000_000
+MATE = 100_000
+MATE_BOUND = MATE - 1000  # Scores beyond this are mates, stored relative to the node in the table
+
+# Material values by piece type, used for MVV-LVA ordering
+PIECE_VALUES = (0, 100, 320, 330, 500, 900, 0)
+
+CHECK_INTERVAL = 1024  # Nodes between time and stop checks
+MAX_PLY = 128
+
+
+class SearchStopped(Exception):
+    """Raised inside the search when the budget runs out or stop() is called."""
+
+
+class SearchResult:
+    """Outcome of a search: best encoded move, score in centipawns for the side to move, depth and nodes."""
+
+    __slots__ = ("best_move", "score", "depth", "nodes", "seconds", "pv")
+
+    def __init__(self, best_move=None, score=0, depth=0, nodes=0, seconds=0.0, pv=()):
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+        self.pv = pv
+
+    @property
+    def nps(self):
+        """Nodes searched per second."""
+        return int(self.nodes / self.seconds) if self.seconds > 0 else 0
+
+    def __repr__(self):
+        return (f"SearchResult(best_move={self.best_move}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, seconds={self.seconds:.3f})")
+
+
+def _is_tactical(board, move, ep_square):
+    """Checks if a move captures or promotes."""
+    to_sq = (move >> 8) & 0xFF
+    return bool(board[to_sq]) or move >> 16 or (to_sq == ep_square and board[move & 0xFF] & 7 == PAWN)
+
+
+def _to_table(score, ply):
+    """Makes mate scores relative to the node before storing them."""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """Makes stored mate scores relative to the root again."""
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Searcher:
+    """Alpha-beta searcher. Keeps its transposition table and history between searches.
+
+    book is an OpeningBook and tablebases a Tablebases instance; both are optional.
+    """
+
+    def __init__(self, table=None, evaluate=evaluate, book=None, tablebases=None):
+        self.table = table if table is not None else TranspositionTable(32)
+        self.evaluate = evaluate
+        self.book = book
+        self.tablebases = tablebases
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = {}
+        self.nodes = 0
+        self.stopped = False
+        self._deadline = None
+        self._node_limit = None
+
+    def stop(self):
+        """Asks a running search to stop as soon as possible. Safe to call from another thread."""
+        self.stopped = True
+
+    def set_time_limit(self, seconds):
+        """Gives a running search a new time budget counted from now, or none. Safe to call from another thread."""
+        self._deadline = time.perf_counter() + seconds if seconds is not None else None
+
+    def search(self, position, max_depth=64, time_limit=None, node_limit=None, info=None):
+        """Searches position and returns a SearchResult.
+
+        time_limit is in seconds and node_limit counts nodes; the search
+        stops at whichever of them or max_depth comes first. info, if given,
+        is called with the SearchResult of every completed iteration.
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.stopped = False
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._node_limit = node_limit
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        # Age the history table so old searches weigh less
+        self.history = {move: value >> 2 for move, value in self.history.items() if value >> 2}
+
+        root_moves = position.generate_legal()
+        result = SearchResult(root_moves[0] if root_moves else None)
+        if not root_moves:
+            result.score = -MATE if position.is_check() else 0
+            return result
+        if self._probe_root(position, result):
+            result.seconds = time.perf_counter() - start
+            return result
+
+        base_ply = len(position.history)
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(position, depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                # Take back the moves the interrupted iteration left on the board
+                while len(position.history) > base_ply:
+                    position.unmake_move()
+                break
+            entry = self.table.probe(position.key)
+            if entry is not None and entry[1][2]:
+                result.best_move = entry[1][2]
+            result.score = score
+            result.depth = depth
+            result.nodes = self.nodes
+            result.seconds = time.perf_counter() - start
+            result.pv = tuple(self._principal_variation(position, depth))
+            if info is not None:
+                info(result)
+            if abs(score) > MATE_BOUND or len(root_moves) == 1:
+                break  # A forced mate or a single reply will not change with more depth
+        result.nodes = self.nodes
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _probe_root(self, position, result):
+        """Fills result from the book or tablebases and returns True if either knows the position."""
+        if self.book is not None:
+            move = self.book.choose(position)
+            if move is not None:
+                result.best_move = move
+                result.pv = (move,)
+                return True
+        if self.tablebases is not None:
+            found = self.tablebases.best_move(position)
+            if found is not None:
+                result.best_move, result.score = found
+                result.pv = (result.best_move,)
+                return True
+        return False
+
+    def _check_budget(self):
+        if self.stopped:
+            raise SearchStopped
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            self.stopped = True
+            raise SearchStopped
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            self.stopped = True
+            raise SearchStopped
+
+    def _order_moves(self, position, moves, tt_move, ply):
+        """Sorts moves best-first: table move, captures by MVV-LVA, killers, then history."""
+        board = position.board
+        ep_square = position.ep_square
+        killers = self.killers[ply] if ply < MAX_PLY else (0, 0)
+        history = self.history
+
+        def score(move):
+            if move == tt_move:
+                return 10_000_000
+            to_sq = (move >> 8) & 0xFF
+            victim = board[to_sq]
+            if victim or move >> 16 or (to_sq == ep_square and board[move & 0xFF] & 7 == PAWN):
+                value = PIECE_VALUES[victim & 7] if victim else PIECE_VALUES[PAWN]
+                return 1_000_000 + value * 10 - PIECE_VALUES[board[move & 0xFF] & 7] + PIECE_VALUES[move >> 16]
+            if move == killers[0]:
+                return 900_000
+            if move == killers[1]:
+                return 800_000
+            return history.get(move, 0)
+
+        moves.sort(key=score, reverse=True)
+        return moves
+
+    def _negamax(self, position, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_budget()
+
+        if ply and position.repetition_count() > 1:
+            return 0  # Treat any repetition inside the search as a draw
+        if depth <= 0:
+            return self._quiescence(position, alpha, beta, ply)
+
+        original_alpha = alpha
+        tt_move = 0
+        entry = self.table.probe(position.key)
+        if entry is not None:
+            entry_depth, (entry_score, flag, tt_move) = entry
+            if ply and entry_depth >= depth:
+                entry_score = _from_table(entry_score, ply)
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER and entry_score >= beta:
+                    return entry_score
+                if flag == UPPER and entry_score <= alpha:
+                    return entry_score
+
+        moves = position.generate_legal()
+        if not moves:
+            return -MATE + ply if position.is_check() else 0
+
+        board = position.board
+        ep_square = position.ep_square
+        best_score = -INFINITY
+        best_move = 0
+        for move in self._order_moves(position, moves, tt_move, ply):
+            tactical = _is_tactical(board, move, ep_square)
+            position.apply(move)
+            score = -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not tactical:
+                            # Remember quiet moves that cause cutoffs
+                            if ply < MAX_PLY and self.killers[ply][0] != move:
+                                self.killers[ply][1] = self.killers[ply][0]
+                                self.killers[ply][0] = move
+                            self.history[move] = self.history.get(move, 0) + depth * depth
+                        break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(position.key, depth, (_to_table(best_score, ply), flag, best_move))
+        return best_score
+
+    def _quiescence(self, position, alpha, beta, ply):
+        """Searches captures and promotions only, until the position is quiet."""
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_budget()
+
+        in_check = position.is_check()
+        moves = position.generate_legal()
+        if not moves:
+            return -MATE + ply if in_check else 0
+        if ply >= MAX_PLY - 1:
+            return self.evaluate(position)
+
+        board = position.board
+        ep_square = position.ep_square
+        if not in_check:
+            stand_pat = self.evaluate(position)
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            moves = [move for move in moves if _is_tactical(board, move, ep_square)]
+
+        best_score = alpha if not in_check else -INFINITY
+        for move in self._order_moves(position, moves, 0, ply):
+            position.apply(move)
+            score = -self._quiescence(position, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _principal_variation(self, position, depth):
+        """Follows table moves from position to recover the expected line."""
+        line = []
+        seen = set()
+        for _ in range(depth):
+            entry = self.table.probe(position.key)
+            if entry is None or not entry[1][2] or position.key in seen:
+                break
+            move = entry[1][2]
+            if move not in position.generate_legal():
+                break
+            seen.add(position.key)
+            line.append(move)
+            position.apply(move)
+        for _ in line:
+            position.unmake_move()
+        return line
+
+
+def search(position, max_depth=64, time_limit=None, node_limit=None, table=None):
+    """Searches position with a fresh Searcher and returns a SearchResult."""
+    return Searcher(table).search(position, max_depth, time_limit, node_limit)
+
+
+def add_arguments(parser):
+    parser.add_argument("--fen", default=STARTING_FEN, help="position to search (default: start position)")
+    parser.add_argument("--depth", type=int, default=None, help="maximum depth (default: 5 without a budget)")
+    parser.add_argument("--movetime", type=float, default=None, help="time budget in seconds")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget")
+    parser.add_argument("--hash", type=int, default=32, help="transposition table size in MB")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    max_depth = args.depth or (64 if args.movetime or args.nodes else 5)
+
+    def report(result):
+        print(f"depth {result.depth}  score {result.score}  nodes {result.nodes}  nps {result.nps}  "
+              f"time {result.seconds:.3f}s  pv {' '.join(move_to_uci(move) for move in result.pv)}")
+
+    searcher = Searcher(TranspositionTable(args.hash))
+    result = searcher.search(parse_fen(args.fen), max_depth, args.movetime, args.nodes, info=report)
+    print(f"bestmove {move_to_uci(result.best_move) if result.best_move else '(none)'}")
+    print(f"nodes {result.nodes}  time {result.seconds:.3f}s  nps {result.nps}  hashfull {searcher.table.hashfull()}")
+    return 0
@@ -0,0 +1,314 @@
+"""Multi-game server: many independent games in one asyncio process, played over a JSON protocol.
+
+    python -m chesscore server --port 8765
+    python -m chesscore server --port 8765 --idle-timeout 600 --max-memory-mb 256
+
+Clients connect over TCP and exchange one JSON object per line. Requests
+carry an "op" and, except for "new" and "stats", a "game" id; an "id"
+field, if present, is echoed in the reply:
+
+    {"op": "new", "fen": "<optional FEN>"}      creates a game and joins it
+    {"op": "join", "game": "g1"}               receives the game's state updates
+    {"op": "leave", "game": "g1"}
+    {"op": "move", "game": "g1", "move": "e2e4"}
+    {"op": "stats"}
+
+Every client that joined a game receives {"type": "state", ...} after each
+move; errors come back as {"type": "error", "message": ...} to the sender
+only. Sessions unused for idle_timeout seconds are evicted, and the least
+recently used ones are evicted early when the sessions' memory goes over
+max_memory. Moves are checked against the position's cached legal moves;
+the time to validate and play each one is kept in a latency histogram.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+from collections import OrderedDict
+
+from chesscore.gamestate import GameState
+from chesscore.instrument import Histogram
+from chesscore.notation import encode_uci, move_to_uci, parse_fen, to_fen
+from chesscore.position import Position
+
+DEFAULT_PORT = 8765
+DEFAULT_IDLE_TIMEOUT = 600.0
+EVICTION_INTERVAL = 5.0  # Seconds between idle sweeps at most
+
+logger = logging.getLogger(__name__)
+MAX_LINE_BYTES = 64 * 1024
+
+# Measured once: every undo record and GameState has the same layout
+UNDO_RECORD_BYTES = sys.getsizeof((0,) * 9)
+GAME_STATE_BYTES = sys.getsizeof(object.__new__(GameState))
+
+
+class Session:
+    """One game: its position, the clients watching it and when it was last used."""
+
+    __slots__ = ("game_id", "position", "subscribers", "last_active", "memory")
+
+    def __init__(self, game_id, position, now):
+        self.game_id = game_id
+        self.position = position
+        self.subscribers = set()
+        self.last_active = now
+        self.memory = self.measure()
+
+    def measure(self):
+        """Returns an estimate of the bytes held by the session, its position and move history."""
+        position = self.position
+        lists = position.piece_lists
+        size = (sys.getsizeof(self) + sys.getsizeof(position) + sys.getsizeof(position.board)
+                + sys.getsizeof(lists) + sum(sys.getsizeof(squares) for squares in lists)
+                + sys.getsizeof(position.king_squares) + sys.getsizeof(self.subscribers)
+                + sys.getsizeof(position.history) + len(position.history) * UNDO_RECORD_BYTES)
+        state = position.game_state()  # Always built: replies and validation read it
+        return (size + GAME_STATE_BYTES + sys.getsizeof(state.moves) + sys.getsizeof(state.moves_by_square)
+                + sum(sys.getsizeof(targets) for targets in state.moves_by_square.values()))
+
+    def state(self, last_move=None):
+        """Returns the state update sent to subscribers."""
+        position = self.position
+        game_state = position.game_state()
+        return {
+            "type": "state",
+            "game": self.game_id,
+            "fen": to_fen(position),
+            "turn": position.turn,
+            "last_move": last_move,
+            "legal_moves": [move_to_uci(move) for move in game_state.moves],
+            "in_check": game_state.in_check,
+            "status": game_state.status,
+            "result": game_state.result,
+        }
+
+
+class GameServer:
+    """Holds every session and serves the JSON protocol to asyncio stream clients."""
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_memory=None, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.max_memory = max_memory
+        self.clock = clock
+        self.sessions = OrderedDict()  # Least recently used first
+        self.joined = {}  # Client writer -> ids of the games it receives updates for
+        self.memory = 0  # Sum of Session.memory
+        self.ids = itertools.count(1)
+        self.moves = 0
+        self.rejected = 0
+        self.evicted = 0
+        self.clients = 0
+        self.validation = Histogram()
+
+    # --- Sessions ---
+
+    def create(self, fen=None):
+        """Starts a new game and returns its Session. Raises ValueError for an invalid FEN."""
+        position = parse_fen(fen) if fen else Position()
+        session = Session(f"g{next(self.ids)}", position, self.clock())
+        self.sessions[session.game_id] = session
+        self.memory += session.memory
+        self._enforce_memory_limit()
+        return session
+
+    def get(self, game_id):
+        """Returns the session of a game and marks it as used. Raises ValueError for an unknown game."""
+        session = self.sessions.get(game_id)
+        if session is None:
+            raise ValueError(f"Unknown game {game_id!r}")
+        session.last_active = self.clock()
+        self.sessions.move_to_end(game_id)
+        return session
+
+    def play(self, session, text):
+        """Validates and plays a UCI move in a session. Raises ValueError if it is not legal."""
+        start = time.perf_counter()
+        position = session.position
+        game_state = position.game_state()
+        if game_state.is_over:
+            raise ValueError(f"Game is over: {game_state.status}")
+        try:
+            move = encode_uci(text)
+        except (TypeError, ValueError):
+            move = None
+        if move not in game_state.moves:
+            self.rejected += 1
+            raise ValueError(f"Illegal move {text!r}")
+        position.apply(move)
+        position.game_state()  # Legal moves for the reply and the next move's validation
+        self.validation.record(time.perf_counter() - start)
+        self.moves += 1
+        memory = session.measure()
+        self.memory += memory - session.memory
+        session.memory = memory
+        self._enforce_memory_limit()
+
+    def subscribe(self, session, writer):
+        session.subscribers.add(writer)
+        self.joined.setdefault(writer, set()).add(session.game_id)
+
+    def unsubscribe(self, session, writer):
+        session.subscribers.discard(writer)
+        self.joined.get(writer, set()).discard(session.game_id)
+
+    def disconnect(self, writer):
+        """Removes a client from the games it joined."""
+        for game_id in self.joined.pop(writer, ()):
+            session = self.sessions.get(game_id)
+            if session is not None:
+                session.subscribers.discard(writer)
+
+    def evict(self, session, reason):
+        del self.sessions[session.game_id]
+        self.memory -= session.memory
+        self.evicted += 1
+        message = _encode({"type": "evicted", "game": session.game_id, "reason": reason})
+        for writer in session.subscribers:
+            self.joined.get(writer, set()).discard(session.game_id)
+            writer.write(message)
+
+    def evict_idle(self):
+        """Evicts every session unused for idle_timeout seconds and returns how many there were."""
+        deadline = self.clock() - self.idle_timeout
+        count = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_active > deadline:
+                break
+            self.evict(session, "idle")
+            count += 1
+        return count
+
+    def _enforce_memory_limit(self):
+        while self.max_memory is not None and self.memory > self.max_memory and len(self.sessions) > 1:
+            self.evict(next(iter(self.sessions.values())), "memory")
+
+    def stats(self):
+        return {
+            "type": "stats",
+            "sessions": len(self.sessions),
+            "clients": self.clients,
+            "memory_bytes": self.memory,
+            "bytes_per_session": self.memory // len(self.sessions) if self.sessions else 0,
+            "moves": self.moves,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+            "validation": self.validation.summary(),
+        }
+
+    # --- Protocol ---
+
+    def handle(self, request, writer):
+        """Carries out one request from the client behind writer and returns the reply."""
+        op = _string_field(request, "op")
+        if op == "new":
+            session = self.create(_string_field(request, "fen", required=False))
+            self.subscribe(session, writer)
+            return session.state()
+        if op == "stats":
+            return self.stats()
+        if op not in ("join", "leave", "move"):
+            raise ValueError(f"Unknown op {op!r}")
+        session = self.get(_string_field(request, "game"))
+        if op == "join":
+            self.subscribe(session, writer)
+            return session.state()
+        if op == "leave":
+            self.unsubscribe(session, writer)
+            return {"type": "left", "game": session.game_id}
+        text = _string_field(request, "move")
+        self.play(session, text)
+        update = session.state(text)
+        message = _encode(update)
+        for subscriber in session.subscribers:
+            if subscriber is not writer:
+                subscriber.write(message)
+        return update
+
+    async def handle_client(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                request = None
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):  # ValueError: line longer than the stream limit
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                    reply = self.handle(request, writer)
+                except ValueError as error:  # json.JSONDecodeError is a ValueError too
+                    reply = {"type": "error", "message": str(error)}
+                if isinstance(request, dict) and "id" in request:
+                    reply = {**reply, "id": request["id"]}
+                writer.write(_encode(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass  # The client went away while its reply was being sent
+        except Exception:
+            # Bad requests are answered above; anything else is a server bug, so report it and hang up
+            logger.exception("Closing the connection after an unexpected error")
+        finally:
+            self.clients -= 1
+            self.disconnect(writer)
+            writer.close()
+
+    async def _evict_periodically(self):
+        while True:
+            await asyncio.sleep(min(EVICTION_INTERVAL, self.idle_timeout / 4))
+            self.evict_idle()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        """Serves clients until cancelled. ready, if given, is called with the listening asyncio.Server."""
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE_BYTES)
+        evictor = asyncio.create_task(self._evict_periodically())
+        try:
+            if ready is not None:
+                ready(server)
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+def _string_field(request, name, required=True):
+    """Returns a string field of a request, or None for a missing optional one. Raises ValueError otherwise."""
+    value = request.get(name)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"Field {name!r} must be a string")
+    return value
+
+
+def _encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="seconds after which an unused game is evicted")
+    parser.add_argument("--max-memory-mb", type=float, default=None,
+                        help="evict the least recently used games when sessions use more than this")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    max_memory = int(args.max_memory_mb * 1024 * 1024) if args.max_memory_mb else None
+    server = GameServer(args.idle_timeout, max_memory)
+    print(f"Serving games on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
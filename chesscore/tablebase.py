@@ -0,0 +1,294 @@
+"""Endgame tablebases for KQK, KRK and KPK, generated by retrograde analysis.
+
+    python -m chesscore tablebase tablebases --generate
+    python -m chesscore tablebase tablebases --fen "8/8/8/4k3/8/8/4P3/4K3 w - - 0 1"
+
+Each table holds one signed byte per (side to move, white king, black king,
+white piece) with the extra piece always white; positions where black has
+it are probed with colors swapped and the board flipped. For white to move
+a value n > 0 means white mates in n plies; for black to move a value
+n < 0 means black is mated in -n - 1 plies; 0 is a draw (or an illegal
+position). Tables are written as raw arrays and memory-mapped when probed.
+"""
+
+import mmap
+import os
+import time
+from array import array
+
+from chesscore.attacks import BISHOP_RAYS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS
+from chesscore.board import BLACK, PAWN, QUEEN, ROOK, SQUARES, WHITE
+from chesscore.gamestate import has_insufficient_material
+from chesscore.notation import move_to_uci, parse_fen
+from chesscore.search import MATE, MATE_BOUND
+
+# Table name -> type of the extra white piece, in generation order (KPK promotes into the others)
+TABLES = {"kqk": QUEEN, "krk": ROOK, "kpk": PAWN}
+TABLE_SIZE = 2 * 64 * 64 * 64
+FILE_SUFFIX = ".tb"
+
+PAWN_SQUARES = tuple(sq for sq in SQUARES if 1 <= sq >> 4 <= 6)
+KING_SETS = [frozenset(targets) for targets in KING_ATTACKS]
+WHITE_PAWN_SETS = [frozenset(targets) for targets in PAWN_ATTACKS[WHITE]]
+
+
+def _lines(rays):
+    """Returns {(from, to): squares strictly between} for every pair of squares on a common ray."""
+    lines = {}
+    for sq in SQUARES:
+        for ray in rays[sq]:
+            for distance, target in enumerate(ray):
+                lines[sq, target] = ray[:distance]
+    return lines
+
+
+ROOK_LINES = _lines(ROOK_RAYS)
+BISHOP_LINES = _lines(BISHOP_RAYS)
+QUEEN_LINES = {**ROOK_LINES, **BISHOP_LINES}
+PIECE_LINES = {QUEEN: QUEEN_LINES, ROOK: ROOK_LINES}
+PIECE_RAYS = {QUEEN: [ROOK_RAYS[sq] + BISHOP_RAYS[sq] for sq in range(128)], ROOK: ROOK_RAYS}
+
+
+def table_index(side, white_king, black_king, piece):
+    """Returns the entry of a position; squares are 0x88 and side is WHITE or BLACK."""
+    return ((side >> 3) << 18 | ((white_king + (white_king & 7)) >> 1) << 12
+            | ((black_king + (black_king & 7)) >> 1) << 6 | (piece + (piece & 7)) >> 1)
+
+
+def _attacked(kind, white_king, piece, target):
+    """Checks if white attacks target, seeing through the black king."""
+    if target in KING_SETS[white_king]:
+        return True
+    if piece == target:
+        return False
+    if kind == PAWN:
+        return target in WHITE_PAWN_SETS[piece]
+    between = PIECE_LINES[kind].get((piece, target))
+    return between is not None and white_king not in between
+
+
+def _white_predecessors(kind, white_king, black_king, piece):
+    """Yields the white-to-move positions (as table indexes) from which white reaches this black-to-move one."""
+    blocked = (white_king, black_king)
+    for origin in KING_ATTACKS[white_king]:
+        if origin != piece and origin != black_king and origin not in KING_SETS[black_king] \
+                and not _attacked(kind, origin, piece, black_king):
+            yield table_index(WHITE, origin, black_king, piece)
+    if kind == PAWN:
+        origin = piece + 16
+        if origin >> 4 <= 6 and origin not in blocked:
+            if not _attacked(kind, white_king, origin, black_king):
+                yield table_index(WHITE, white_king, black_king, origin)
+            origin += 16
+            if piece >> 4 == 4 and origin not in blocked and not _attacked(kind, white_king, origin, black_king):
+                yield table_index(WHITE, white_king, black_king, origin)
+        return
+    for ray in PIECE_RAYS[kind][piece]:
+        for origin in ray:
+            if origin in blocked:
+                break
+            if not _attacked(kind, white_king, origin, black_king):
+                yield table_index(WHITE, white_king, black_king, origin)
+
+
+def _black_predecessors(white_king, black_king, piece):
+    """Yields the black-to-move positions from which a black king move reaches this white-to-move one."""
+    for origin in KING_ATTACKS[black_king]:
+        if origin != piece and origin != white_king and origin not in KING_SETS[white_king]:
+            yield table_index(BLACK, white_king, origin, piece)
+
+
+def generate(kind, promotion_tables=None):
+    """Builds the table for one extra white piece type and returns it as an array('b').
+
+    promotion_tables maps QUEEN and ROOK to their finished tables and is
+    required for PAWN, whose promotions lead into them.
+    """
+    values = array("b", bytes(TABLE_SIZE))
+    resolved = bytearray(TABLE_SIZE)
+    degree = bytearray(TABLE_SIZE)  # Black moves not yet known to lose, per black-to-move entry
+    squares = PAWN_SQUARES if kind == PAWN else SQUARES
+    positions = {}  # Black-to-move entry -> (white king, black king, piece)
+    lost = []
+    for white_king in SQUARES:
+        for black_king in SQUARES:
+            if black_king == white_king or black_king in KING_SETS[white_king]:
+                continue
+            for piece in squares:
+                if piece == white_king or piece == black_king:
+                    continue
+                index = table_index(BLACK, white_king, black_king, piece)
+                positions[index] = (white_king, black_king, piece)
+                moves = sum(1 for target in KING_ATTACKS[black_king] if not _attacked(kind, white_king, piece, target))
+                degree[index] = moves
+                if not moves:
+                    resolved[index] = 1  # Checkmate or stalemate
+                    if _attacked(kind, white_king, piece, black_king):
+                        values[index] = -1
+                        lost.append(index)
+
+    # White wins reached by promoting, grouped by their distance to mate
+    promotion_wins = {}
+    if kind == PAWN:
+        for (white_king, black_king, piece) in positions.values():
+            target = piece - 16
+            if piece >> 4 != 1 or target in (white_king, black_king) or _attacked(kind, white_king, piece, black_king):
+                continue
+            best = None
+            for promoted in (QUEEN, ROOK):
+                value = promotion_tables[promoted][table_index(BLACK, white_king, black_king, target)]
+                if value < 0 and (best is None or -value < best):
+                    best = -value  # Mated in -value - 1 plies after the promotion, so win in -value
+            if best is not None:
+                promotion_wins.setdefault(best, []).append(table_index(WHITE, white_king, black_king, piece))
+
+    ply = 0
+    while lost or any(distance > ply for distance in promotion_wins):
+        wins = []
+        for index in lost:
+            for predecessor in _white_predecessors(kind, *positions[index]):
+                if not resolved[predecessor]:
+                    resolved[predecessor] = 1
+                    values[predecessor] = ply + 1
+                    wins.append(predecessor)
+        for index in promotion_wins.pop(ply + 1, ()):
+            if not resolved[index]:
+                resolved[index] = 1
+                values[index] = ply + 1
+                wins.append(index)
+        lost = []
+        for index in wins:
+            white_king, black_king, piece = positions[index | 1 << 18]  # Same squares, black to move
+            for predecessor in _black_predecessors(white_king, black_king, piece):
+                if not resolved[predecessor]:
+                    degree[predecessor] -= 1
+                    if not degree[predecessor]:
+                        resolved[predecessor] = 1
+                        values[predecessor] = -(ply + 3)  # Mated in ply + 2
+                        lost.append(predecessor)
+        ply += 2
+    return values
+
+
+def generate_all(directory, report=print):
+    """Generates every table into directory as <name>.tb files."""
+    os.makedirs(directory, exist_ok=True)
+    finished = {}
+    for name, kind in TABLES.items():
+        start = time.perf_counter()
+        values = generate(kind, finished)
+        finished[kind] = values
+        with open(os.path.join(directory, name + FILE_SUFFIX), "wb") as file:
+            values.tofile(file)
+        report(f"{name}: {sum(1 for value in values if value)} decisive entries, "
+               f"longest mate {max(values)} plies, {time.perf_counter() - start:.1f}s")
+
+
+class Tablebases:
+    """Memory-mapped tables found in a directory. Missing tables are simply not probed."""
+
+    def __init__(self, directory):
+        self.tables = {}
+        for name, kind in TABLES.items():
+            path = os.path.join(directory, name + FILE_SUFFIX)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(data) != TABLE_SIZE:
+                data.close()
+                raise ValueError(f"Corrupt tablebase file: {path}")
+            self.tables[kind] = data
+
+    def close(self):
+        for data in self.tables.values():
+            data.close()
+        self.tables = {}
+
+    def probe(self, position):
+        """Returns the score of a position for the side to move, or None if no table covers it.
+
+        Wins and losses are MATE - plies and -(MATE - plies), like search
+        scores; draws, including positions with too little material to
+        mate, are 0.
+        """
+        lists = position.piece_lists
+        if sum(len(squares) for squares in lists) > 3:
+            return None
+        if has_insufficient_material(position):
+            return 0
+        for side in (WHITE, BLACK):
+            for kind, data in self.tables.items():
+                squares = lists[side | kind]
+                if squares:
+                    break
+            else:
+                continue
+            white_king = position.king_squares[side >> 3]
+            black_king = position.king_squares[(side ^ BLACK) >> 3]
+            piece = squares[0]
+            to_move = position.side
+            if side == BLACK:
+                # Swap colors so the extra piece is white: flip ranks and the side to move
+                white_king, black_king, piece = white_king ^ 0x70, black_king ^ 0x70, piece ^ 0x70
+                to_move ^= BLACK
+            value = data[table_index(to_move, white_king, black_king, piece)]
+            if value > 127:
+                value -= 256  # Stored as signed bytes
+            if value > 0:
+                return MATE - value
+            if value < 0:
+                return -(MATE - (-value - 1))
+            return 0
+        return None
+
+    def best_move(self, position):
+        """Returns (encoded move, score) with the best tablebase outcome for the side to move, or None."""
+        if self.probe(position) is None:
+            return None
+        best = None
+        for move in position.generate_legal():
+            position.apply(move)
+            child = self.probe(position)
+            if child is None and not position.generate_legal():
+                child = -MATE if position.is_check() else 0
+            position.unmake_move()
+            if child is None:
+                continue  # The move leaves the tables, e.g. an underpromotion this set does not cover
+            score = -child
+            # One ply further from the mate than the child
+            if score > MATE_BOUND:
+                score -= 1
+            elif score < -MATE_BOUND:
+                score += 1
+            if best is None or score > best[1]:
+                best = (move, score)
+        return best
+
+
+def add_arguments(parser):
+    parser.add_argument("directory", help="directory holding the .tb files")
+    parser.add_argument("--generate", action="store_true", help="generate KQK, KRK and KPK into the directory")
+    parser.add_argument("--fen", default=None, help="probe a position")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    if args.generate:
+        generate_all(args.directory)
+    if args.fen:
+        tablebases = Tablebases(args.directory)
+        position = parse_fen(args.fen)
+        score = tablebases.probe(position)
+        if score is None:
+            print("not in the tablebases")
+            return 1
+        found = tablebases.best_move(position)
+        if score > MATE_BOUND:
+            outcome = f"win, mate in {MATE - score} plies"
+        elif score < -MATE_BOUND:
+            outcome = f"loss, mated in {MATE + score} plies"
+        else:
+            outcome = "draw"
+        print(f"{outcome}  bestmove {move_to_uci(found[0]) if found else '(none)'}")
+    return 0
@@ -0,0 +1,211 @@
+"""Batch conversion of positions to NumPy tensors for machine-learning pipelines.
+
+    python -m chesscore tensors games.pgn --out positions.npz
+    python -m chesscore tensors games/*.pgn --out positions.npz --workers 4 --no-legal-moves
+
+encode_positions turns a sequence of Positions or FEN strings into a
+TensorBatch: (N, 12, 8, 8) piece planes (white pawn ... king, then black),
+side to move, castling rights, an en passant plane and (N, 64, 64)
+from-square/to-square legal move masks. Squares are numbered row * 8 + col
+with row 0 being rank 8, like the list-of-strings board. The planes are
+built from the 0x88 boards with array operations; only the legal move
+masks need per-position move generation. Large batches can be split
+across worker processes. Requires NumPy, which is imported on first use.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chesscore.board import BLACK, KING, PAWN
+from chesscore.evaluation import boards_to_array
+from chesscore.notation import STARTING_FEN, parse_fen, to_fen
+from chesscore.pgn import read_games
+
+np = None  # Imported by _load_numpy() when a batch is first encoded
+
+PIECE_PLANES = 12
+PLANES = PIECE_PLANES + 6  # Pieces, side to move, four castling rights, en passant
+CHUNK_SIZE = 2048  # Positions per worker task
+
+# Piece code of each piece plane: white pawn ... white king, black pawn ... black king
+PLANE_PIECES = tuple(range(PAWN, KING + 1)) + tuple(range(BLACK | PAWN, BLACK | KING + 1))
+
+
+def _load_numpy():
+    """Imports NumPy the first time it is needed, so listing the CLI commands does not pay for it."""
+    global np
+    if np is not None:
+        return
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Tensor export requires NumPy") from None
+    np = numpy
+
+
+class TensorBatch:
+    """Encoded positions as NumPy arrays, all indexed by position first."""
+
+    __slots__ = ("pieces", "side_to_move", "castling", "en_passant", "legal_moves")
+
+    def __init__(self, pieces, side_to_move, castling, en_passant, legal_moves=None):
+        self.pieces = pieces  # (N, 12, 8, 8) uint8
+        self.side_to_move = side_to_move  # (N,) uint8, 1 when white is to move
+        self.castling = castling  # (N, 4) uint8: white king side, white queen side, black king side, black queen side
+        self.en_passant = en_passant  # (N, 8, 8) uint8 with the en passant target square set
+        self.legal_moves = legal_moves  # (N, 64, 64) bool [position, from, to], or None
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def planes(self, dtype=None):
+        """Returns every plane stacked as one (N, 18, 8, 8) array, ready to feed to a network.
+
+        The side to move and castling rights are broadcast to whole planes.
+        """
+        _load_numpy()
+        count = len(self)
+        dtype = dtype or np.uint8
+        stacked = np.empty((count, PLANES, 8, 8), dtype=dtype)
+        stacked[:, :PIECE_PLANES] = self.pieces
+        stacked[:, PIECE_PLANES] = self.side_to_move[:, None, None]
+        stacked[:, PIECE_PLANES + 1:PIECE_PLANES + 5] = self.castling[:, :, None, None]
+        stacked[:, PIECE_PLANES + 5] = self.en_passant
+        return stacked
+
+    def arrays(self):
+        """Returns the arrays as a dict, e.g. for np.savez."""
+        arrays = {name: getattr(self, name) for name in self.__slots__}
+        if self.legal_moves is None:
+            del arrays["legal_moves"]
+        return arrays
+
+    def save(self, path):
+        """Writes the batch to a compressed .npz file."""
+        _load_numpy()
+        np.savez_compressed(path, **self.arrays())
+
+
+def _encode(positions, legal_moves):
+    _load_numpy()
+    count = len(positions)
+    codes = boards_to_array(positions)
+    pieces = (codes[:, None, :] == np.array(PLANE_PIECES, dtype=np.uint8)[None, :, None])
+    pieces = pieces.view(np.uint8).reshape(count, PIECE_PLANES, 8, 8)
+
+    sides = np.fromiter((position.side for position in positions), dtype=np.uint8, count=count)
+    side_to_move = (sides == 0).view(np.uint8)
+    rights = np.fromiter((position.castling for position in positions), dtype=np.uint8, count=count)
+    castling = (rights[:, None] >> np.arange(4, dtype=np.uint8)) & 1
+
+    ep_squares = np.fromiter((position.ep_square for position in positions), dtype=np.int16, count=count)
+    found = np.nonzero(ep_squares >= 0)[0]
+    en_passant = np.zeros((count, 64), dtype=np.uint8)
+    en_passant[found, (ep_squares[found] >> 4) * 8 + (ep_squares[found] & 7)] = 1
+
+    masks = None
+    if legal_moves:
+        indexes = []
+        for offset, position in enumerate(positions):
+            base = offset * 4096
+            for move in position.generate_legal():
+                from_sq = move & 0xFF
+                to_sq = (move >> 8) & 0xFF
+                indexes.append(base + ((from_sq >> 4) * 8 + (from_sq & 7)) * 64 + (to_sq >> 4) * 8 + (to_sq & 7))
+        masks = np.zeros(count * 4096, dtype=bool)
+        masks[np.array(indexes, dtype=np.int64)] = True  # Promotions to different pieces share one entry
+        masks = masks.reshape(count, 64, 64)
+    return TensorBatch(pieces, side_to_move, castling, en_passant.reshape(count, 8, 8), masks)
+
+
+def _encode_fens(fens, legal_moves):
+    return _encode([parse_fen(fen) for fen in fens], legal_moves)
+
+
+def _concatenate(batches):
+    if len(batches) == 1:
+        return batches[0]
+    arrays = [batch.arrays() for batch in batches]
+    return TensorBatch(**{name: np.concatenate([found[name] for found in arrays]) for name in arrays[0]})
+
+
+def encode_positions(positions, legal_moves=True, workers=None, chunk_size=CHUNK_SIZE):
+    """Encodes Positions and/or FEN strings into a TensorBatch.
+
+    With workers > 1, batches larger than chunk_size are sent to a process
+    pool as FEN strings in chunks of chunk_size positions. legal_moves=False
+    skips the move masks, which are the only part that needs move
+    generation.
+    """
+    _load_numpy()
+    positions = list(positions)
+    if workers and workers > 1 and len(positions) > chunk_size:
+        fens = [item if isinstance(item, str) else to_fen(item) for item in positions]
+        chunks = [fens[start:start + chunk_size] for start in range(0, len(fens), chunk_size)]
+        with ProcessPoolExecutor(workers) as pool:
+            batches = list(pool.map(_encode_fens, chunks, [legal_moves] * len(chunks)))
+        return _concatenate(batches)
+    positions = [parse_fen(item) if isinstance(item, str) else item for item in positions]
+    if not positions:
+        return TensorBatch(np.zeros((0, PIECE_PLANES, 8, 8), dtype=np.uint8), np.zeros(0, dtype=np.uint8),
+                           np.zeros((0, 4), dtype=np.uint8), np.zeros((0, 8, 8), dtype=np.uint8),
+                           np.zeros((0, 64, 64), dtype=bool) if legal_moves else None)
+    return _encode(positions, legal_moves)
+
+
+def game_positions(game):
+    """Returns copies of every position of a replayed pgn.Game, from the start up to before its last move.
+
+    The game must be valid (game.error is None); its FEN tag is parsed again.
+    """
+    position = parse_fen(game.headers.get("FEN", STARTING_FEN))
+    positions = []
+    for move in game.moves:
+        positions.append(position.copy())
+        position.apply(move)
+    return positions
+
+
+def read_positions(paths, max_games=None, report=print):
+    """Returns (positions, games, skipped games) for every valid game in the PGN files at paths.
+
+    Games with an illegal move or a bad FEN tag are skipped, and report is
+    called with a line for each.
+    """
+    positions = []
+    games = skipped = 0
+    for path in paths:
+        for game in read_games(path):
+            games += 1
+            if game.error is not None:
+                skipped += 1
+                report(f"{path}@{game.offset}: {game!r}: {game.error} (skipped)")
+            else:
+                positions.extend(game_positions(game))
+            if max_games is not None and games >= max_games:
+                return positions, games, skipped
+    return positions, games, skipped
+
+
+def add_arguments(parser):
+    parser.add_argument("paths", nargs="+", help="PGN files whose positions are encoded")
+    parser.add_argument("--out", default=None, help="write the batch to this .npz file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all CPUs)")
+    parser.add_argument("--max-games", type=int, default=None, help="stop reading after this many games")
+    parser.add_argument("--no-legal-moves", dest="legal_moves", action="store_false",
+                        help="leave out the legal move masks")
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    positions, games, skipped = read_positions(args.paths, args.max_games)
+    start = time.perf_counter()
+    batch = encode_positions(positions, args.legal_moves, args.workers)
+    elapsed = time.perf_counter() - start
+    rate = len(batch) / elapsed if elapsed > 0 else 0.0
+    print(f"{len(batch)} positions from {games - skipped} games ({skipped} invalid skipped) "
+          f"encoded in {elapsed:.3f}s ({rate:.0f} positions/s)")
+    if args.out:
+        batch.save(args.out)
+    return 0
@@ -0,0 +1,42 @@
+"""Tests for the opening book."""
+
+import os
+import tempfile
+import unittest
+
+from chesscore.book import OpeningBook, build_book
+from chesscore.notation import move_to_uci, parse_fen, parse_san
+from chesscore.position import Position
+
+
+class OpeningBookTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        self.count = build_book(self.path)
+        self.book = OpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+        os.remove(self.path)
+
+    def test_builtin_lines(self):
+        self.assertEqual(len(self.book), self.count)
+        moves = self.book.moves(Position())
+        self.assertEqual(move_to_uci(moves[0][0]), "e2e4")
+        self.assertEqual(moves, sorted(moves, key=lambda pair: pair[1], reverse=True))
+
+    def test_castling_is_found(self):
+        position = Position()
+        for san in "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6".split():
+            position.apply(parse_san(position, san))
+        self.assertIn("e1g1", [move_to_uci(move) for move, _ in self.book.moves(position)])
+
+    def test_out_of_book(self):
+        position = parse_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(self.book.moves(position), [])
+        self.assertIsNone(self.book.choose(position))
+
+
+if __name__ == "__main__":
+    unittest.main()
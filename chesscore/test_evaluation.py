@@ -0,0 +1,67 @@
+"""Tests for the incrementally updated evaluation."""
+
+import random
+import unittest
+
+from chesscore.evaluation import compute_scores, evaluate
+from chesscore.notation import parse_fen
+from chesscore.position import Position
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Castling, en passant and promotions all change the running totals in their own way
+FENS = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+)
+
+
+def random_positions(rng, games=10, plies=100):
+    for fen in FENS:
+        for _ in range(games):
+            position = parse_fen(fen)
+            for _ in range(plies):
+                moves = position.generate_legal()
+                if not moves:
+                    break
+                position.apply(rng.choice(moves))
+                yield position
+
+
+class EvaluationTest(unittest.TestCase):
+    def test_running_totals_match_a_full_recompute(self):
+        for position in random_positions(random.Random(9)):
+            self.assertEqual((position.mg_score, position.eg_score, position.phase), compute_scores(position))
+
+    def test_unmake_restores_the_totals(self):
+        position = parse_fen(FENS[1])
+        before = (position.mg_score, position.eg_score, position.phase)
+        for move in position.generate_legal():
+            position.apply(move)
+            position.unmake_move()
+            self.assertEqual((position.mg_score, position.eg_score, position.phase), before)
+
+    def test_symmetry(self):
+        self.assertEqual(evaluate(Position()), 0)
+        white = parse_fen("4k3/8/8/8/8/8/8/Q3K3 w - - 0 1")
+        self.assertGreater(evaluate(white), 800)
+        white.apply(white.generate_legal()[0])
+        self.assertLess(evaluate(white), -800)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_batch_matches_evaluate(self):
+        from chesscore.evaluation import boards_to_array, evaluate_batch
+
+        positions = [position.copy() for position in random_positions(random.Random(3), games=2, plies=40)]
+        self.assertEqual(evaluate_batch(positions).tolist(), [evaluate(position) for position in positions])
+        array = boards_to_array(positions)
+        white_view = [-evaluate(position) if position.side else evaluate(position) for position in positions]
+        self.assertEqual(evaluate_batch(array).tolist(), white_view)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for the cached game state and the draw rules."""
+
+import unittest
+
+from chesscore.gamestate import (
+    CHECKMATE, FIFTY_MOVE_RULE, INSUFFICIENT_MATERIAL, STALEMATE, THREEFOLD_REPETITION, has_insufficient_material,
+)
+from chesscore.notation import parse_fen, parse_uci
+from chesscore.position import Position
+
+
+def status(fen):
+    return parse_fen(fen).game_state().status
+
+
+class GameStateTest(unittest.TestCase):
+    def test_game_in_progress(self):
+        state = Position().game_state()
+        self.assertEqual((state.status, state.result, state.is_over, state.describe()), (None, "*", False, None))
+        self.assertEqual(len(state.moves), 20)
+        self.assertEqual(sorted(state.moves_from(6, 4)), [(4, 4), (5, 4)])
+
+    def test_checkmate(self):
+        state = parse_fen("R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1").game_state()
+        self.assertEqual((state.status, state.result, state.in_check), (CHECKMATE, "1-0", True))
+        self.assertEqual(state.describe(), "Checkmate! White wins!")
+        self.assertFalse(state.is_draw)
+
+    def test_stalemate(self):
+        state = parse_fen("k7/2K5/1Q6/8/8/8/8/8 b - - 0 1").game_state()
+        self.assertEqual((state.status, state.result, state.in_check), (STALEMATE, "1/2-1/2", False))
+        self.assertTrue(state.is_draw)
+
+    def test_insufficient_material(self):
+        for fen in ("4k3/8/8/8/8/8/8/4K3 w - - 0 1",
+                    "4k3/8/8/8/8/8/8/4KN2 w - - 0 1",
+                    "4kb2/8/8/8/8/8/8/2B1K3 w - - 0 1",  # Bishops on the same color
+                    "4k3/8/8/8/8/8/8/B1B1K3 w - - 0 1"):
+            with self.subTest(fen=fen):
+                self.assertEqual(status(fen), INSUFFICIENT_MATERIAL)
+        for fen in ("4k3/8/8/8/8/8/8/2B1KB2 w - - 0 1",  # Bishops on both colors
+                    "4k3/8/8/8/8/8/8/3NKB2 w - - 0 1",
+                    "4k3/8/8/8/8/8/8/4KNN1 w - - 0 1",
+                    "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1",
+                    "4k3/8/8/8/8/8/8/R3K3 w - - 0 1"):
+            with self.subTest(fen=fen):
+                self.assertFalse(has_insufficient_material(parse_fen(fen)))
+                self.assertIsNone(status(fen))
+
+    def test_fifty_move_rule(self):
+        self.assertIsNone(status("4k3/8/8/8/8/8/8/R3K3 w - - 99 80"))
+        self.assertEqual(status("4k3/8/8/8/8/8/8/R3K3 w - - 100 80"), FIFTY_MOVE_RULE)
+        # Mate on the last move before the limit still counts as mate
+        self.assertEqual(status("R5k1/5ppp/8/8/8/8/8/6K1 b - - 100 80"), CHECKMATE)
+
+    def test_threefold_repetition(self):
+        position = Position()
+        for text in "g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1".split():
+            position.apply(parse_uci(position, text))
+            self.assertIsNone(position.game_state().status)
+        position.apply(parse_uci(position, "f6g8"))
+        state = position.game_state()
+        self.assertEqual((state.status, state.result), (THREEFOLD_REPETITION, "1/2-1/2"))
+        self.assertEqual(state.describe(), "Draw by threefold repetition.")
+
+    def test_state_is_cached_until_the_position_changes(self):
+        position = Position()
+        state = position.game_state()
+        self.assertIs(position.game_state(), state)
+        position.apply(state.moves[0])
+        self.assertIsNot(position.game_state(), state)
+        position.unmake_move()
+        self.assertEqual(position.game_state().moves, state.moves)
+
+
+if __name__ == "__main__":
+    unittest.main()
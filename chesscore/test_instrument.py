@@ -0,0 +1,89 @@
+"""Tests for the opt-in instrumentation."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from chesscore import instrument, movegen, rules
+from chesscore.perft import perft
+from chesscore.position import Position
+
+
+class InstrumentTest(unittest.TestCase):
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_counts_nothing_until_enabled(self):
+        perft(Position(), 2)
+        self.assertEqual(instrument.counters, {})
+        self.assertIs(Position.generate_legal, Position.__dict__["generate_legal"])
+
+    def test_counters_during_perft(self):
+        instrument.enable()
+        instrument.enable()  # A second call must not wrap the wrappers
+        nodes = perft(Position(), 3)
+        instrument.disable()
+        counters = instrument.counters
+        self.assertEqual(nodes, 8902)
+        self.assertEqual(counters["movegen nodes"], counters["Position.generate_legal"])
+        self.assertEqual(counters["attacks.checkers_and_pins"], counters["movegen nodes"])
+        self.assertGreater(counters["attacks.is_attacked"], 0)
+        self.assertGreaterEqual(counters["moves generated"], 400)
+        self.assertEqual(counters["moves made"], sum(instrument.per_ply["moves made"].values()))
+        self.assertEqual(set(instrument.per_ply["moves made"]), {0, 1})
+        self.assertEqual(instrument.histograms["legal_moves"].count, counters["Position.generate_legal"])
+
+    def test_every_target_is_called(self):
+        instrument.enable()
+        board = rules.initial_board()
+        rules.get_all_valid_moves(board, "white", None, None)
+        rules.is_check(board, "white")
+        rules.make_move(board, 6, 4, 4, 4)
+        perft(Position(), 3)  # Deep enough for king moves, which test attacked squares
+        Position().copy().game_state()
+        instrument.disable()
+        labels = {label for _, _, label, _, _ in instrument.TARGETS}
+        self.assertEqual({label for label in labels if not instrument.counters[label]}, set())
+
+    def test_disable_restores_the_originals(self):
+        originals = [getattr(owner, name) for owner, name, _, _, _ in instrument.TARGETS]
+        instrument.enable()
+        self.assertIsNot(movegen.generate_legal_moves, originals[3])
+        instrument.disable()
+        self.assertEqual([getattr(owner, name) for owner, name, _, _, _ in instrument.TARGETS], originals)
+
+    def test_stats_export(self):
+        instrument.enable()
+        perft(Position(), 2)
+        instrument.disable()
+        handle, path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        try:
+            instrument.export_json(path)
+            with open(path) as file:
+                exported = json.load(file)
+        finally:
+            os.remove(path)
+        self.assertEqual(exported["counters"]["moves made"], 20)
+        self.assertEqual(exported["per_ply"]["moves made"], {"0": 20})
+        self.assertEqual(exported["histograms"]["legal_moves"]["count"], 21)
+
+
+class HistogramTest(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = instrument.Histogram()
+        self.assertEqual(histogram.percentile(0.5), 0)
+        for micros in (3, 3, 3, 100):
+            histogram.record(micros / 1_000_000)
+        summary = histogram.summary()
+        self.assertEqual((summary["count"], summary["p50_us"], summary["p99_us"]), (4, 4, 128))
+        self.assertEqual(summary["buckets_us"], {"<4": 3, "<128": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
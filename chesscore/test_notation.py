@@ -0,0 +1,80 @@
+"""Tests for FEN, UCI and SAN notation."""
+
+import random
+import unittest
+
+from chesscore.notation import (
+    STARTING_FEN, encode_uci, move_to_san, move_to_uci, parse_fen, parse_san, parse_uci, to_fen,
+)
+from chesscore.position import Position
+
+
+class ParseFenTest(unittest.TestCase):
+    def test_round_trip(self):
+        for fen in (STARTING_FEN,
+                    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+                    "8/8/8/4k3/8/8/4P3/4K3 b - - 12 40"):
+            self.assertEqual(to_fen(parse_fen(fen)), fen)
+
+    def test_clocks_are_optional(self):
+        position = parse_fen("4k3/8/8/8/8/8/8/4K3 w - -")
+        self.assertEqual((position.halfmove_clock, position.fullmove_number), (0, 1))
+
+    def test_rejects_bad_input(self):
+        for fen in ("",
+                    "8/8/8/8/8/8/P7/8 w - - 0 1",  # No kings
+                    "kk6/8/8/8/8/8/8/K7 w - - 0 1",  # Two black kings
+                    "4k3/8/8/8/8/8/8/4K3 x - - 0 1",
+                    "4k3/8/8/8/8/8/8/4K3 w X - 0 1",
+                    "4k3/8/8/8/8/8/8/4K3 w - e4 0 1",  # En passant square off ranks 3 and 6
+                    "4k3/8/8/8/8/8/8/4K3 w - e3 0 1",  # Rank 3 with white to move
+                    "4k3/4R3/8/8/8/8/8/4K3 w - - 0 1",  # Side not to move in check
+                    "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",
+                    "4k3/8/8/8/8/8/8/4K3 w - - -1 1",
+                    "4k3/8/8/8/8/8/8/4K2 w - - 0 1",
+                    "4k3/8/8/8/8/8/8/4K3/8 w - - 0 1"):
+            with self.subTest(fen=fen), self.assertRaises(ValueError):
+                parse_fen(fen)
+
+    def test_drops_castling_rights_without_king_and_rook_at_home(self):
+        position = parse_fen("4k3/8/8/8/8/8/8/3K2R1 w K - 0 1")
+        self.assertEqual(position.castling, 0)
+        self.assertNotIn("d1f1", [move_to_uci(move) for move in position.generate_legal()])
+        self.assertEqual(to_fen(parse_fen("r3k3/8/8/8/8/8/8/R3K2R w KQkq - 0 1")).split()[2], "KQq")
+
+
+class MoveNotationTest(unittest.TestCase):
+    def test_random_games_round_trip(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            position = Position()
+            for _ in range(120):
+                moves = position.generate_legal()
+                if not moves:
+                    break
+                for move in moves:
+                    self.assertEqual(parse_uci(position, move_to_uci(move)), move)
+                    self.assertEqual(parse_san(position, move_to_san(position, move, moves), moves), move)
+                position.apply(rng.choice(moves))
+                self.assertEqual(to_fen(parse_fen(to_fen(position))), to_fen(position))
+
+    def test_san_forms(self):
+        position = parse_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        self.assertEqual(move_to_uci(parse_san(position, "O-O")), "e1g1")
+        self.assertEqual(move_to_uci(parse_san(position, "0-0-0")), "e1c1")
+        self.assertEqual(move_to_san(position, parse_uci(position, "a1a8")), "Rxa8+")
+
+    def test_rejects_illegal_and_malformed_moves(self):
+        position = Position()
+        for text in ("e2e5", "e7e5", "zz", "e2e4x", "e7e8k"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_uci(position, text)
+        with self.assertRaises(ValueError):
+            parse_san(position, "Ke2")
+        with self.assertRaises(ValueError):
+            encode_uci("e7")
+
+
+if __name__ == "__main__":
+    unittest.main()
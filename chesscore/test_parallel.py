@@ -0,0 +1,75 @@
+"""Tests for the multiprocess search and perft."""
+
+import unittest
+
+from chesscore.notation import move_to_uci, parse_fen
+from chesscore.parallel import ParallelSearcher, SharedTranspositionTable
+from chesscore.perft import perft
+from chesscore.search import MATE, MATE_BOUND, Searcher
+from chesscore.tt import LOWER, UPPER
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+class SharedTableTest(unittest.TestCase):
+    def test_entries_survive_packing_and_are_seen_by_other_attachments(self):
+        table = SharedTranspositionTable(memory_mb=1)
+        other = SharedTranspositionTable(name=table.name)
+        try:
+            key = 0x0123_4567_89AB_CDEF
+            table.store(key, 7, (-(MATE - 5), UPPER, 0x40312))
+            self.assertEqual(other.probe(key), (7, (-(MATE - 5), UPPER, 0x40312)))
+            self.assertIsNone(other.probe(key ^ 1))
+            other.request_stop()
+            self.assertTrue(table.stop_requested)
+            table.clear()
+            self.assertIsNone(table.probe(key))
+        finally:
+            other.close()
+            table.close()
+
+    def test_deeper_entry_keeps_the_first_slot(self):
+        table = SharedTranspositionTable(memory_mb=1)
+        try:
+            deep, shallow = 5, 5 + table.bucket_count
+            table.store(deep, 9, (10, LOWER, 0))
+            table.store(shallow, 1, (20, LOWER, 0))
+            self.assertEqual(table.probe(deep)[0], 9)
+            self.assertEqual(table.probe(shallow)[0], 1)
+        finally:
+            table.close()
+
+
+class ParallelSearcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.searcher = ParallelSearcher(workers=2, memory_mb=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.searcher.close()
+
+    def test_perft_matches_the_serial_count(self):
+        for fen, depth in ((KIWIPETE, 3), ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4)):
+            position = parse_fen(fen)
+            with self.subTest(fen=fen):
+                self.assertEqual(self.searcher.perft(position, depth), perft(parse_fen(fen), depth))
+
+    def test_search_agrees_with_the_serial_search(self):
+        for fen in ("7k/8/8/8/8/8/R7/1R4K1 w - - 0 1", "4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1"):
+            with self.subTest(fen=fen):
+                serial = Searcher().search(parse_fen(fen), max_depth=4)
+                parallel = self.searcher.search(parse_fen(fen), max_depth=4)
+                self.assertEqual(parallel.score, serial.score)
+                self.assertIn(parallel.best_move, parse_fen(fen).generate_legal())
+                if serial.score < MATE_BOUND:  # A mate can have several equally short first moves
+                    self.assertEqual(move_to_uci(parallel.best_move), move_to_uci(serial.best_move))
+
+    def test_stop_flag_is_reset_between_searches(self):
+        self.searcher.search(parse_fen(KIWIPETE), max_depth=2)
+        result = self.searcher.search(parse_fen(KIWIPETE), max_depth=2)
+        self.assertEqual(result.depth, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
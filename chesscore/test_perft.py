@@ -0,0 +1,16 @@
+"""Runs the small perft reference counts as tests."""
+
+import unittest
+
+from chesscore.perft import run_suite
+
+
+class PerftTest(unittest.TestCase):
+    def test_reference_positions(self):
+        for result in run_suite(max_nodes=10_000, report=lambda line: None):
+            with self.subTest(name=result["name"], depth=result["depth"]):
+                self.assertEqual(result["nodes"], result["expected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tests for the streaming PGN reader."""
+
+import os
+import tempfile
+import unittest
+
+from chesscore.notation import to_fen
+from chesscore.pgn import read_games
+
+GAMES = """[Event "Good"]
+[White "A"]
+[Black "B"]
+
+1. e4 {a comment} e5 (1... c5 2. Nf3) 2. Nf3 $1 Nc6 ; rest of line
+3. Bb5 a6 1-0
+
+[Event "Bad FEN"]
+[FEN "8/8/8/8/8/8/P7/8 w - - 0 1"]
+
+1. a3 *
+
+[Event "Illegal move from a FEN"]
+[FEN "4k3/8/8/8/8/8/4P3/4K3 b - - 0 30"]
+
+30... Kd7 31. e4 Ke9 *
+
+[Event "Illegal move"]
+
+1. e4 e5 2. Ke3 0-1
+"""
+
+
+class ReadGamesTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".pgn")
+        with os.fdopen(handle, "w") as file:
+            file.write(GAMES)
+        self.games = list(read_games(self.path))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_reads_every_game(self):
+        self.assertEqual([game.headers["Event"] for game in self.games],
+                         ["Good", "Bad FEN", "Illegal move from a FEN", "Illegal move"])
+
+    def test_skips_comments_variations_and_nags(self):
+        good = self.games[0]
+        self.assertTrue(good.valid)
+        self.assertEqual(len(good.moves), 6)
+        self.assertEqual(good.result, "1-0")
+        self.assertEqual(to_fen(good.position), "r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4")
+
+    def test_bad_fen_tag_is_an_error(self):
+        self.assertFalse(self.games[1].valid)
+        self.assertIn("bad FEN tag", self.games[1].error)
+
+    def test_error_move_numbers_follow_the_position(self):
+        self.assertTrue(self.games[2].error.startswith("move 31...:"), self.games[2].error)
+        self.assertEqual(len(self.games[2].moves), 2)
+        self.assertTrue(self.games[3].error.startswith("move 2:"), self.games[3].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
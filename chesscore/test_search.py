@@ -0,0 +1,60 @@
+"""Tests for the alpha-beta search."""
+
+import time
+import unittest
+
+from chesscore.notation import move_to_uci, parse_fen, to_fen
+from chesscore.position import Position
+from chesscore.search import CHECK_INTERVAL, MATE, Searcher
+
+
+class SearchTest(unittest.TestCase):
+    def test_finds_mate_in_one(self):
+        position = parse_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = Searcher().search(position, max_depth=4)
+        self.assertEqual(move_to_uci(result.best_move), "a1a8")
+        self.assertEqual(result.score, MATE - 1)
+
+    def test_finds_mate_in_two(self):
+        # Rook ladder: 1. Ra7 (or Rb7) Kg8 2. R8#
+        position = parse_fen("7k/8/8/8/8/8/R7/1R4K1 w - - 0 1")
+        result = Searcher().search(position, max_depth=5)
+        self.assertIn(move_to_uci(result.best_move), ("a2a7", "b1b7"))
+        self.assertEqual(result.score, MATE - 3)
+
+    def test_takes_a_hanging_queen(self):
+        position = parse_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+        self.assertEqual(move_to_uci(Searcher().search(position, max_depth=3).best_move), "d1d5")
+
+    def test_mated_and_stalemated_roots(self):
+        mated = Searcher().search(parse_fen("R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1"))
+        self.assertEqual((mated.best_move, mated.score), (None, -MATE))
+        stalemated = Searcher().search(parse_fen("k7/2K5/1Q6/8/8/8/8/8 b - - 0 1"))
+        self.assertEqual((stalemated.best_move, stalemated.score), (None, 0))
+
+    def test_node_limit(self):
+        result = Searcher().search(Position(), node_limit=5000)
+        self.assertLess(result.nodes, 5000 + CHECK_INTERVAL)
+        self.assertIsNotNone(result.best_move)
+        self.assertGreaterEqual(result.depth, 1)
+
+    def test_time_limit_leaves_the_position_unchanged(self):
+        position = Position()
+        start = time.perf_counter()
+        result = Searcher().search(position, time_limit=0.2)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertIn(result.best_move, position.generate_legal())
+        self.assertEqual(to_fen(position), to_fen(Position()))
+        self.assertEqual(position.history, [])
+
+    def test_principal_variation_is_playable(self):
+        position = Position()
+        result = Searcher().search(position, max_depth=3)
+        self.assertEqual(result.pv[0], result.best_move)
+        for move in result.pv:
+            self.assertIn(move, position.generate_legal())
+            position.apply(move)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Tests for the game server's JSON protocol."""
+
+import asyncio
+import json
+import unittest
+
+from chesscore.server import GameServer
+
+
+class Writer:
+    """Stands in for a client's StreamWriter and keeps what was sent to it."""
+
+    def __init__(self):
+        self.messages = []
+
+    def write(self, data):
+        self.messages.append(json.loads(data))
+
+
+class HandleTest(unittest.TestCase):
+    def setUp(self):
+        self.server = GameServer()
+        self.writer = Writer()
+
+    def test_new_and_move(self):
+        state = self.server.handle({"op": "new"}, self.writer)
+        self.assertEqual(len(state["legal_moves"]), 20)
+        state = self.server.handle({"op": "move", "game": state["game"], "move": "e2e4"}, self.writer)
+        self.assertEqual(state["last_move"], "e2e4")
+        self.assertEqual(state["turn"], "black")
+
+    def test_rejects_bad_requests(self):
+        game = self.server.handle({"op": "new"}, self.writer)["game"]
+        for request in ({},
+                        {"op": 1},
+                        {"op": "dance"},
+                        {"op": "new", "fen": 123},
+                        {"op": "new", "fen": "8/8/8/8/8/8/8/8 w - - 0 1"},
+                        {"op": "join", "game": ["x"]},
+                        {"op": "join", "game": "nope"},
+                        {"op": "move", "game": game},
+                        {"op": "move", "game": game, "move": 42},
+                        {"op": "move", "game": game, "move": "e2e5"}):
+            with self.subTest(request=request), self.assertRaises(ValueError):
+                self.server.handle(request, self.writer)
+        self.assertEqual(len(self.server.sessions), 1)
+        self.assertEqual(self.server.rejected, 1)
+
+    def test_subscribers_receive_moves(self):
+        other = Writer()
+        game = self.server.handle({"op": "new"}, self.writer)["game"]
+        self.server.handle({"op": "join", "game": game}, other)
+        self.server.handle({"op": "move", "game": game, "move": "g1f3"}, self.writer)
+        self.assertEqual([message["last_move"] for message in other.messages], ["g1f3"])
+        self.assertEqual(self.writer.messages, [])
+        self.server.handle({"op": "leave", "game": game}, other)
+        self.server.handle({"op": "move", "game": game, "move": "g8f6"}, self.writer)
+        self.assertEqual(len(other.messages), 1)
+
+    def test_disconnect_leaves_joined_games(self):
+        first = self.server.handle({"op": "new"}, self.writer)["game"]
+        second = self.server.handle({"op": "new"}, self.writer)["game"]
+        self.server.disconnect(self.writer)
+        self.assertNotIn(self.writer, self.server.joined)
+        for game in (first, second):
+            self.assertEqual(self.server.sessions[game].subscribers, set())
+
+    def test_idle_games_are_evicted(self):
+        now = [0.0]
+        server = GameServer(idle_timeout=10, clock=lambda: now[0])
+        game = server.handle({"op": "new"}, self.writer)["game"]
+        now[0] = 11.0
+        self.assertEqual(server.evict_idle(), 1)
+        self.assertEqual(self.writer.messages, [{"type": "evicted", "game": game, "reason": "idle"}])
+        self.assertEqual(server.joined[self.writer], set())
+        with self.assertRaises(ValueError):
+            server.handle({"op": "join", "game": game}, self.writer)
+
+
+class ConnectionTest(unittest.TestCase):
+    def test_errors_keep_the_connection_open(self):
+        async def session():
+            server = GameServer()
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(server.serve("127.0.0.1", 0, ready.set_result))
+            port = (await ready).sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = []
+            for line in (b"not json\n", b"[1, 2]\n", b'{"op": "new", "fen": 123, "id": 7}\n',
+                         b'{"op": "join", "game": {"a": 1}}\n', b'{"op": "new", "id": 8}\n'):
+                writer.write(line)
+                await writer.drain()
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await writer.wait_closed()
+            while server.clients:
+                await asyncio.sleep(0.001)
+            joined = dict(server.joined)
+            task.cancel()
+            return replies, joined
+
+        replies, joined = asyncio.run(session())
+        self.assertEqual([reply["type"] for reply in replies], ["error"] * 4 + ["state"])
+        self.assertEqual(replies[2], {"type": "error", "message": "Field 'fen' must be a string", "id": 7})
+        self.assertEqual(replies[4]["id"], 8)
+        self.assertEqual(joined, {})
+
+    def test_server_errors_close_the_connection(self):
+        async def session():
+            server = GameServer()
+            server.stats = lambda: {}["sessions"]  # A defect in the server, not in the request
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(server.serve("127.0.0.1", 0, ready.set_result))
+            port = (await ready).sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"op": "stats"}\n')
+            await writer.drain()
+            line = await reader.readline()
+            writer.close()
+            await writer.wait_closed()
+            task.cancel()
+            return line
+
+        with self.assertLogs("chesscore.server", "ERROR") as logs:
+            self.assertEqual(asyncio.run(session()), b"")
+        self.assertIn("KeyError", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
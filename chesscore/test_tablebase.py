@@ -0,0 +1,46 @@
+"""Tests for the endgame tablebases."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from chesscore.board import QUEEN
+from chesscore.notation import move_to_uci, parse_fen
+from chesscore.search import MATE
+from chesscore.tablebase import FILE_SUFFIX, Tablebases, generate
+
+
+class TablebaseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        with open(os.path.join(cls.directory, "kqk" + FILE_SUFFIX), "wb") as file:
+            generate(QUEEN).tofile(file)
+        cls.tables = Tablebases(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tables.close()
+        shutil.rmtree(cls.directory)
+
+    def test_mate_in_one(self):
+        position = parse_fen("7k/8/6K1/8/8/8/8/1Q6 w - - 0 1")
+        self.assertEqual(self.tables.probe(position), MATE - 1)
+        move, score = self.tables.best_move(position)
+        self.assertIn(move_to_uci(move), ("b1b8", "b1h7"))
+        self.assertEqual(score, MATE - 1)
+
+    def test_losing_side_and_colors_swapped(self):
+        self.assertLess(self.tables.probe(parse_fen("7k/8/6K1/8/8/8/8/1Q6 b - - 0 1")), 0)
+        self.assertGreater(self.tables.probe(parse_fen("1q6/8/8/8/8/6k1/8/7K b - - 0 1")), 0)
+
+    def test_draws_and_uncovered_positions(self):
+        self.assertEqual(self.tables.probe(parse_fen("7k/8/8/8/8/8/8/K7 w - - 0 1")), 0)
+        self.assertEqual(self.tables.probe(parse_fen("k7/2K5/1Q6/8/8/8/8/8 b - - 0 1")), 0)  # Stalemate
+        self.assertIsNone(self.tables.probe(parse_fen("7k/8/6K1/8/8/8/8/R7 w - - 0 1")))  # No KRK table
+        self.assertIsNone(self.tables.probe(parse_fen("7k/8/6K1/8/8/8/P7/1Q6 w - - 0 1")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for the NumPy tensor export."""
+
+import os
+import tempfile
+import unittest
+
+from chesscore.notation import parse_fen
+from chesscore.position import Position
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+GAMES = """[Event "Good"]
+
+1. e4 e5 2. Nf3 Nc6 *
+
+[Event "Bad FEN"]
+[FEN "8/8/8/8/8/8/P7/8 w - - 0 1"]
+
+1. a3 *
+
+[Event "Illegal move"]
+
+1. e4 e5 2. Ke3 *
+
+[Event "From a FEN"]
+[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]
+
+1. e4 Kd7 *
+"""
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TensorTest(unittest.TestCase):
+    def test_read_positions_skips_invalid_games(self):
+        from chesscore.tensors import read_positions
+
+        handle, path = tempfile.mkstemp(suffix=".pgn")
+        with os.fdopen(handle, "w") as file:
+            file.write(GAMES)
+        reports = []
+        try:
+            positions, games, skipped = read_positions([path], report=reports.append)
+        finally:
+            os.remove(path)
+        self.assertEqual((len(positions), games, skipped), (6, 4, 2))
+        self.assertEqual(len(reports), 2)
+        self.assertTrue(all(report.endswith("(skipped)") for report in reports))
+
+    def test_encoding(self):
+        from chesscore.tensors import PLANES, encode_positions
+
+        positions = [Position(), parse_fen("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3")]
+        batch = encode_positions(positions, workers=1)
+        self.assertEqual(batch.pieces.shape, (2, 12, 8, 8))
+        self.assertEqual(batch.planes().shape, (2, PLANES, 8, 8))
+        self.assertEqual(batch.pieces[0].sum(), 32)
+        self.assertEqual(batch.side_to_move.tolist(), [1, 1])
+        self.assertEqual(batch.castling.tolist(), [[1, 1, 1, 1], [1, 0, 0, 1]])
+        self.assertEqual(batch.en_passant[1].sum(), 1)
+        for index, position in enumerate(positions):
+            self.assertEqual(int(batch.legal_moves[index].sum()), len(position.generate_legal()))
+
+    def test_empty_batch(self):
+        from chesscore.tensors import encode_positions
+
+        self.assertEqual(len(encode_positions([])), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""Tests for the transposition table."""
+
+import unittest
+
+from chesscore.tt import ALWAYS_REPLACE, TranspositionTable
+
+
+class TranspositionTableTest(unittest.TestCase):
+    def test_store_and_probe(self):
+        table = TranspositionTable(memory_mb=1)
+        self.assertIsNone(table.probe(12345))
+        table.store(12345, 3, "value")
+        self.assertEqual(table.probe(12345), (3, "value"))
+        self.assertEqual((len(table), table.hits, table.misses, table.stores), (1, 1, 1, 1))
+
+    def test_size_is_bounded_by_the_memory_budget(self):
+        table = TranspositionTable(memory_mb=0.01)
+        slots = table.stats()["slots"]
+        for key in range(10 * slots):
+            table.store(key, 1, key)
+        self.assertLessEqual(len(table), slots)
+        self.assertLessEqual(table.hashfull(), 1000)
+
+    def test_depth_preferred_keeps_the_deeper_entry(self):
+        table = TranspositionTable(memory_mb=0.01)
+        deep, shallow, newer = 1, 1 + table.bucket_count, 1 + 2 * table.bucket_count  # One bucket
+        table.store(deep, 8, "deep")
+        table.store(shallow, 2, "shallow")
+        table.store(newer, 1, "newer")
+        self.assertEqual(table.probe(deep), (8, "deep"))
+        self.assertIsNone(table.probe(shallow))
+        self.assertEqual(table.probe(newer), (1, "newer"))
+        self.assertEqual(table.collisions, 1)
+
+    def test_always_replace(self):
+        table = TranspositionTable(memory_mb=0.01, policy=ALWAYS_REPLACE)
+        table.store(1, 8, "deep")
+        table.store(1 + table.bucket_count, 1, "newer")
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(len(table), 1)
+
+    def test_clear_and_bad_policy(self):
+        table = TranspositionTable(memory_mb=0.01)
+        table.store(7, 1, "x")
+        table.clear()
+        self.assertEqual((len(table), table.probe(7), table.stores), (0, None, 0))
+        with self.assertRaises(ValueError):
+            TranspositionTable(policy="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests for the UCI front end."""
+
+import unittest
+
+from chesscore.notation import move_to_uci, to_fen
+from chesscore.position import Position
+from chesscore.search import MATE
+from chesscore.tt import TranspositionTable
+from chesscore.uci import UCIEngine, format_score, time_budget
+
+
+class UCITest(unittest.TestCase):
+    def setUp(self):
+        self.lines = []
+        self.engine = UCIEngine(self.lines.append)
+
+    def run_commands(self, *commands):
+        for command in commands:
+            self.assertTrue(self.engine.handle(command))
+        self.engine.wait()
+
+    def bestmove(self):
+        found = [line for line in self.lines if line.startswith("bestmove")]
+        self.assertEqual(len(found), 1, self.lines)
+        return found[0].split()[1]
+
+    def test_handshake(self):
+        self.run_commands("uci", "isready")
+        self.assertEqual(self.lines[0], "id name chesscore")
+        self.assertIn("uciok", self.lines)
+        self.assertEqual(self.lines[-1], "readyok")
+
+    def test_position_with_moves(self):
+        self.run_commands("position startpos moves e2e4 e7e5 g1f3")
+        self.assertEqual(to_fen(self.engine.position),
+                         "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2")
+        self.run_commands("position fen 4k3/8/8/8/8/8/4P3/4K3 w - - 0 1 moves e2e4")
+        self.assertEqual(to_fen(self.engine.position), "4k3/8/8/8/4P3/8/8/4K3 b - e3 0 1")
+
+    def test_bad_positions_keep_the_old_one(self):
+        self.run_commands("position startpos moves e2e4")
+        before = to_fen(self.engine.position)
+        self.run_commands("position startpos moves e2e5", "position fen 8/8/8/8/8/8/8/8 w - - 0 1", "position banana")
+        self.assertEqual(to_fen(self.engine.position), before)
+        self.assertEqual(len([line for line in self.lines if line.startswith("info string")]), 3)
+
+    def test_go_depth_finds_mate(self):
+        self.run_commands("position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", "go depth 3")
+        self.assertEqual(self.bestmove(), "a1a8")
+        self.assertTrue(any("score mate 1" in line for line in self.lines if line.startswith("info depth")))
+
+    def test_go_nodes_and_movetime(self):
+        legal = [move_to_uci(move) for move in Position().generate_legal()]
+        self.run_commands("position startpos", "go nodes 2000")
+        self.assertIn(self.bestmove(), legal)
+        self.lines.clear()
+        self.run_commands("go movetime 100")
+        self.assertIn(self.bestmove(), legal)
+
+    def test_infinite_search_reports_only_after_stop(self):
+        self.engine.handle("position startpos")
+        self.engine.handle("go infinite")
+        self.assertFalse([line for line in self.lines if line.startswith("bestmove")])
+        self.engine.handle("stop")
+        self.bestmove()
+
+    def test_ponderhit_switches_to_the_time_budget(self):
+        self.engine.handle("position startpos")
+        self.engine.handle("go ponder movetime 200")
+        self.engine.handle("ponderhit")
+        self.engine.wait()
+        self.bestmove()
+
+    def test_checkmated_position_reports_null_move(self):
+        self.run_commands("position fen R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1", "go depth 2")
+        self.assertEqual(self.bestmove(), "0000")
+
+    def test_options_and_unknown_commands(self):
+        self.run_commands("setoption name Hash value 2", "setoption name BookFile value /no/such/book",
+                          "frobnicate", "go depth x")
+        self.assertEqual(len(self.engine.table.values), len(TranspositionTable(2).values))
+        self.assertEqual(len([line for line in self.lines if line.startswith("info string")]), 3)
+        self.assertFalse(self.engine.handle("quit"))
+
+    def test_score_and_time_helpers(self):
+        self.assertEqual(format_score(35), "cp 35")
+        self.assertEqual(format_score(MATE - 1), "mate 1")
+        self.assertEqual(format_score(MATE - 3), "mate 2")
+        self.assertEqual(format_score(-(MATE - 2)), "mate -1")
+        self.assertAlmostEqual(time_budget({"movetime": 1000}, True), 0.95)
+        self.assertIsNone(time_budget({}, True))
+        self.assertLessEqual(time_budget({"wtime": 1000, "btime": 60000}, True), 0.5)
+        self.assertGreater(time_budget({"wtime": 1000, "btime": 60000}, False), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for Zobrist keys and repetition detection."""
+
+import random
+import unittest
+
+from chesscore.notation import parse_fen, parse_uci
+from chesscore.position import Position
+from chesscore.zobrist import compute_key
+
+
+class ZobristTest(unittest.TestCase):
+    def test_incremental_key_matches_a_full_recompute(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            position = Position()
+            keys = [position.key]
+            for _ in range(80):
+                moves = position.generate_legal()
+                if not moves:
+                    break
+                position.apply(rng.choice(moves))
+                self.assertEqual(position.key, compute_key(position))
+                keys.append(position.key)
+            while position.history:
+                position.unmake_move()
+                keys.pop()
+                self.assertEqual(position.key, keys[-1])
+
+    def test_key_covers_side_castling_and_en_passant(self):
+        base = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR"
+        keys = {parse_fen(f"{base} {side} {castling} {ep} 0 2").key
+                for side, castling, ep in (("w", "KQkq", "-"), ("b", "KQkq", "-"), ("w", "Kkq", "-"),
+                                           ("w", "KQkq", "e6"))}
+        self.assertEqual(len(keys), 4)
+
+    def test_transpositions_share_a_key(self):
+        first, second = Position(), Position()
+        for position, line in ((first, "g1f3 g8f6 b1c3"), (second, "b1c3 g8f6 g1f3")):
+            for text in line.split():
+                position.apply(parse_uci(position, text))
+        self.assertEqual(first.key, second.key)
+
+
+class RepetitionTest(unittest.TestCase):
+    def play(self, position, line):
+        for text in line.split():
+            position.apply(parse_uci(position, text))
+
+    def test_threefold_repetition(self):
+        position = Position()
+        self.assertEqual(position.repetition_count(), 1)
+        self.play(position, "g1f3 g8f6 f3g1 f6g8")
+        self.assertEqual(position.repetition_count(), 2)
+        self.assertFalse(position.is_threefold_repetition())
+        self.play(position, "g1f3 g8f6 f3g1 f6g8")
+        self.assertTrue(position.is_threefold_repetition())
+        position.unmake_move()
+        self.assertEqual(position.repetition_count(), 2)
+
+    def test_en_passant_rights_and_pawn_moves_count(self):
+        position = Position()
+        # The position after e7e5 has an en passant square; the same one after the knights return has not
+        self.play(position, "g1f3 g8f6 f3g1 f6g8 e2e4 e7e5 g1f3 g8f6 f3g1 f6g8")
+        self.assertEqual(position.repetition_count(), 1)
+        self.play(position, "g1f3 g8f6 f3g1 f6g8")
+        self.assertEqual(position.repetition_count(), 2)
+        self.assertEqual(position.halfmove_clock, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Fixed-size transposition table keyed by Zobrist keys.
+
+The table has a fixed number of buckets derived from a memory budget, so it
+never grows. Each bucket has a depth-preferred slot and an always-replace
+slot, or just one always-replace slot with policy="always".
+"""
+
+from array import array
+
+# Rough cost of one slot: 8 bytes of key plus a list slot and a small tuple value
+ENTRY_BYTES = 88
+
+# Bound types for search results
+EXACT, LOWER, UPPER = 0, 1, 2
+
+DEPTH_PREFERRED = "depth"
+ALWAYS_REPLACE = "always"
+
+
+class TranspositionTable:
+    """Bounded cache from position keys to (depth, value) entries."""
+
+    def __init__(self, memory_mb=16, policy=DEPTH_PREFERRED):
+        if policy not in (DEPTH_PREFERRED, ALWAYS_REPLACE):
+            raise ValueError(f"Unknown replacement policy: {policy!r}")
+        self.policy = policy
+        self.slots_per_bucket = 2 if policy == DEPTH_PREFERRED else 1
+        buckets = max(1, int(memory_mb * 1024 * 1024) // (ENTRY_BYTES * self.slots_per_bucket))
+        # Round down to a power of two so the bucket index is a mask
+        self.bucket_count = 1 << (buckets.bit_length() - 1)
+        self.mask = self.bucket_count - 1
+        size = self.bucket_count * self.slots_per_bucket
+        self.keys = array("Q", bytes(8 * size))
+        self.depths = array("b", bytes(size))
+        self.values = [None] * size
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def __len__(self):
+        return self.used
+
+    def clear(self):
+        """Empties the table and resets the counters."""
+        size = len(self.values)
+        self.keys = array("Q", bytes(8 * size))
+        self.depths = array("b", bytes(size))
+        self.values = [None] * size
+        self.used = 0
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def probe(self, key):
+        """Returns the (depth, value) stored for key, or None."""
+        index = (key & self.mask) * self.slots_per_bucket
+        keys = self.keys
+        values = self.values
+        occupied = False
+        for slot in range(index, index + self.slots_per_bucket):
+            if values[slot] is not None:
+                if keys[slot] == key:
+                    self.hits += 1
+                    return self.depths[slot], values[slot]
+                occupied = True
+        self.misses += 1
+        if occupied:
+            self.collisions += 1  # Another position owns this bucket
+        return None
+
+    def store(self, key, depth, value):
+        """Stores value for key, searched to depth (0 for non-search data)."""
+        index = (key & self.mask) * self.slots_per_bucket
+        slot = index
+        if self.slots_per_bucket == 2:
+            # Keep the deeper entry in the first slot; everything else goes to the second
+            if self.values[index] is not None and self.keys[index] != key and depth < self.depths[index]:
+                slot = index + 1
+            elif self.keys[index + 1] == key and self.values[index + 1] is not None:
+                self.values[index + 1] = None
+                self.used -= 1
+        if self.values[slot] is None:
+            self.used += 1
+        self.keys[slot] = key
+        self.depths[slot] = max(-128, min(127, depth))
+        self.values[slot] = value
+        self.stores += 1
+
+    def hashfull(self):
+        """Returns the fraction of slots in use, in permille."""
+        return self.used * 1000 // len(self.values)
+
+    def stats(self):
+        """Returns the counters as a dict."""
+        return {
+            "buckets": self.bucket_count,
+            "slots": len(self.values),
+            "used": self.used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hashfull": self.hashfull(),
+        }
+
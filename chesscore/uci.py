@@ -0,0 +1,239 @@
+"""UCI front end: play through any UCI chess GUI or tournament manager.
+
+    python -m chesscore uci
+
+Reads UCI commands from stdin and answers on stdout. Searches run on a
+background thread, so isready and stop are answered while the engine is
+thinking; stop ends a search within one budget check (CHECK_INTERVAL nodes).
+"""
+
+import sys
+import threading
+
+from chesscore.book import OpeningBook
+from chesscore.notation import STARTING_FEN, move_to_uci, parse_fen, parse_uci
+from chesscore.search import MATE, MATE_BOUND, Searcher
+from chesscore.tablebase import Tablebases
+from chesscore.tt import TranspositionTable
+
+ENGINE_NAME = "chesscore"
+ENGINE_AUTHOR = "the chesscore authors"
+
+DEFAULT_HASH_MB = 32
+MAX_HASH_MB = 4096
+MOVE_OVERHEAD = 0.05  # Seconds kept back per move for I/O and the host's own overhead
+DEFAULT_MOVES_TO_GO = 30
+
+GO_INT_OPTIONS = ("depth", "movetime", "wtime", "btime", "winc", "binc", "movestogo", "nodes")
+
+
+def format_score(score):
+    """Returns the UCI form of a score: "cp 35" or "mate -3" (in moves, from the side to move)."""
+    if score > MATE_BOUND:
+        return f"mate {(MATE - score + 1) // 2}"
+    if score < -MATE_BOUND:
+        return f"mate -{(MATE + score + 1) // 2}"
+    return f"cp {score}"
+
+
+def time_budget(options, white_to_move):
+    """Returns the seconds to spend on a move from go options, or None for no time limit."""
+    if "movetime" in options:
+        return max(0.001, options["movetime"] / 1000 - MOVE_OVERHEAD)
+    remaining = options.get("wtime" if white_to_move else "btime")
+    if remaining is None:
+        return None
+    increment = options.get("winc" if white_to_move else "binc", 0)
+    moves_to_go = options.get("movestogo") or DEFAULT_MOVES_TO_GO
+    budget = remaining / moves_to_go + increment * 0.8
+    # Never plan to use more than half of the clock
+    return max(0.001, min(budget, remaining / 2) / 1000 - MOVE_OVERHEAD)
+
+
+class UCIEngine:
+    """State of a UCI session. handle() takes one command line; output goes through write."""
+
+    def __init__(self, write=print):
+        self.write = write
+        self.output_lock = threading.Lock()
+        self.table = TranspositionTable(DEFAULT_HASH_MB)
+        self.book = None
+        self.tablebases = None
+        self.searcher = Searcher(self.table)
+        self.position = parse_fen(STARTING_FEN)
+        self.thread = None
+        self.pondering = False
+        self.ponder_budget = None
+        self.release = threading.Event()  # Lets an infinite or ponder search report its bestmove
+
+    def send(self, line):
+        with self.output_lock:
+            self.write(line)
+
+    def handle(self, line):
+        """Runs one UCI command. Returns False once the session should end."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}")
+            self.send("option name Ponder type check default false")
+            self.send("option name BookFile type string default <empty>")
+            self.send("option name TablebasePath type string default <empty>")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.wait()
+            self.table.clear()
+            self.searcher = Searcher(self.table, book=self.book, tablebases=self.tablebases)
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "position":
+            self.wait()
+            self.set_position(args)
+        elif command == "go":
+            self.wait()
+            self.go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            self.ponder_hit()
+        elif command == "quit":
+            self.stop()
+            return False
+        elif command not in ("debug", "register"):
+            self.send(f"info string Unknown command: {command}")
+        return True
+
+    def set_option(self, args):
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1:args.index("value")]).lower()
+        value = " ".join(args[args.index("value") + 1:])
+        self.wait()
+        try:
+            if name == "hash":
+                self.table = TranspositionTable(max(1, min(MAX_HASH_MB, int(value))))
+            elif name == "bookfile":
+                self.book = OpeningBook(value) if value and value != "<empty>" else None
+            elif name == "tablebasepath":
+                self.tablebases = Tablebases(value) if value and value != "<empty>" else None
+            else:
+                return
+        except (OSError, ValueError) as error:
+            self.send(f"info string Invalid value for {name}: {error}")
+            return
+        self.searcher = Searcher(self.table, book=self.book, tablebases=self.tablebases)
+
+    def set_position(self, args):
+        if "moves" in args:
+            split = args.index("moves")
+            args, moves = args[:split], args[split + 1:]
+        else:
+            moves = []
+        try:
+            if args[:1] == ["startpos"]:
+                position = parse_fen(STARTING_FEN)
+            elif args[:1] == ["fen"]:
+                position = parse_fen(" ".join(args[1:]))
+            else:
+                raise ValueError(f"Invalid position command: {' '.join(args)!r}")
+            for text in moves:
+                position.apply(parse_uci(position, text))
+        except ValueError as error:
+            self.send(f"info string {error}")
+            return
+        self.position = position
+
+    def go(self, args):
+        options = {}
+        index = 0
+        while index < len(args):
+            name = args[index]
+            if name in GO_INT_OPTIONS and index + 1 < len(args):
+                try:
+                    options[name] = int(args[index + 1])
+                except ValueError:
+                    self.send(f"info string Invalid value for {name}: {args[index + 1]}")
+                    return
+                index += 2
+                continue
+            options[name] = True  # infinite, ponder
+            index += 1
+
+        budget = time_budget(options, self.position.turn == "white")
+        self.pondering = "ponder" in options
+        self.ponder_budget = budget
+        if self.pondering or "infinite" in options:
+            budget = None
+            self.release.clear()
+        else:
+            self.release.set()
+        max_depth = options.get("depth", 64)
+        self.thread = threading.Thread(target=self._search, args=(self.position.copy(), max_depth, budget,
+                                                                  options.get("nodes")), daemon=True)
+        self.thread.start()
+
+    def _search(self, position, max_depth, time_limit, node_limit):
+        result = self.searcher.search(position, max_depth, time_limit, node_limit, info=self._info)
+        # Infinite and ponder searches only report once they are stopped or the ponder move is played
+        self.release.wait()
+        if result.best_move is None:
+            self.send("bestmove 0000")
+            return
+        line = f"bestmove {move_to_uci(result.best_move)}"
+        if len(result.pv) > 1:
+            line += f" ponder {move_to_uci(result.pv[1])}"
+        self.send(line)
+
+    def _info(self, result):
+        pv = " ".join(move_to_uci(move) for move in result.pv)
+        self.send(f"info depth {result.depth} score {format_score(result.score)} nodes {result.nodes} "
+                  f"nps {result.nps} hashfull {self.table.hashfull()} time {int(result.seconds * 1000)} pv {pv}")
+
+    def stop(self):
+        """Stops the running search, if any, and waits for its bestmove."""
+        if self.thread is None:
+            return
+        self.release.set()
+        # Repeat the request in case the thread had not entered the search yet, which clears the flag
+        while self.thread.is_alive():
+            self.searcher.stop()
+            self.thread.join(0.005)
+        self.thread = None
+
+    def ponder_hit(self):
+        """The opponent played the expected move: keep searching, now on the normal time budget."""
+        if self.thread is None or not self.pondering:
+            return
+        self.pondering = False
+        self.searcher.set_time_limit(self.ponder_budget)
+        self.release.set()
+
+    def wait(self):
+        """Waits for a finite search to finish; an infinite or ponder search is stopped first."""
+        if self.thread is None:
+            return
+        if not self.release.is_set():
+            self.stop()
+            return
+        self.thread.join()
+        self.thread = None
+
+
+def add_arguments(parser):
+    parser.set_defaults(handler=run_command)
+
+
+def run_command(args):
+    engine = UCIEngine(lambda line: print(line, flush=True))
+    for line in sys.stdin:
+        if not engine.handle(line):
+            break
+    else:
+        engine.stop()
+    return 0
@@ -0,0 +1,37 @@
+"""Zobrist hashing: 64-bit position keys that Position updates incrementally.
+
+The random tables come from a fixed seed so keys are stable across runs
+and processes.
+"""
+
+import random
+
+from chesscore.board import NO_SQUARE, SQUARES
+
+_rng = random.Random(0x5EED_C0DE)
+
+# PIECE_KEYS[piece code][0x88 square]
+PIECE_KEYS = [[0] * 128 for _ in range(15)]
+for _piece in (1, 2, 3, 4, 5, 6, 9, 10, 11, 12, 13, 14):
+    for _sq in SQUARES:
+        PIECE_KEYS[_piece][_sq] = _rng.getrandbits(64)
+
+SIDE_KEY = _rng.getrandbits(64)  # Toggled when black is to move
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]  # One per castling bitmask
+EP_KEYS = [_rng.getrandbits(64) for _ in range(8)]  # One per en passant file
+
+
+def compute_key(position):
+    """Computes a position's key from scratch."""
+    key = 0
+    board = position.board
+    for sq in SQUARES:
+        piece = board[sq]
+        if piece:
+            key ^= PIECE_KEYS[piece][sq]
+    if position.side:
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[position.castling]
+    if position.ep_square != NO_SQUARE:
+        key ^= EP_KEYS[position.ep_square & 7]
+    return key
@@ -0,0 +1,105 @@
+"""Startup benchmark for the pygame front end.
+
+    python startup_benchmark.py
+    python startup_benchmark.py --runs 10
+
+Runs chess_game.py in fresh processes and reports the median time from
+launch to the first frame on screen, then times the pieces of startup in
+this process: pygame.init() against initialising only the display, and
+reading and scaling the piece images from disk against the AssetManager
+cache that resets and resizes use. Uses the dummy video driver unless
+SDL_VIDEODRIVER is already set, so it also runs without a screen.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from chess_assets import PIECE_NAMES, AssetManager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SQUARE_SIZE = 60
+
+
+def cold_start(runs):
+    """Returns the launch-to-first-frame seconds of chess_game.py, once per run."""
+    times = []
+    for _ in range(runs):
+        env = dict(os.environ, CHESS_BENCHMARK=repr(time.time()))
+        output = subprocess.run([sys.executable, "chess_game.py"], cwd=HERE, env=env, capture_output=True,
+                                text=True, check=True).stdout
+        times.append(float(output.split("first frame")[-1]))
+    return times
+
+
+def cold_import(module, runs):
+    """Returns the seconds a fresh interpreter takes to import module, once per run."""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return [float(subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True,
+                                 check=True).stdout) for _ in range(runs)]
+
+
+def timed(function, runs):
+    """Returns the median seconds of function() over runs calls."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def init_everything():
+    pygame.init()
+    pygame.quit()
+
+
+def init_display():
+    pygame.display.init()
+    pygame.quit()
+
+
+def load_from_disk():
+    """What every startup did before the cache: read and scale all twelve images."""
+    for name in PIECE_NAMES:
+        image = pygame.image.load(os.path.join(HERE, "assets", f"{name}.png"))
+        pygame.transform.scale(image, (SQUARE_SIZE, SQUARE_SIZE))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the startup time of the chess GUI.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    def report(label, seconds):
+        print(f"{label:<44} {seconds * 1000:8.2f} ms")
+
+    report("cold start to first frame (median)", statistics.median(cold_start(args.runs)))
+    report("import chesscore, fresh process (median)", statistics.median(cold_import("chesscore", args.runs)))
+    report("import numpy, fresh process (median)", statistics.median(cold_import("numpy", args.runs)))
+    report("pygame.init() + quit", timed(init_everything, args.runs))
+    report("pygame.display.init() + quit", timed(init_display, args.runs))
+
+    pygame.display.init()
+    pygame.display.set_mode((8 * SQUARE_SIZE, 8 * SQUARE_SIZE))
+    assets = AssetManager(os.path.join(HERE, "assets"))
+    report("pieces read and scaled from disk", timed(load_from_disk, args.runs))
+    report("pieces, first AssetManager call", timed(lambda: assets.pieces(SQUARE_SIZE), 1))
+    report("pieces, cached (reset)", timed(lambda: assets.pieces(SQUARE_SIZE), args.runs))
+    report("pieces at a new size from cached images", timed(lambda: assets.pieces(SQUARE_SIZE + 20), 1))
+    assets.use_atlas = True
+    report("atlas at another size from cached images", timed(lambda: assets.pieces(SQUARE_SIZE + 40), 1))
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Tests for the piece image cache."""
+
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from chess_assets import PIECE_NAMES, AssetManager
+
+ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+
+class AssetManagerTest(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((120, 120))
+        self.assets = AssetManager(ASSETS)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_images_are_read_once(self):
+        with mock.patch("pygame.image.load", wraps=pygame.image.load) as load:
+            first = self.assets.pieces(60)
+            self.assertIs(self.assets.pieces(60), first)
+            self.assets.pieces(80)
+        self.assertEqual(load.call_count, len(PIECE_NAMES))
+        self.assertEqual(set(first), set(PIECE_NAMES))
+        self.assertEqual({surface.get_size() for surface in first.values()}, {(60, 60)})
+
+    def test_atlas(self):
+        self.assets.use_atlas = True
+        pieces = self.assets.pieces(40)
+        atlas = self.assets.atlas(40)
+        self.assertEqual(atlas.get_size(), (40 * len(PIECE_NAMES), 40))
+        self.assertIs(pieces["bk"].get_parent(), atlas)
+        self.assertEqual(pieces["bk"].get_offset(), (PIECE_NAMES.index("bk") * 40, 0))
+
+    def test_clear(self):
+        self.assets.pieces(60)
+        self.assets.clear()
+        self.assertEqual((self.assets.scaled, len(self.assets.images)), ({}, len(PIECE_NAMES)))
+        with mock.patch("pygame.image.load", wraps=pygame.image.load) as load:
+            self.assets.pieces(60)
+            self.assets.clear(keep_images=False)
+            self.assertEqual(self.assets.images, {})
+            self.assets.pieces(60)
+        self.assertEqual(load.call_count, len(PIECE_NAMES))
+
+
+if __name__ == "__main__":
+    unittest.main()